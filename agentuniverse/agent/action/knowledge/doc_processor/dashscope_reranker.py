@@ -53,16 +53,34 @@ class DashscopeReranker(DocProcessor):
             raise Exception("Dashscope reranker need an origin string query.")
         if len(origin_docs)<1:
             return origin_docs
+        resp = dashscope.TextReRank.call(**self._build_call_params(origin_docs, query))
+        return self._rerank(origin_docs, resp)
+
+    async def _async_process_docs(self, origin_docs: List[Document], query: Query = None) -> \
+            List[Document]:
+        """Asynchronously rerank documents by the async Dashscope TextReRank client."""
+        if not query or not query.query_str:
+            raise Exception("Dashscope reranker need an origin string query.")
+        if len(origin_docs)<1:
+            return origin_docs
+        resp = await dashscope.AioTextReRank.call(**self._build_call_params(origin_docs, query))
+        return self._rerank(origin_docs, resp)
+
+    def _build_call_params(self, origin_docs: List[Document], query: Query) -> dict:
         documents_texts = []
         for _doc in origin_docs:
             documents_texts.append(_doc.text)
-        resp = dashscope.TextReRank.call(
+        return dict(
             model=MODEL_NAME_MAP.get(self.model_name),
             query=query.query_str,
             documents=documents_texts,
             top_n=self.top_n,
             return_documents=False
         )
+
+    @staticmethod
+    def _rerank(origin_docs: List[Document], resp) -> List[Document]:
+        """Return the documents in the order of the rerank results, with their relevance score."""
         if resp.status_code == HTTPStatus.OK:
             results = resp.output.results
         else:
@@ -5,7 +5,7 @@
 # @Author  : fanen.lhy
 # @Email   : fanen.lhy@antgroup.com
 # @FileName: doc_processor.py
-
+import asyncio
 from abc import abstractmethod
 from typing import List, Optional
 
@@ -42,6 +42,21 @@ class DocProcessor(ComponentBase):
         """Process input documents，return should also be a document list."""
         return self._process_docs(origin_docs, query)
 
+    async def async_process_docs(self, origin_docs: List[Document], query: Query = None) -> \
+            List[Document]:
+        """Asynchronously process input documents，return should also be a document list."""
+        return await self._async_process_docs(origin_docs, query)
+
+    async def _async_process_docs(self, origin_docs: List[Document],
+                                  query: Query = None) -> \
+            List[Document]:
+        """Asynchronously process input documents.
+
+        By default `_process_docs` runs in a worker thread, processors calling remote services
+        override this method with a native async implementation.
+        """
+        return await asyncio.to_thread(self._process_docs, origin_docs, query)
+
     @abstractmethod
     def _process_docs(self, origin_docs: List[Document],
                       query: Query = None) -> \
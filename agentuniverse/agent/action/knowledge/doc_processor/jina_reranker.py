@@ -6,7 +6,11 @@
 # @Email   : xmhu2001@qq.com
 # @FileName: jina_reranker.py
 
-from typing import List, Optional
+import asyncio
+import threading
+import weakref
+from typing import List, Optional, Tuple
+import httpx
 import requests
 
 from agentuniverse.agent.action.knowledge.doc_processor.doc_processor import DocProcessor
@@ -17,6 +21,12 @@ from agentuniverse.base.util.env_util import get_from_env
 
 api_base = "https://api.jina.ai/v1/rerank"
 
+# Pooled async http clients shared by the copies of the reranker, kept per event loop because
+# their connections are bound to the loop creating them.
+_ASYNC_CLIENTS: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = \
+    weakref.WeakKeyDictionary()
+_CLIENTS_LOCK = threading.Lock()
+
 class JinaReranker(DocProcessor):
     """Document reranker using Jina AI's Rerank API.
 
@@ -40,14 +50,53 @@ class JinaReranker(DocProcessor):
         Raises:
             Exception: If the query is missing, the API key is not set, or the API call fails.
         """
+        if not origin_docs:
+            self._check_query(query)
+            return []
+        headers, payload = self._build_request(origin_docs, query)
+        try:
+            response = requests.post(api_base, headers=headers, json=payload)
+            response.raise_for_status()
+            results = response.json().get("results", [])
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Jina AI rerank API call error: {e}")
+        return self._rerank(origin_docs, results)
+
+    async def _async_process_docs(self, origin_docs: List[Document], query: Query = None) -> List[Document]:
+        """Asynchronously rerank documents by the Jina AI Rerank API, with an async http client."""
+        if not origin_docs:
+            self._check_query(query)
+            return []
+        headers, payload = self._build_request(origin_docs, query)
+        try:
+            response = await self._get_async_client().post(api_base, headers=headers, json=payload)
+            response.raise_for_status()
+            results = response.json().get("results", [])
+        except httpx.HTTPError as e:
+            raise Exception(f"Jina AI rerank API call error: {e}")
+        return self._rerank(origin_docs, results)
+
+    @staticmethod
+    def _get_async_client() -> httpx.AsyncClient:
+        """Return the pooled async http client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with _CLIENTS_LOCK:
+            client = _ASYNC_CLIENTS.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient()
+                _ASYNC_CLIENTS[loop] = client
+        return client
+
+    def _check_query(self, query: Query) -> None:
         if not query or not query.query_str:
             raise Exception("Jina AI reranker needs an origin string query.")
         if not self.api_key:
             raise Exception(
                 "Jina AI API key is not set. Please configure it in the component or environment variables.")
-        if not origin_docs:
-            return []
 
+    def _build_request(self, origin_docs: List[Document], query: Query) -> Tuple[dict, dict]:
+        """Return the headers and the payload of a rerank request."""
+        self._check_query(query)
         headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}",
@@ -59,14 +108,11 @@ class JinaReranker(DocProcessor):
             "documents": [doc.text for doc in origin_docs],
             "top_n": self.top_n,
         }
+        return headers, payload
 
-        try:
-            response = requests.post(api_base, headers=headers, json=payload)
-            response.raise_for_status()
-            results = response.json().get("results", [])
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Jina AI rerank API call error: {e}")
-
+    @staticmethod
+    def _rerank(origin_docs: List[Document], results: List[dict]) -> List[Document]:
+        """Return the documents in the order of the rerank results, with their relevance score."""
         rerank_docs = []
         for result in results:
             index = result.get("index")
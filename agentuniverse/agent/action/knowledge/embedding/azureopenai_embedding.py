@@ -15,6 +15,9 @@ from agentuniverse.base.util.env_util import get_from_env
 from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
 from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
 
+# Azure OpenAI supports max 2048 inputs in one embedding request.
+AZURE_OPENAI_MAX_BATCH_SIZE = 2048
+
 
 class AzureOpenAIEmbedding(Embedding):
     """The Azure OpenAI embedding class."""
@@ -46,21 +49,23 @@ class AzureOpenAIEmbedding(Embedding):
             Exception: If the API call fails or if required configuration is missing.
         """
         self._initialize_clients()
-        
-        try:
+
+        def create(batch: List[str]) -> List[List[float]]:
             if self.embedding_dims is not None:
                 response = self.client.embeddings.create(
-                    input=texts,
+                    input=batch,
                     model=self.embedding_model_name,
                     dimensions=self.embedding_dims
                 )
             else:
                 response = self.client.embeddings.create(
-                    input=texts,
+                    input=batch,
                     model=self.embedding_model_name
                 )
             return [item.embedding for item in response.data]
 
+        try:
+            return self._dispatch_batches(texts, create, batch_size=AZURE_OPENAI_MAX_BATCH_SIZE, retry=False)
         except Exception as e:
             raise Exception(f"Failed to get embeddings: {e}")
 
@@ -75,22 +80,25 @@ class AzureOpenAIEmbedding(Embedding):
         Raises:
             Exception: If the API call fails or if required configuration is missing.
         """
-        self._initialize_clients()
+        self._initialize_clients(async_client=True)
 
-        try:
+        async def create(batch: List[str]) -> List[List[float]]:
             if self.embedding_dims is not None:
                 response = await self.async_client.embeddings.create(
-                    input=texts,
+                    input=batch,
                     model=self.embedding_model_name,
                     dimensions=self.embedding_dims
                 )
             else:
                 response = await self.async_client.embeddings.create(
-                    input=texts,
+                    input=batch,
                     model=self.embedding_model_name
                 )
             return [item.embedding for item in response.data]
 
+        try:
+            return await self._async_dispatch_batches(texts, create, batch_size=AZURE_OPENAI_MAX_BATCH_SIZE,
+                                                      retry=False)
         except Exception as e:
             raise Exception(f"Failed to get embeddings: {e}")
 
@@ -121,7 +129,7 @@ class AzureOpenAIEmbedding(Embedding):
         return self
 
 
-    def _initialize_clients(self) -> None:
+    def _initialize_clients(self, async_client: bool = False) -> None:
         if not self.azure_api_key:
             raise Exception("AZURE_OPENAI_API_KEY is missing")
         if not self.resource_name:
@@ -129,15 +137,17 @@ class AzureOpenAIEmbedding(Embedding):
         if not self.azure_api_version:
             raise Exception("AZURE_API_VERSION is missing")
 
-        if self.client is None:
-            self.client = AzureOpenAI(
-                api_key=self.azure_api_key,
-                api_version=self.azure_api_version,
-                azure_endpoint=f"https://{self.resource_name}.openai.azure.com"
-            )
-        if self.async_client is None:
-            self.async_client = AsyncAzureOpenAI(
-                api_key=self.azure_api_key,
-                api_version=self.azure_api_version,
-                azure_endpoint=f"https://{self.resource_name}.openai.azure.com"
-            )
\ No newline at end of file
+        # The clients are shared by the copies of the embedding to reuse their connection pools.
+        client_args = dict(
+            api_key=self.azure_api_key,
+            api_version=self.azure_api_version,
+            azure_endpoint=f"https://{self.resource_name}.openai.azure.com",
+            max_retries=self.max_retries
+        )
+        client_key = ('azure_openai', self.azure_api_key, self.azure_api_version, self.resource_name,
+                      self.max_retries)
+        self.client = self._get_shared_client(client_key, lambda: AzureOpenAI(**client_args))
+        if async_client:
+            self.async_client = self._get_shared_async_client(client_key, lambda: AsyncAzureOpenAI(**client_args))
+        elif self.async_client is None:
+            self.async_client = AsyncAzureOpenAI(**client_args)
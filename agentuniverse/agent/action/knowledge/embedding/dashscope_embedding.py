@@ -7,12 +7,14 @@
 # @FileName: dashscope_embedding.py
 import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 from typing import List, Generator, Optional
 from pydantic import Field
 import json
 
 from agentuniverse.base.util.env_util import get_from_env
-from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
+from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding, \
+    RetryableEmbeddingError, RETRYABLE_STATUS_CODES
 
 # Dashscope support max 25 string in one batch, each string max tokens is 2048.
 DASHSCOPE_MAX_BATCH_SIZE = 25
@@ -27,11 +29,80 @@ def batched(inputs: List,
 
 
 class DashscopeEmbedding(Embedding):
-    """The Dashscope embedding class."""
+    """The Dashscope embedding class.
+
+    Requests go through pooled http sessions shared by the copies of the embedding, and the batches
+    of a call are sent concurrently, throttled batches are retried.
+    """
     dashscope_api_key: Optional[str] = Field(
         default_factory=lambda: get_from_env("DASHSCOPE_API_KEY")
     )
 
+    def _get_session(self) -> requests.Session:
+        """Return the pooled http session shared by the copies of the embedding."""
+        def new_session() -> requests.Session:
+            session = requests.Session()
+            pool_size = max(self.max_concurrency, 1)
+            session.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+            return session
+        return self._get_shared_client(('dashscope', self.max_concurrency), new_session)
+
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        """Return the pooled aiohttp session of the running event loop."""
+        return self._get_shared_async_client(('dashscope', self.max_concurrency), lambda: aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=max(self.max_concurrency, 1)),
+            timeout=aiohttp.ClientTimeout(total=300)
+        ))
+
+    def _get_headers(self) -> dict:
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.dashscope_api_key}"
+        }
+
+    def _build_post_params(self, batch: List[str], **kwargs) -> dict:
+        post_params = {
+            "model": self.embedding_model_name,
+            "input": {"texts": batch},
+            "parameters": {
+            }
+        }
+        if self.embedding_model_name == "text-embedding-v3":
+            post_params["parameters"][
+                "dimension"] = self.embedding_dims if self.embedding_dims else 1024
+            post_params["parameters"][
+                "output_type"] = kwargs["output_type"] if "output_type" in kwargs else "dense"
+        post_params["parameters"]["text_type"] = kwargs["text_type"] if "text_type" in kwargs else "document"
+        return post_params
+
+    @staticmethod
+    def _check_status(status: int, headers=None) -> None:
+        """Raise a retryable error for a retryable http status before the body is read, since
+        overloaded gateways may answer with an html page instead of json."""
+        if status in RETRYABLE_STATUS_CODES:
+            raise RetryableEmbeddingError(f"Failed to call dashscope embedding api, http status:{status}",
+                                          retry_after=(headers or {}).get("Retry-After"))
+
+    @staticmethod
+    def _non_json_error(status: int) -> Exception:
+        return Exception(f"Failed to call dashscope embedding api, http status:{status}, "
+                         f"the response is not json")
+
+    @staticmethod
+    def _parse_response(status: int, resp_json: dict, headers=None) -> List[List[float]]:
+        data = resp_json.get("output")
+        if data:
+            data = data["embeddings"]
+            return [d['embedding'] for d in data if 'embedding' in d]
+        error_code = resp_json.get("code", "")
+        error_message = resp_json.get("message", "")
+        message = (f"Failed to call dashscope embedding api, "
+                   f"error code:{error_code}, "
+                   f"error message:{error_message}")
+        if status in RETRYABLE_STATUS_CODES or str(error_code).startswith("Throttling"):
+            raise RetryableEmbeddingError(message, retry_after=(headers or {}).get("Retry-After"))
+        raise Exception(message)
+
     def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
         """
         Retrieve text embeddings for a list of input texts.
@@ -39,7 +110,7 @@ class DashscopeEmbedding(Embedding):
         This function interfaces with the DashScope embedding API to obtain
         embeddings for a batch of input texts. It handles batching of input texts
         to ensure efficient API calls. Each text is processed using the specified
-        embedding model.
+        embedding model, and throttled batches are retried.
 
         Args:
             texts (List[str]): A list of input texts to be embedded.
@@ -51,50 +122,23 @@ class DashscopeEmbedding(Embedding):
             Exception: If the API call to DashScope fails, an exception is raised with
                        the respective error code and message.
         """
-        def post(post_params):
-            response = requests.post(
+        def post(batch: List[str]) -> List[List[float]]:
+            response = self._get_session().post(
                 url=DASHSCOPE_EMBEDDING_URL,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.dashscope_api_key}"
-                },
-                data=json.dumps(post_params, ensure_ascii=False).encode(
+                headers=self._get_headers(),
+                data=json.dumps(self._build_post_params(batch, **kwargs), ensure_ascii=False).encode(
                     "utf-8"),
                 timeout=300
             )
-            resp_json = response.json()
-            return resp_json
+            self._check_status(response.status_code, response.headers)
+            try:
+                resp_json = response.json()
+            except ValueError:
+                raise self._non_json_error(response.status_code)
+            return self._parse_response(response.status_code, resp_json, response.headers)
         if not self.dashscope_api_key:
             raise Exception("No DASHSCOPE_API_KEY in your environment.")
-        result = []
-        post_params = {
-            "model": self.embedding_model_name,
-            "input": {},
-            "parameters": {
-            }
-        }
-        if self.embedding_model_name == "text-embedding-v3":
-            post_params["parameters"][
-                "dimension"] = self.embedding_dims if self.embedding_dims else 1024
-            post_params["parameters"][
-                "output_type"] = kwargs["output_type"] if "output_type" in kwargs else "dense"
-        post_params["parameters"]["text_type"] = kwargs["text_type"] if "text_type" in kwargs else "document"
-
-        for batch in batched(texts):
-            post_params["input"]["texts"] = batch
-            resp_json: dict = post(post_params)
-            data = resp_json.get("output")
-            if data:
-                data = data["embeddings"]
-                batch_result = [d['embedding'] for d in data if 'embedding' in d]
-                result += batch_result
-            else:
-                error_code = resp_json.get("code", "")
-                error_message = resp_json.get("message", "")
-                raise Exception(f"Failed to call dashscope embedding api, "
-                                f"error code:{error_code}, "
-                                f"error message:{error_message}")
-        return result
+        return self._dispatch_batches(texts, post, batch_size=DASHSCOPE_MAX_BATCH_SIZE)
 
     async def async_get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
         """
@@ -103,7 +147,7 @@ class DashscopeEmbedding(Embedding):
         This function interfaces with the DashScope embedding API to obtain
         embeddings for a batch of input texts. It handles batching of input texts
         to ensure efficient API calls. Each text is processed using the specified
-        embedding model.
+        embedding model, and throttled batches are retried.
 
         Args:
             texts (List[str]): A list of input texts to be embedded.
@@ -115,52 +159,19 @@ class DashscopeEmbedding(Embedding):
             Exception: If the API call to DashScope fails, an exception is raised with
                        the respective error code and message.
         """
-        async def async_post(post_params):
-            async with aiohttp.ClientSession() as session:
-                async with await session.post(
-                        url=DASHSCOPE_EMBEDDING_URL,
-                        headers={
-                            "Content-Type": "application/json",
-                            "Authorization": f"Bearer {self.dashscope_api_key}"
-                        },
-                        data=json.dumps(post_params, ensure_ascii=False).encode(
-                            "utf-8"),
-                        timeout=300,
-                ) as resp:
-                    resp_json = await resp.json()
-            return resp_json
+        async def async_post(batch: List[str]) -> List[List[float]]:
+            async with self._get_async_session().post(
+                    url=DASHSCOPE_EMBEDDING_URL,
+                    headers=self._get_headers(),
+                    data=json.dumps(self._build_post_params(batch, **kwargs), ensure_ascii=False).encode(
+                        "utf-8"),
+            ) as resp:
+                self._check_status(resp.status, resp.headers)
+                try:
+                    resp_json = await resp.json(content_type=None)
+                except ValueError:
+                    raise self._non_json_error(resp.status)
+                return self._parse_response(resp.status, resp_json, resp.headers)
         if not self.dashscope_api_key:
             raise Exception("No DASHSCOPE_API_KEY in your environment.")
-        result = []
-        post_params = {
-            "model": self.embedding_model_name,
-            "input": {},
-            "parameters": {
-                "text_type": "query"
-            }
-        }
-        if self.embedding_model_name == "text-embedding-v3":
-            post_params["parameters"][
-                "dimension"] = self.embedding_dims if self.embedding_dims else 1024
-            post_params["parameters"][
-                "output_type"] = kwargs[
-                "output_type"] if "output_type" in kwargs else "dense"
-        post_params["parameters"]["text_type"] = kwargs[
-            "text_type"] if "text_type" in kwargs else "document"
-
-        for batch in batched(texts):
-            post_params["input"]["texts"] = batch
-            resp_json: dict = await async_post(post_params)
-            data = resp_json.get("output")
-            if data:
-                data = data["embeddings"]
-                batch_result = [d['embedding'] for d in data if
-                                'embedding' in d]
-                result += batch_result
-            else:
-                error_code = resp_json.get("code", "")
-                error_message = resp_json.get("message", "")
-                raise Exception(f"Failed to call dashscope embedding api, "
-                                f"error code:{error_code}, "
-                                f"error message:{error_message}")
-        return result
\ No newline at end of file
+        return await self._async_dispatch_batches(texts, async_post, batch_size=DASHSCOPE_MAX_BATCH_SIZE)
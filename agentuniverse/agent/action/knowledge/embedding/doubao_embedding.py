@@ -6,6 +6,7 @@
 # @Email   : zh_xiaoji@qq.com
 # @FileName: doubao_embedding.py
 
+import asyncio
 from typing import Any, List, Optional
 from pydantic import Field
 from agentuniverse.base.util.env_util import get_from_env
@@ -61,19 +62,24 @@ class DoubaoEmbedding(Embedding):
             norm = float(np.linalg.norm(vec[:self.embedding_dims]))
             return [v / norm for v in vec[:self.embedding_dims]]
 
-        try:
+        def create(batch: List[str]) -> List[List[float]]:
             response = self.client.embeddings.create(model=self.endpoint_id,
-                                                     input=texts)
+                                                     input=batch)
             if self.embedding_dims is None:
                 return [data.embedding for data in response.data]
             return [sliced_norm_l2(data.embedding) for data in response.data]
+
+        try:
+            # The ark client retries the throttled requests by itself.
+            return self._dispatch_batches(texts, create, retry=False)
         except Exception as e:
             raise Exception(
                 f"Failed to get embedding from Doubao API: {str(e)}")
 
     async def async_get_embeddings(self, texts: List[str],
                                    **kwargs) -> List[List[float]]:
-        return self.get_embeddings(texts)
+        # The synchronous ark client runs in a worker thread to keep the event loop free.
+        return await asyncio.to_thread(self.get_embeddings, texts)
 
     def _initialize_by_component_configer(
             self, embedding_configer: ComponentConfiger) -> 'Embedding':
@@ -5,22 +5,85 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: embedding.py
+import asyncio
+import contextvars
+import functools
+import os
+import random
+import threading
+import time
+import weakref
 from abc import abstractmethod
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 
 from langchain_core.embeddings import Embeddings as LCEmbeddings
 
+from agentuniverse.agent.action.knowledge.embedding.embedding_cache import EmbeddingCache
+from agentuniverse.agent_serve.web.thread_with_result import ThreadPoolExecutorWithReturnValue
 from agentuniverse.base.component.component_base import ComponentEnum
 from agentuniverse.base.component.component_base import ComponentBase
 from agentuniverse.base.config.component_configer.component_configer import \
     ComponentConfiger
 
+# Set while a cached call runs, so that a subclass calling the get_embeddings of its parent
+# class does not look the texts up again.
+_IN_CACHED_CALL = contextvars.ContextVar('_IN_CACHED_CALL', default=False)
+
+# Embedding caches shared by the copies of an embedding, keyed by the embedding name and the
+# cache config.
+_SHARED_CACHES: Dict[tuple, EmbeddingCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+# Pooled http clients shared by the copies of the embeddings, the async clients are kept per event
+# loop because their connections are bound to the loop creating them.
+_SHARED_CLIENTS: Dict[tuple, Any] = {}
+_SHARED_ASYNC_CLIENTS: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, Any]]' = \
+    weakref.WeakKeyDictionary()
+_CLIENTS_LOCK = threading.Lock()
+
+# HTTP status codes of the errors worth retrying, such as rate limits and server overloads.
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+# Names of the client library errors worth retrying, matched by name to avoid importing every
+# http client library.
+RETRYABLE_ERROR_NAMES = {'RateLimitError', 'APIConnectionError', 'APITimeoutError', 'InternalServerError',
+                         'ConnectionError', 'Timeout', 'ConnectTimeout', 'ReadTimeout', 'ConnectError',
+                         'ReadError', 'RemoteProtocolError', 'ClientConnectionError', 'ServerDisconnectedError'}
+
+
+class RetryableEmbeddingError(Exception):
+    """Raised by an embedding backend for a failure worth retrying, such as a throttled request."""
+
+    def __init__(self, message: str, retry_after: Optional[Union[float, str]] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def batch_texts(texts: List[str], batch_size: Optional[int]) -> List[List[str]]:
+    """Split the texts into batches of `batch_size`, a single batch if the size is not set."""
+    if not batch_size or batch_size <= 0:
+        return [texts] if texts else []
+    return [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
 
 class Embedding(ComponentBase):
     """The basic class for embedding.
 
     Attributes:
         embedding_model_name (Optional[str]): The name of the embedding model.
+        cache_max_size (int): The max number of embeddings cached in memory, 0 disables the cache.
+        cache_disk_path (Optional[str]): The path of a SQLite file caching the embeddings on disk,
+            which can be shared by several embeddings and worker processes.
+        max_batch_size (Optional[int]): The max number of texts sent in one request, defaults to the
+            limit of the embedding backend.
+        max_concurrency (int): The max number of requests in flight for one call.
+        max_retries (int): The max number of retries of a throttled or failed request.
+        retry_backoff (float): The base delay in seconds of the exponential retry backoff.
+
+    Note:
+        The `get_embeddings` and `async_get_embeddings` of every subclass are wrapped by the
+        embedding cache, only the texts missing in the cache are sent to the embedding model. The
+        cache is shared by the embeddings of the same name and cache config, so the copies handed
+        out by the embedding manager hit the same cache.
     """
 
     component_type: ComponentEnum = ComponentEnum.EMBEDDING
@@ -28,6 +91,19 @@ class Embedding(ComponentBase):
     description: Optional[str] = None
     embedding_model_name: Optional[str] = None
     embedding_dims: Optional[int] = None
+    cache_max_size: int = 0
+    cache_disk_path: Optional[str] = None
+    max_batch_size: Optional[int] = None
+    max_concurrency: int = 4
+    max_retries: int = 3
+    retry_backoff: float = 1.0
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'get_embeddings' in cls.__dict__:
+            cls.get_embeddings = _cached_get_embeddings(cls.__dict__['get_embeddings'])
+        if 'async_get_embeddings' in cls.__dict__:
+            cls.async_get_embeddings = _cached_async_get_embeddings(cls.__dict__['async_get_embeddings'])
 
     @abstractmethod
     def get_embeddings(self, text: List[str], **kwargs) -> List[List[float]]:
@@ -38,6 +114,152 @@ class Embedding(ComponentBase):
         List[float]]:
         """Asynchronously get embeddings."""
 
+    def get_cache(self) -> Optional[EmbeddingCache]:
+        """Return the embedding cache, None if the cache is disabled."""
+        if self.cache_max_size <= 0 and not self.cache_disk_path:
+            return None
+        key = (self.name, self.cache_max_size, self.cache_disk_path)
+        with _CACHES_LOCK:
+            cache = _SHARED_CACHES.get(key)
+            if cache is None:
+                cache = _SHARED_CACHES[key] = EmbeddingCache(max_size=self.cache_max_size,
+                                                             disk_path=self.cache_disk_path)
+        return cache
+
+    def get_cache_stats(self) -> Dict[str, float]:
+        """Return the hit and miss counts and the hit rate of the embedding cache."""
+        cache = self.get_cache()
+        return cache.get_stats() if cache else {}
+
+    def _get_cache_keys(self, texts: List[str], text_type: Optional[str]) -> List[str]:
+        """Return the cache key of each text, keyed by the model name, dimensions and text type."""
+        return [EmbeddingCache.make_key(self.embedding_model_name, self.embedding_dims, text_type, text)
+                for text in texts]
+
+    @staticmethod
+    def _get_shared_client(key: tuple, factory: Callable[[], Any]) -> Any:
+        """Return the pooled client of the key, created once per process by the factory.
+
+        The embedding managers hand out a copy of the embedding per call, so the clients are kept
+        at module level to let every copy reuse the same connection pool.
+        """
+        key = (os.getpid(),) + key
+        client = _SHARED_CLIENTS.get(key)
+        if client is None:
+            with _CLIENTS_LOCK:
+                client = _SHARED_CLIENTS.get(key)
+                if client is None:
+                    client = factory()
+                    _SHARED_CLIENTS[key] = client
+        return client
+
+    @staticmethod
+    def _get_shared_async_client(key: tuple, factory: Callable[[], Any]) -> Any:
+        """Return the pooled async client of the key for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with _CLIENTS_LOCK:
+            clients = _SHARED_ASYNC_CLIENTS.setdefault(loop, {})
+            client = clients.get(key)
+            if client is None or getattr(client, 'closed', False):
+                client = factory()
+                clients[key] = client
+        return client
+
+    def _dispatch_batches(self, texts: List[str], embed_batch: Callable[[List[str]], List[List[float]]],
+                          batch_size: Optional[int] = None, retry: bool = True) -> List[List[float]]:
+        """Embed the texts in batches, with at most `max_concurrency` batches in flight.
+
+        Args:
+            texts (List[str]): The texts to embed.
+            embed_batch (Callable): Sends one batch to the embedding backend.
+            batch_size (Optional[int]): The batch size limit of the backend, `max_batch_size` can lower it.
+            retry (bool): Whether to retry a failed batch, disable it for clients retrying by themselves.
+
+        Returns:
+            List[List[float]]: The embeddings in the order of the texts.
+        """
+        batches = batch_texts(texts, self._get_batch_size(batch_size))
+        call = functools.partial(self._call_with_retry, embed_batch) if retry else embed_batch
+        if len(batches) <= 1 or self.max_concurrency <= 1:
+            results = [call(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutorWithReturnValue(max_workers=min(self.max_concurrency, len(batches))) as executor:
+                results = [future.result() for future in [executor.submit(call, batch) for batch in batches]]
+        return [embedding for batch_result in results for embedding in batch_result]
+
+    async def _async_dispatch_batches(self, texts: List[str],
+                                      embed_batch: Callable[[List[str]], Awaitable[List[List[float]]]],
+                                      batch_size: Optional[int] = None, retry: bool = True) -> List[List[float]]:
+        """Asynchronously embed the texts in batches, with at most `max_concurrency` batches in flight."""
+        semaphore = asyncio.Semaphore(max(self.max_concurrency, 1))
+
+        async def call(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                if retry:
+                    return await self._async_call_with_retry(embed_batch, batch)
+                return await embed_batch(batch)
+
+        results = await asyncio.gather(*[call(batch) for batch in batch_texts(texts, self._get_batch_size(batch_size))])
+        return [embedding for batch_result in results for embedding in batch_result]
+
+    def _get_batch_size(self, batch_size: Optional[int]) -> Optional[int]:
+        """Return the batch size of a request, `max_batch_size` never exceeds the backend limit."""
+        if self.max_batch_size and batch_size:
+            return min(self.max_batch_size, batch_size)
+        return self.max_batch_size or batch_size
+
+    def _call_with_retry(self, fn: Callable, *args):
+        """Call the function, retrying a retryable error with an exponential backoff."""
+        attempt = 0
+        while True:
+            try:
+                return fn(*args)
+            except Exception as e:
+                delay = self._get_retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+
+    async def _async_call_with_retry(self, fn: Callable, *args):
+        """Await the function, retrying a retryable error with an exponential backoff."""
+        attempt = 0
+        while True:
+            try:
+                return await fn(*args)
+            except Exception as e:
+                delay = self._get_retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def _get_retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Return the delay before retrying the error, None if it should not be retried.
+
+        The `Retry-After` of a rate limited response is honored, other errors back off
+        exponentially with jitter.
+        """
+        if attempt >= self.max_retries:
+            return None
+        response = getattr(error, 'response', None)
+        status = getattr(error, 'status_code', None) or getattr(response, 'status_code', None) \
+            or getattr(error, 'status', None) or getattr(error, 'code', None)
+        retryable = isinstance(error, (RetryableEmbeddingError, ConnectionError, TimeoutError)) \
+            or status in RETRYABLE_STATUS_CODES or type(error).__name__ in RETRYABLE_ERROR_NAMES
+        if not retryable:
+            return None
+        retry_after = getattr(error, 'retry_after', None)
+        headers = getattr(response, 'headers', None)
+        if retry_after is None and headers is not None:
+            retry_after = headers.get('retry-after')
+        try:
+            # Only the delay in seconds of `Retry-After` is honored, not the http date.
+            return float(retry_after)
+        except (TypeError, ValueError):
+            pass
+        return self.retry_backoff * (2 ** attempt) * random.uniform(0.5, 1.0)
+
     def as_langchain(self) -> LCEmbeddings:
         """Convert the agentUniverse(aU) embedding class to the langchain embedding class."""
         pass
@@ -61,4 +283,93 @@ class Embedding(ComponentBase):
             self.embedding_dims = embedding_configer.embedding_dims
         if hasattr(embedding_configer, "embedding_model_name"):
             self.embedding_model_name = embedding_configer.embedding_model_name
+        if hasattr(embedding_configer, "cache_max_size"):
+            self.cache_max_size = embedding_configer.cache_max_size
+        if hasattr(embedding_configer, "cache_disk_path"):
+            self.cache_disk_path = embedding_configer.cache_disk_path
+        if hasattr(embedding_configer, "max_batch_size"):
+            self.max_batch_size = embedding_configer.max_batch_size
+        if hasattr(embedding_configer, "max_concurrency"):
+            self.max_concurrency = embedding_configer.max_concurrency
+        if hasattr(embedding_configer, "max_retries"):
+            self.max_retries = embedding_configer.max_retries
+        if hasattr(embedding_configer, "retry_backoff"):
+            self.retry_backoff = embedding_configer.retry_backoff
         return self
+
+
+def _lookup_cache(embedding: Embedding, texts: List[str], kwargs: dict):
+    """Return the cache, the cache keys, the cached vectors and the texts to embed, deduplicated."""
+    cache = embedding.get_cache()
+    if cache is None or not texts or _IN_CACHED_CALL.get():
+        return None, None, None, None
+    keys = embedding._get_cache_keys(texts, kwargs.get('text_type', 'document'))
+    vectors = cache.get_many(keys)
+    missed_texts = {}
+    for key, text, vector in zip(keys, texts, vectors):
+        if vector is None:
+            missed_texts.setdefault(key, text)
+    return cache, keys, vectors, missed_texts
+
+
+def _fill_cache(cache: EmbeddingCache, keys: List[str], vectors: list, missed_texts: Dict[str, str],
+                missed_vectors: List[List[float]]) -> Optional[List[List[float]]]:
+    """Cache the embedded vectors and return the vectors of all texts, None if the model did not
+    return one vector per text."""
+    if len(missed_vectors) != len(missed_texts):
+        return None
+    cache.put_many(list(missed_texts.keys()), missed_vectors)
+    embedded = dict(zip(missed_texts.keys(), missed_vectors))
+    return [vector if vector is not None else embedded[key] for key, vector in zip(keys, vectors)]
+
+
+def _cached_get_embeddings(get_embeddings: Callable) -> Callable:
+    @functools.wraps(get_embeddings)
+    def wrapper(self: Embedding, texts: List[str], *args, **kwargs):
+        cache, keys, vectors, missed_texts = _lookup_cache(self, texts, kwargs)
+        if cache is None:
+            return get_embeddings(self, texts, *args, **kwargs)
+        if not missed_texts:
+            return vectors
+        token = _IN_CACHED_CALL.set(True)
+        try:
+            missed_vectors = get_embeddings(self, list(missed_texts.values()), *args, **kwargs)
+        finally:
+            _IN_CACHED_CALL.reset(token)
+        result = _fill_cache(cache, keys, vectors, missed_texts, missed_vectors)
+        if result is None and len(missed_texts) < len(texts):
+            # The model returned a partial result, embed all texts again without the cache
+            token = _IN_CACHED_CALL.set(True)
+            try:
+                return get_embeddings(self, texts, *args, **kwargs)
+            finally:
+                _IN_CACHED_CALL.reset(token)
+        return result if result is not None else missed_vectors
+
+    return wrapper
+
+
+def _cached_async_get_embeddings(async_get_embeddings: Callable) -> Callable:
+    @functools.wraps(async_get_embeddings)
+    async def wrapper(self: Embedding, texts: List[str], *args, **kwargs):
+        cache, keys, vectors, missed_texts = _lookup_cache(self, texts, kwargs)
+        if cache is None:
+            return await async_get_embeddings(self, texts, *args, **kwargs)
+        if not missed_texts:
+            return vectors
+        token = _IN_CACHED_CALL.set(True)
+        try:
+            missed_vectors = await async_get_embeddings(self, list(missed_texts.values()), *args, **kwargs)
+        finally:
+            _IN_CACHED_CALL.reset(token)
+        result = _fill_cache(cache, keys, vectors, missed_texts, missed_vectors)
+        if result is None and len(missed_texts) < len(texts):
+            # The model returned a partial result, embed all texts again without the cache
+            token = _IN_CACHED_CALL.set(True)
+            try:
+                return await async_get_embeddings(self, texts, *args, **kwargs)
+            finally:
+                _IN_CACHED_CALL.reset(token)
+        return result if result is not None else missed_vectors
+
+    return wrapper
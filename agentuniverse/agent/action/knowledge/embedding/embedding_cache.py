@@ -0,0 +1,157 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 22:30
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: embedding_cache.py
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+# Max number of keys bound to one disk tier statement.
+MAX_BATCH_KEYS = 500
+
+
+class EmbeddingCache(object):
+    """A content-addressed embedding cache, with an in-memory LRU tier and an optional SQLite
+    disk tier.
+
+    Entries are keyed by the model name, the embedding dimensions, the text type and the sha256
+    of the text, so a cache file can be shared by several embedding models and, thanks to the
+    WAL journal of SQLite, by several worker processes. Vectors are stored as float64 bytes and
+    read back unchanged. The memory tier keeps vectors as tuples and every lookup returns new
+    lists, so a caller mutating a returned vector never corrupts the cache.
+    """
+
+    def __init__(self, max_size: int = 10000, disk_path: Optional[str] = None):
+        """Initialize the EmbeddingCache.
+
+        Args:
+            max_size(int): the max number of vectors kept in memory, 0 disables the memory tier
+            disk_path(str): the path of the SQLite cache file, None disables the disk tier
+        """
+        self.max_size: int = max_size
+        self.disk_path: Optional[str] = disk_path
+        self.__memory: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__conn: Optional[sqlite3.Connection] = None
+        self.__conn_pid: Optional[int] = None
+        self.__stats: Dict[str, int] = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    @staticmethod
+    def make_key(model_name: Optional[str], dims: Optional[int], text_type: Optional[str], text: str) -> str:
+        """Return the cache key of the text embedded by the model."""
+        text_hash = hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+        return f'{model_name}|{dims}|{text_type}|{text_hash}'
+
+    def get_many(self, keys: List[str]) -> List[Optional[List[float]]]:
+        """Return the cached vector of each key, None for a missed key."""
+        results: List[Optional[List[float]]] = [None] * len(keys)
+        missed = []
+        with self.__lock:
+            for i, key in enumerate(keys):
+                vector = self.__memory.get(key)
+                if vector is None:
+                    missed.append(i)
+                    continue
+                self.__memory.move_to_end(key)
+                results[i] = list(vector)
+            self.__stats['memory_hits'] += len(keys) - len(missed)
+        if missed and self.disk_path:
+            disk_vectors = self.__disk_get(list({keys[i] for i in missed}))
+            still_missed = []
+            for i in missed:
+                vector = disk_vectors.get(keys[i])
+                if vector is None:
+                    still_missed.append(i)
+                else:
+                    results[i] = list(vector)
+            self.__remember(disk_vectors)
+            with self.__lock:
+                self.__stats['disk_hits'] += len(missed) - len(still_missed)
+            missed = still_missed
+        with self.__lock:
+            self.__stats['misses'] += len(missed)
+        return results
+
+    def put_many(self, keys: List[str], vectors: List[List[float]]) -> None:
+        """Cache the vectors of the keys in every tier."""
+        entries = {key: tuple(vector) for key, vector in zip(keys, vectors) if vector is not None and len(vector) > 0}
+        if not entries:
+            return
+        self.__remember(entries)
+        if self.disk_path:
+            self.__disk_put(entries)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Return the hit and miss counts of the cache, and its hit rate."""
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['memory_size'] = len(self.__memory)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Drop the memory tier and reset the stats, the disk tier is kept."""
+        with self.__lock:
+            self.__memory.clear()
+            self.__stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    def __remember(self, entries: Dict[str, Sequence[float]]) -> None:
+        if self.max_size <= 0:
+            return
+        with self.__lock:
+            for key, vector in entries.items():
+                self.__memory[key] = tuple(vector)
+                self.__memory.move_to_end(key)
+            while len(self.__memory) > self.max_size:
+                self.__memory.popitem(last=False)
+
+    def __get_conn(self) -> sqlite3.Connection:
+        # A connection is never shared with a forked worker process.
+        if self.__conn is None or self.__conn_pid != os.getpid():
+            Path(self.disk_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.disk_path, check_same_thread=False, timeout=30)
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('PRAGMA synchronous = NORMAL')
+            with conn:
+                conn.execute('CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)')
+            self.__conn = conn
+            self.__conn_pid = os.getpid()
+        return self.__conn
+
+    def __disk_get(self, keys: List[str]) -> Dict[str, Tuple[float, ...]]:
+        vectors = {}
+        try:
+            with self.__lock:
+                conn = self.__get_conn()
+                for start in range(0, len(keys), MAX_BATCH_KEYS):
+                    batch = keys[start:start + MAX_BATCH_KEYS]
+                    rows = conn.execute(
+                        f'SELECT key, vector FROM embeddings WHERE key IN ({", ".join("?" * len(batch))})',
+                        batch).fetchall()
+                    for key, blob in rows:
+                        vectors[key] = tuple(np.frombuffer(blob, dtype=np.float64).tolist())
+        except sqlite3.Error as e:
+            LOGGER.warn(f"Embedding cache {self.disk_path} read error, skip it. Error is {str(e)}")
+        return vectors
+
+    def __disk_put(self, entries: Dict[str, Tuple[float, ...]]) -> None:
+        rows = [(key, np.asarray(vector, dtype=np.float64).tobytes()) for key, vector in entries.items()]
+        try:
+            with self.__lock:
+                conn = self.__get_conn()
+                with conn:
+                    conn.executemany('INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)', rows)
+        except sqlite3.Error as e:
+            LOGGER.warn(f"Embedding cache {self.disk_path} write error, skip it. Error is {str(e)}")
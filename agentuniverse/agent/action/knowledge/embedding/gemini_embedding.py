@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding:utf-8 -*-
+import asyncio
 from typing import List, Any
 
 from langchain_core.embeddings import Embeddings as LCEmbeddings
@@ -16,6 +17,10 @@ from agentuniverse.base.config.component_configer.component_configer import Comp
 # @mail : wozhapen@gmail.com
 # @FileName :gemini_embedding.py
 
+# Gemini supports max 100 contents in one embedding request.
+GEMINI_MAX_BATCH_SIZE = 100
+
+
 class GeminiEmbedding(Embedding):
     """Gemini Embedding class that inherits from the base Embedding class."""
 
@@ -37,14 +42,17 @@ class GeminiEmbedding(Embedding):
             
         model_name = self.embedding_model_name or "text-embedding-004"  # default model
 
-        try:
+        def embed_content(batch: List[str]) -> List[List[float]]:
             response = self.client.models.embed_content(
                 model=model_name,
-                contents=texts,
+                contents=batch,
                 # gemini default 768, and only support 768
                 # config=EmbedContentConfig(output_dimensionality=(self.embedding_dims or 768))
             )
             return [embedding.values for embedding in response.embeddings]
+
+        try:
+            return self._dispatch_batches(texts, embed_content, batch_size=GEMINI_MAX_BATCH_SIZE)
         except Exception as e:
             print(f"Error generating embedding for text: {texts}. Error: {e}")
             # Handle the error appropriately, e.g., return a zero vector or raise an exception
@@ -52,9 +60,9 @@ class GeminiEmbedding(Embedding):
 
     async def async_get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
         """Asynchronously get embeddings for a list of texts using the Gemini API."""
-        # This implementation is synchronous because the Gemini API does not currently offer an official asynchronous client for embedding.
-        # Consider implementing async batching or utilizing a ThreadPoolExecutor to wrap the synchronous call for better concurrency.
-        return self.get_embeddings(texts, **kwargs)
+        # The Gemini API does not currently offer an official asynchronous client for embedding,
+        # so the synchronous call runs in a worker thread to keep the event loop free.
+        return await asyncio.to_thread(self.get_embeddings, texts, **kwargs)
 
     def as_langchain(self) -> LCEmbeddings:
         """Convert to a Langchain Embedding class."""
@@ -9,7 +9,6 @@
 from typing import Any, Optional, List
 from pydantic import Field
 import httpx
-import asyncio
 
 from agentuniverse.base.util.env_util import get_from_env
 from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
@@ -17,7 +16,11 @@ from agentuniverse.base.config.component_configer.component_configer import Comp
 
 
 class OllamaEmbedding(Embedding):
-    """The Ollama embedding class."""
+    """The Ollama embedding class.
+
+    The Ollama embeddings api embeds one text per request, the requests of a call are sent
+    concurrently through pooled http clients.
+    """
 
     ollama_base_url: Optional[str] = Field(
         default_factory=lambda: get_from_env("OLLAMA_BASE_URL") or "http://localhost:11434")
@@ -43,24 +46,22 @@ class OllamaEmbedding(Embedding):
             Exception: If the API call fails or if required configuration is missing.
         """
         self._initialize_clients()
-        
-        try:
-            embeddings = []
-            for text in texts:
-                response = self.client.post(
-                    f"{self.ollama_base_url}/api/embeddings",
-                    json={
-                        "model": self.embedding_model_name,
-                        "prompt": text
-                    },
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                result = response.json()
-                embeddings.append(result["embedding"])
-            
-            return embeddings
 
+        def get_single_embedding(batch: List[str]) -> List[List[float]]:
+            response = self.client.post(
+                f"{self.ollama_base_url}/api/embeddings",
+                json={
+                    "model": self.embedding_model_name,
+                    "prompt": batch[0]
+                },
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            result = response.json()
+            return [result["embedding"]]
+
+        try:
+            return self._dispatch_batches(texts, get_single_embedding, batch_size=1)
         except Exception as e:
             raise Exception(f"Failed to get embeddings: {e}")
 
@@ -74,26 +75,23 @@ class OllamaEmbedding(Embedding):
         Raises:
             Exception: If the API call fails or if required configuration is missing.
         """
-        self._initialize_clients()
+        self._initialize_clients(async_client=True)
+
+        async def get_single_embedding(batch: List[str]) -> List[List[float]]:
+            response = await self.async_client.post(
+                f"{self.ollama_base_url}/api/embeddings",
+                json={
+                    "model": self.embedding_model_name,
+                    "prompt": batch[0]
+                },
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            result = response.json()
+            return [result["embedding"]]
 
         try:
-            async def get_single_embedding(text: str) -> List[float]:
-                response = await self.async_client.post(
-                    f"{self.ollama_base_url}/api/embeddings",
-                    json={
-                        "model": self.embedding_model_name,
-                        "prompt": text
-                    },
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                result = response.json()
-                return result["embedding"]
-
-            tasks = [get_single_embedding(text) for text in texts]
-            embeddings = await asyncio.gather(*tasks)
-            return embeddings
-
+            return await self._async_dispatch_batches(texts, get_single_embedding, batch_size=1)
         except Exception as e:
             raise Exception(f"Failed to get embeddings: {e}")
 
@@ -129,7 +127,7 @@ class OllamaEmbedding(Embedding):
             self.timeout = embedding_configer.timeout
         return self
 
-    def _initialize_clients(self) -> None:
+    def _initialize_clients(self, async_client: bool = False) -> None:
         if not self.ollama_base_url:
             raise Exception("OLLAMA_BASE_URL is missing")
         if not self.embedding_model_name:
@@ -139,15 +137,14 @@ class OllamaEmbedding(Embedding):
         if self.ollama_api_key:
             headers["Authorization"] = f"Bearer {self.ollama_api_key}"
 
-        if self.client is None:
-            self.client = httpx.Client(
-                base_url=self.ollama_base_url,
-                headers=headers,
-                timeout=self.timeout
-            )
-        if self.async_client is None:
-            self.async_client = httpx.AsyncClient(
-                base_url=self.ollama_base_url,
-                headers=headers,
-                timeout=self.timeout
-            )
+        # The clients are shared by the copies of the embedding to reuse their connection pools.
+        client_args = dict(
+            base_url=self.ollama_base_url,
+            headers=headers,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=max(self.max_concurrency, 1))
+        )
+        client_key = ('ollama', self.ollama_base_url, self.ollama_api_key, self.timeout, self.max_concurrency)
+        self.client = self._get_shared_client(client_key, lambda: httpx.Client(**client_args))
+        if async_client:
+            self.async_client = self._get_shared_async_client(client_key, lambda: httpx.AsyncClient(**client_args))
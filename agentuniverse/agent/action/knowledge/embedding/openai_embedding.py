@@ -17,9 +17,16 @@ from agentuniverse.base.util.env_util import get_from_env
 from agentuniverse.base.config.component_configer.component_configer import \
     ComponentConfiger
 
+# OpenAI supports max 2048 inputs in one embedding request.
+OPENAI_MAX_BATCH_SIZE = 2048
+
 
 class OpenAIEmbedding(Embedding):
-    """The openai embedding class."""
+    """The openai embedding class.
+
+    The clients are shared by all the copies of the embedding, so their http connection pools are
+    reused across the calls. Throttled requests are retried by the openai clients, `max_retries` times.
+    """
 
     openai_client_args: Optional[dict] = None
     openai_api_key: Optional[str] = Field(default_factory=lambda: get_from_env("OPENAI_API_KEY"))
@@ -43,23 +50,26 @@ class OpenAIEmbedding(Embedding):
          Raises:
              ValueError: If texts exceed the embedding model token limit or missing some required parameters.
          """
-        self.client = OpenAI(api_key=self.openai_api_key, **self.openai_client_args or {})
+        self.client = self._get_shared_client(self._get_client_key(), lambda: OpenAI(**self._get_client_args()))
         if self.embedding_model_name is None:
             raise ValueError("Must provide `embedding_model_name`")
-        try:
-            if self.dimensions:
-                response = self.client.embeddings.create(input=texts, model=self.embedding_model_name,
-                                                         dimensions=self.dimensions)
-            else:
-                response = self.client.embeddings.create(input=texts, model=self.embedding_model_name)
 
-            # Extract the embedding data from the response
-            data = response.data
+        def create(batch: List[str]) -> List[List[float]]:
+            try:
+                if self.dimensions:
+                    response = self.client.embeddings.create(input=batch, model=self.embedding_model_name,
+                                                             dimensions=self.dimensions)
+                else:
+                    response = self.client.embeddings.create(input=batch, model=self.embedding_model_name)
 
-            # Return the embeddings as a list of lists of floats
-            return [embedding.embedding for embedding in data]
-        except BadRequestError as e:
-            raise ValueError(e.message)
+                # Extract the embedding data from the response
+                data = response.data
+
+                # Return the embeddings as a list of lists of floats
+                return [embedding.embedding for embedding in data]
+            except BadRequestError as e:
+                raise ValueError(e.message)
+        return self._dispatch_batches(texts, create, batch_size=OPENAI_MAX_BATCH_SIZE, retry=False)
 
     async def async_get_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Asynchronously get the OpenAI embeddings.
@@ -76,25 +86,44 @@ class OpenAIEmbedding(Embedding):
          Raises:
              ValueError: If texts exceed the embedding model token limit or missing some required parameters.
          """
-        self.async_client = AsyncOpenAI(api_key=self.openai_api_key, **self.openai_client_args or {})
+        self.async_client = self._get_shared_async_client(self._get_client_key(),
+                                                          lambda: AsyncOpenAI(**self._get_client_args()))
         if self.embedding_model_name is None:
             raise ValueError("Must provide `embedding_model_name`")
-        try:
-            if self.dimensions:
-                response = await self.async_client.embeddings.create(input=texts, model=self.embedding_model_name,
-                                                                     dimensions=self.dimensions)
-            else:
-                response = await self.async_client.embeddings.create(input=texts, model=self.embedding_model_name)
-            # Extract the embedding data from the response
-            data = response.data
-
-            # Return the embeddings as a list of lists of floats
-            return [embedding.embedding for embedding in data]
-        except BadRequestError as e:
-            raise ValueError(e.message)
+
+        async def create(batch: List[str]) -> List[List[float]]:
+            try:
+                if self.dimensions:
+                    response = await self.async_client.embeddings.create(input=batch,
+                                                                         model=self.embedding_model_name,
+                                                                         dimensions=self.dimensions)
+                else:
+                    response = await self.async_client.embeddings.create(input=batch,
+                                                                         model=self.embedding_model_name)
+                # Extract the embedding data from the response
+                data = response.data
+
+                # Return the embeddings as a list of lists of floats
+                return [embedding.embedding for embedding in data]
+            except BadRequestError as e:
+                raise ValueError(e.message)
+        return await self._async_dispatch_batches(texts, create, batch_size=OPENAI_MAX_BATCH_SIZE, retry=False)
+
+    def _get_client_args(self) -> dict:
+        """Return the openai client args, the openai clients retry the throttled requests."""
+        return {'api_key': self.openai_api_key, 'max_retries': self.max_retries, **(self.openai_client_args or {})}
+
+    def _get_client_key(self) -> tuple:
+        return 'openai', repr(sorted(self._get_client_args().items(), key=lambda item: item[0]))
 
     def as_langchain(self) -> OpenAIEmbeddings:
         """Convert the agentUniverse(aU) openai embedding class to the langchain openai embedding class."""
+        if self.client is None:
+            self.client = self._get_shared_client(self._get_client_key(), lambda: OpenAI(**self._get_client_args()))
+        if self.async_client is None:
+            # No event loop may be running here, so the async client is shared per process, not per loop
+            self.async_client = self._get_shared_client(self._get_client_key() + ('async',),
+                                                        lambda: AsyncOpenAI(**self._get_client_args()))
         return OpenAIEmbeddings(openai_api_key=self.openai_api_key,
                                 client=self.client.embeddings, async_client=self.async_client.embeddings)
 
@@ -5,17 +5,23 @@ import asyncio
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: knowledge.py
+import glob
+import json
 import os
+import pickle
 import re
+import threading
 import traceback
-from copy import deepcopy
-from typing import Optional, Dict, List, Any
-from concurrent.futures import wait, ALL_COMPLETED
+from collections import deque
+from typing import Optional, Dict, List, Any, Callable, Iterable, Iterator, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor, wait, ALL_COMPLETED, FIRST_COMPLETED
 
 from langchain_core.utils.json import parse_json_markdown
 from langchain.tools import Tool as LangchainTool
 
 from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
+from agentuniverse.agent.action.knowledge.knowledge_manifest import KnowledgeManifest
+from agentuniverse.agent.action.knowledge.knowledge_query_cache import KnowledgeQueryCache
 from agentuniverse.agent.action.knowledge.store.document import Document
 from agentuniverse.agent.action.knowledge.store.query import Query
 from agentuniverse.agent.action.knowledge.store.store_manager import StoreManager
@@ -29,9 +35,16 @@ from agentuniverse.agent.action.knowledge.reader.reader_manager import ReaderMan
 from agentuniverse.base.annotation.trace import trace_knowledge
 from agentuniverse.base.component.component_base import ComponentBase
 from agentuniverse.base.component.component_enum import ComponentEnum
+from agentuniverse.base.util.copy_util import CopyOnWriteDict, freeze_snapshot
+from agentuniverse.base.util.executor_registry import ExecutorRegistry
 from agentuniverse.base.util.logging.logging_util import LOGGER
 from agentuniverse.agent_serve.web.thread_with_result import ThreadPoolExecutorWithReturnValue
 
+# The query caches are shared by the copies of a knowledge handed out by the manager, keyed by
+# the knowledge name, so a write through any copy invalidates the results of all of them
+_QUERY_CACHES: Dict[str, KnowledgeQueryCache] = {}
+_QUERY_CACHES_LOCK = threading.Lock()
+
 
 class Knowledge(ComponentBase):
     """
@@ -60,8 +73,29 @@ class Knowledge(ComponentBase):
         readers (Dict[str, str]): The readers of the knowledge, which are used to load data and generate knowledge.
             Each reader refers to a specific file type.
 
-        insert_executor (ThreadPoolExecutor): Used for performing insert and search
-        operations concurrently in multiple stores.
+        insert_executor (ThreadPoolExecutor): Used for performing insert operations concurrently
+            in multiple stores, None to use the `knowledge_insert` executor shared by all knowledge.
+
+        query_executor (ThreadPoolExecutor): Used for performing search operations concurrently
+            in multiple stores, None to use the `knowledge_query` executor shared by all knowledge.
+
+        stream_insert (bool): Whether to insert and update the knowledge in streaming mode, where the
+            reader yields documents lazily, processors run on micro-batches and the stores write a
+            batch while the next one is read, so the memory is bounded whatever the source size.
+
+        insert_batch_size (int): The number of documents in a micro-batch of the streaming mode.
+
+        ingest_workers (int): The number of files read concurrently by `batch_insert_knowledge`.
+
+        manifest_path (Optional[str]): The path of the ingestion manifest of the knowledge. When set,
+            `update_knowledge` and `sync_knowledge` only write the chunks of the changed sources.
+
+        query_cache_size (int): The max number of query results cached, 0 disables the query cache.
+
+        query_cache_ttl (Optional[float]): The seconds a cached query result stays valid. A write
+            invalidates the cache of its own process only, so the ttl bounds how long the other
+            processes, like the other gunicorn workers, may serve stale results. It must be positive
+            when the query cache is enabled.
 
         ext_info (Optional[Dict]): The extended information of the knowledge.
     """
@@ -81,20 +115,40 @@ class Knowledge(ComponentBase):
     insert_executor: Optional[ThreadPoolExecutorWithReturnValue] = None
     query_executor: Optional[ThreadPoolExecutorWithReturnValue] = None
     tracing: Optional[bool] = None
+    stream_insert: bool = False
+    insert_batch_size: int = 256
+    ingest_workers: int = 4
+    manifest_path: Optional[str] = None
+    query_cache_size: int = 0
+    query_cache_ttl: Optional[float] = 300
     ext_info: Optional[Dict] = None
+    # the frozen snapshot of ext_info, shared by the copies
+    _frozen_ext_info: Optional[dict] = None
 
     def __init__(self, **kwargs):
         super().__init__(component_type=ComponentEnum.KNOWLEDGE, **kwargs)
-        self.insert_executor = ThreadPoolExecutorWithReturnValue(
-            max_workers=5,
-            thread_name_prefix="Knowledge store"
-        )
-        self.query_executor = ThreadPoolExecutorWithReturnValue(
-            max_workers=10,
-            thread_name_prefix="Knowledge query"
-        )
+
+    def _get_insert_executor(self) -> ThreadPoolExecutorWithReturnValue:
+        """Return the insert executor, the shared `knowledge_insert` executor if none is set.
+
+        The shared executor is looked up on every use, so the knowledge follows the registry when
+        it drops its pools in a forked worker or after a shutdown.
+        """
+        return self.insert_executor or ExecutorRegistry().get_executor("knowledge_insert", max_workers=8)
+
+    def _get_query_executor(self) -> ThreadPoolExecutorWithReturnValue:
+        """Return the query executor, the shared `knowledge_query` executor if none is set."""
+        return self.query_executor or ExecutorRegistry().get_executor("knowledge_query", max_workers=16)
 
     def _load_data(self, *args: Any, **kwargs: Any) -> List[Document]:
+        reader, source_path = self._get_reader(**kwargs)
+        return reader.load_data(source_path)
+
+    def _iter_data(self, *args: Any, **kwargs: Any) -> Iterator[Document]:
+        reader, source_path = self._get_reader(**kwargs)
+        return reader.iter_data(source_path)
+
+    def _get_reader(self, **kwargs: Any) -> Tuple[Reader, str]:
         # check if source is a local file or remote url
         if kwargs.get("source_path"):
             source_path = kwargs.get("source_path")
@@ -119,7 +173,9 @@ class Knowledge(ComponentBase):
             reader = ReaderManager().get_instance_obj(self.readers[source_type])
         else:
             reader = ReaderManager().get_file_default_reader(source_type)
-        return reader.load_data(source_path)
+        if reader is None:
+            raise Exception(f"Knowledge load data error: No reader for source type:{source_type}")
+        return reader, source_path
 
     def _insert_process(self, origin_docs: List[Document]) -> List[Document]:
         for _processor_code in self.insert_processors:
@@ -139,6 +195,12 @@ class Knowledge(ComponentBase):
             origin_docs = doc_processor.process_docs(origin_docs, query=query)
         return origin_docs
 
+    async def _async_rag_post_process(self, origin_docs: List[Document], query: Query):
+        for _processor_code in self.post_processors:
+            doc_processor: DocProcessor = DocProcessorManager().get_instance_obj(_processor_code)
+            origin_docs = await doc_processor.async_process_docs(origin_docs, query=query)
+        return origin_docs
+
     def _paraphrase_query(self, origin_query: Query) -> Query:
         for _paraphraser_code in self.query_paraphrasers:
             query_paraphraser: QueryParaphraser = QueryParaphraserManager().get_instance_obj(
@@ -146,67 +208,392 @@ class Knowledge(ComponentBase):
             origin_query = query_paraphraser.query_paraphrase(origin_query)
         return origin_query
 
+    async def _async_paraphrase_query(self, origin_query: Query) -> Query:
+        for _paraphraser_code in self.query_paraphrasers:
+            query_paraphraser: QueryParaphraser = QueryParaphraserManager().get_instance_obj(
+                _paraphraser_code)
+            origin_query = await query_paraphraser.async_query_paraphrase(origin_query)
+        return origin_query
+
     def insert_knowledge(self, **kwargs) -> None:
         """Insert the knowledge.
 
-        Load data by the reader and insert the documents into the store.
+        Load data by the reader and insert the documents into the store. In streaming mode,
+        enabled by `stream_insert` or the `stream` kwarg, documents are inserted in micro-batches.
         """
-        document_list: List[Document] = self._load_data(**kwargs)
-        document_list = self._insert_process(document_list)
-        futures = []
-        if "stores" in kwargs:
-            stores = kwargs["stores"]
+        stores = kwargs["stores"] if "stores" in kwargs else self.stores
+        if kwargs.get("stream", self.stream_insert):
+            self._stream_to_stores(self._iter_data(**kwargs), self._insert_process,
+                                   "insert_document", stores, "insert")
         else:
-            stores = self.stores
-        for _store_code in stores:
-            futures.append(
-                self.insert_executor.submit(
-                    StoreManager().get_instance_obj(_store_code).insert_document,
-                    document_list))
+            document_list: List[Document] = self._load_data(**kwargs)
+            document_list = self._insert_process(document_list)
+            self._wait_store_futures(self._submit_to_stores(document_list, "insert_document", stores),
+                                     "insert")
+        LOGGER.info("Knowledge insert complete.")
+
+    def update_knowledge(self, **kwargs) -> None:
+        """Update the knowledge.
+
+        Load data by the reader and update the documents into the store. With a manifest, the
+        source is skipped if unchanged, otherwise only its new or changed chunks are written and
+        the chunks gone from it are deleted. In streaming mode, enabled by `stream_insert` or the
+        `stream` kwarg, documents are updated in micro-batches.
+        """
+        stores = kwargs["stores"] if "stores" in kwargs else self.stores
+        manifest_path = kwargs.get("manifest_path") or self.manifest_path
+        if manifest_path:
+            manifest = KnowledgeManifest(manifest_path)
+            status = self._update_source_incrementally(kwargs.get("source_path"), stores, manifest)
+            manifest.save()
+            LOGGER.info(f"Knowledge update complete, source {status}.")
+            return
+        if kwargs.get("stream", self.stream_insert):
+            self._stream_to_stores(self._iter_data(**kwargs), self._update_process,
+                                   "update_document", stores, "update")
+        else:
+            document_list: List[Document] = self._load_data(**kwargs)
+            document_list = self._update_process(document_list)
+            self._wait_store_futures(self._submit_to_stores(document_list, "update_document", stores),
+                                     "update")
+        LOGGER.info("Knowledge update complete.")
+
+    def sync_knowledge(self, **kwargs) -> Dict[str, Any]:
+        """Synchronize the knowledge with a corpus of sources through the manifest.
+
+        The sources are given like in `batch_insert_knowledge`. Unchanged sources are skipped,
+        changed and new ones are updated chunk by chunk, and the chunks of the sources recorded
+        in the manifest but gone from the corpus are deleted, unless `remove_missing` is False.
+        So a sync costs time in proportion to the changes, not to the corpus size.
+
+        Returns:
+            Dict[str, Any]: The `unchanged`, `updated` and `removed` source paths, and the
+                `failed` source paths mapped to their error messages.
+        """
+        manifest_path = kwargs.get("manifest_path") or self.manifest_path
+        if not manifest_path:
+            raise Exception("Knowledge sync error: No manifest_path configured.")
+        stores = kwargs["stores"] if "stores" in kwargs else self.stores
+        manifest = KnowledgeManifest(manifest_path)
+        source_paths = self._collect_source_paths(**kwargs)
+        report = {"unchanged": [], "updated": [], "removed": [], "failed": {}}
+        try:
+            for source_path in source_paths:
+                try:
+                    status = self._update_source_incrementally(source_path, stores, manifest)
+                    report[status].append(source_path)
+                except Exception as e:
+                    report["failed"][source_path] = str(e)
+                    LOGGER.error(f"Knowledge sync failed on {source_path}: {e}")
+            if kwargs.get("remove_missing", True):
+                for source_path in set(manifest.list_sources()) - set(source_paths):
+                    try:
+                        self._remove_chunks(list(manifest.get_chunks(source_path)), source_path, stores, manifest)
+                        manifest.remove_source(source_path)
+                        report["removed"].append(source_path)
+                    except Exception as e:
+                        report["failed"][source_path] = str(e)
+                        LOGGER.error(f"Knowledge sync failed on removing {source_path}: {e}")
+        finally:
+            manifest.save()
+        LOGGER.info(f"Knowledge sync complete, {len(report['updated'])} updated, "
+                    f"{len(report['unchanged'])} unchanged, {len(report['removed'])} removed, "
+                    f"{len(report['failed'])} failed.")
+        return report
+
+    def _update_source_incrementally(self, source_path: str, stores: List[str],
+                                     manifest: KnowledgeManifest) -> str:
+        """Write the changes of a source into the stores and record them in the manifest.
+
+        Returns:
+            str: `unchanged` if the source file hash is the recorded one, `updated` otherwise.
+        """
+        source_hash = KnowledgeManifest.hash_file(source_path)
+        if source_hash is not None and source_hash == manifest.get_source_hash(source_path):
+            return "unchanged"
+        document_list = self._update_process(self._load_data(source_path=source_path))
+        old_chunks = manifest.get_chunks(source_path)
+        # Chunk ids derive from the text, so an unchanged chunk keeps its id and digest and is
+        # never embedded again
+        changed_documents = [document for document in document_list
+                             if old_chunks.get(document.id) != KnowledgeManifest.chunk_digest(document)]
+        new_ids = {document.id for document in document_list}
+        if changed_documents:
+            errors = self._collect_store_errors(self._submit_to_stores(changed_documents, "upsert_document", stores))
+            if errors:
+                raise Exception("; ".join(errors))
+        self._remove_chunks([chunk_id for chunk_id in old_chunks if chunk_id not in new_ids],
+                            source_path, stores, manifest)
+        manifest.set_source(source_path, source_hash, document_list)
+        LOGGER.info(f"Knowledge source {source_path} updated, {len(changed_documents)} chunks written, "
+                    f"{len(document_list) - len(changed_documents)} unchanged.")
+        return "updated"
+
+    def _remove_chunks(self, chunk_ids: List[str], source_path: str, stores: List[str],
+                       manifest: KnowledgeManifest) -> None:
+        """Delete the chunks of a source from the stores, except those shared by another source."""
+        shared_ids = manifest.get_chunk_ids(exclude_source=source_path)
+        chunk_ids = [chunk_id for chunk_id in chunk_ids if chunk_id not in shared_ids]
+        if not chunk_ids:
+            return
+
+        def delete_chunks(store):
+            for chunk_id in chunk_ids:
+                store.delete_document(chunk_id)
+        futures = [self._get_insert_executor().submit(delete_chunks, StoreManager().get_instance_obj(_store_code))
+                   for _store_code in stores]
+        errors = self._collect_store_errors(futures)
+        if errors:
+            raise Exception("; ".join(errors))
+
+    def _submit_to_stores(self, document_list: List[Document], method_name: str,
+                          stores: List[Any]) -> List[Future]:
+        """Write the documents into every store concurrently, the stores may be codes or instances."""
+        futures = []
+        for _store in stores:
+            if isinstance(_store, str):
+                _store = StoreManager().get_instance_obj(_store)
+            futures.append(self._get_insert_executor().submit(getattr(_store, method_name), document_list))
+        return futures
+
+    def _wait_store_futures(self, futures: List[Future], action: str) -> None:
         wait(futures, return_when=ALL_COMPLETED)
+        # Every write to the stores ends here or in `_collect_store_errors`, so the query
+        # results cached before it are dropped once it is done
+        self.invalidate_query_cache()
         for future in futures:
             try:
                 future.result()
             except Exception as e:
                 traceback.print_exc()
-                LOGGER.error(f"Exception occurred in knowledge insert: {e}")
-        LOGGER.info("Knowledge insert complete.")
+                LOGGER.error(f"Exception occurred in knowledge {action}: {e}")
+
+    @staticmethod
+    def _iter_batches(documents: Iterable[Document], batch_size: int) -> Iterator[List[Document]]:
+        batch = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _stream_to_stores(self, documents: Iterable[Document],
+                          process: Callable[[List[Document]], List[Document]],
+                          method_name: str, stores: List[str], action: str) -> None:
+        """Process and write the documents micro-batch by micro-batch.
+
+        The next batch is read and processed while the stores write the current one, and a batch
+        is only handed to the stores once they are done with the previous one. So at most two
+        batches are held in memory, and each store receives its batches in order.
+        """
+        store_instances = [StoreManager().get_instance_obj(_store_code) for _store_code in stores]
+        pending: List[Future] = []
+        batch_count = 0
+        for batch in self._iter_batches(documents, max(self.insert_batch_size, 1)):
+            batch = process(batch)
+            if not batch:
+                continue
+            self._wait_store_futures(pending, action)
+            pending = self._submit_to_stores(batch, method_name, store_instances)
+            batch_count += 1
+        self._wait_store_futures(pending, action)
+        LOGGER.info(f"Knowledge {action} streamed {batch_count} batches.")
+
+    def batch_insert_knowledge(self, **kwargs) -> Dict[str, Any]:
+        """Insert the knowledge of many files.
+
+        The files are given by `source_paths`, a `source_dir` searched with `glob_pattern`
+        (default all files, recursively), or a `source_manifest` file listing one path per line
+        or a json list of paths. The files are read concurrently, in a process pool for CPU bound
+        readers such as pdf and OCR readers and in a thread pool for the others. Then each file is
+        processed and written into the stores as soon as it is read. A failing file is logged and
+        reported without stopping the others.
 
-    def update_knowledge(self, **kwargs) -> None:
-        """Update the knowledge.
+        Args:
+            **kwargs: The source kwargs above, optional `stores`, `max_workers` overriding
+                `ingest_workers` and `progress_callback`, called with the number of finished
+                files, the total, the file path and the error message or None.
 
-        Load data by the reader and update the documents into the store.
+        Returns:
+            Dict[str, Any]: The `total` file count, the `succeeded` file paths and the `failed`
+                file paths mapped to their error messages.
         """
-        document_list: List[Document] = self._load_data(**kwargs)
-        document_list = self._update_process(document_list)
-        futures = []
-        if "stores" in kwargs:
-            stores = kwargs["stores"]
-        else:
-            stores = self.stores
-        for _store_code in stores:
-            futures.append(
-                self.insert_executor.submit(
-                    StoreManager().get_instance_obj(_store_code).update_document,
-                    document_list))
+        source_paths = self._collect_source_paths(**kwargs)
+        stores = kwargs["stores"] if "stores" in kwargs else self.stores
+        progress_callback = kwargs.get("progress_callback")
+        max_workers = max(kwargs.get("max_workers") or self.ingest_workers, 1)
+        report = {"total": len(source_paths), "succeeded": [], "failed": {}}
+
+        def finish(source_path: str, error: Optional[str] = None):
+            if error is None:
+                report["succeeded"].append(source_path)
+            else:
+                report["failed"][source_path] = error
+                LOGGER.error(f"Knowledge batch insert failed on {source_path}: {error}")
+            done = len(report["succeeded"]) + len(report["failed"])
+            LOGGER.info(f"Knowledge batch insert progress: {done}/{report['total']} {source_path}")
+            if progress_callback:
+                progress_callback(done, report["total"], source_path, error)
+
+        readers = []
+        for source_path in source_paths:
+            try:
+                readers.append(self._get_reader(source_path=source_path))
+            except Exception as e:
+                finish(source_path, str(e))
+        process_readers, thread_readers, picklable = [], [], {}
+        for reader, source_path in readers:
+            if reader.cpu_bound and type(reader) not in picklable:
+                picklable[type(reader)] = self._is_picklable(reader)
+            if reader.cpu_bound and picklable[type(reader)]:
+                process_readers.append((reader, source_path))
+            else:
+                thread_readers.append((reader, source_path))
+
+        # Thread readers run on the shared ingest pool, at most `max_workers` of them per call
+        thread_pool = ExecutorRegistry().get_executor("knowledge_ingest", max_workers=max_workers)
+        process_pool = ProcessPoolExecutor(max_workers=max_workers) if process_readers else None
+        pending_readers = deque(thread_readers)
+        thread_futures = set()
+
+        def submit_thread_readers():
+            while pending_readers and len(thread_futures) < max_workers:
+                reader, source_path = pending_readers.popleft()
+                future = thread_pool.submit(_read_source, reader, source_path)
+                thread_futures.add(future)
+                futures[future] = source_path
+
+        try:
+            futures = {process_pool.submit(_read_source, reader, source_path): source_path
+                       for reader, source_path in process_readers}
+            submit_thread_readers()
+            # Files are processed and written in completion order, one at a time
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source_path = futures.pop(future)
+                    thread_futures.discard(future)
+                    submit_thread_readers()
+                    try:
+                        document_list = self._insert_process(future.result())
+                        errors = self._collect_store_errors(
+                            self._submit_to_stores(document_list, "insert_document", stores))
+                        finish(source_path, "; ".join(errors) if errors else None)
+                    except Exception as e:
+                        finish(source_path, str(e))
+        finally:
+            for future in thread_futures:
+                future.cancel()
+            if process_pool is not None:
+                process_pool.shutdown(wait=True)
+        LOGGER.info(f"Knowledge batch insert complete, {len(report['succeeded'])} succeeded, "
+                    f"{len(report['failed'])} failed.")
+        return report
+
+    @staticmethod
+    def _collect_source_paths(**kwargs) -> List[str]:
+        """Collect the file paths given by `source_paths`, `source_dir` and `source_manifest`."""
+        source_paths = list(kwargs.get("source_paths") or [])
+        if kwargs.get("source_dir"):
+            pattern = os.path.join(kwargs["source_dir"], kwargs.get("glob_pattern") or "**/*")
+            source_paths.extend(sorted(path for path in glob.glob(pattern, recursive=True)
+                                       if os.path.isfile(path)))
+        if kwargs.get("source_manifest"):
+            manifest_path = kwargs["source_manifest"]
+            with open(manifest_path, encoding="utf-8") as f:
+                content = f.read()
+            if manifest_path.endswith(".json"):
+                paths = json.loads(content)
+            else:
+                paths = [line.strip() for line in content.splitlines()
+                         if line.strip() and not line.strip().startswith("#")]
+            # Relative paths in a manifest are relative to the manifest itself
+            manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+            source_paths.extend(path if re.match(r'^(https?:)?//', path) or os.path.isabs(path)
+                                else os.path.join(manifest_dir, path) for path in paths)
+        return list(dict.fromkeys(source_paths))
+
+    @staticmethod
+    def _is_picklable(reader: Reader) -> bool:
+        # A reader holding a client or lock can not be sent to a worker process.
+        try:
+            pickle.dumps(reader)
+            return True
+        except Exception:
+            return False
+
+    def _collect_store_errors(self, futures: List[Future]) -> List[str]:
         wait(futures, return_when=ALL_COMPLETED)
+        self.invalidate_query_cache()
+        errors = []
         for future in futures:
             try:
                 future.result()
             except Exception as e:
-                traceback.print_exc()
-                LOGGER.error(f"Exception occurred in knowledge update: {e}")
-        LOGGER.info("Knowledge update complete.")
+                errors.append(str(e))
+        return errors
 
     def _route_rag(self, query: Query):
         return RagRouterManager().get_instance_obj(self.rag_router).rag_route(query, self.stores)
 
+    async def _async_route_rag(self, query: Query):
+        return await RagRouterManager().get_instance_obj(self.rag_router).async_rag_route(query, self.stores)
+
     @trace_knowledge
     def query_knowledge(self, **kwargs) -> List[Document]:
         """Query the knowledge.
 
-        Query documents from the store and return the results.
+        Query documents from the store and return the results. With the query cache enabled,
+        repeated queries are served from the cache and concurrent identical queries run once.
         """
+        cache = self.get_query_cache()
+        cache_key = self._get_query_cache_key(kwargs) if cache else None
+        if cache_key is None:
+            return self._query_knowledge(**kwargs)
+        return cache.get_or_compute(cache_key, lambda: self._query_knowledge(**kwargs))
+
+    def get_query_cache(self) -> Optional[KnowledgeQueryCache]:
+        """Return the query cache of the knowledge, None if the cache is disabled."""
+        if self.query_cache_size <= 0:
+            return None
+        if self.query_cache_ttl is None or self.query_cache_ttl <= 0:
+            raise ValueError(f"Knowledge {self.name} enables the query cache, the query_cache_ttl "
+                             f"must be a positive number of seconds, got {self.query_cache_ttl}.")
+        with _QUERY_CACHES_LOCK:
+            cache = _QUERY_CACHES.get(self.name)
+            if cache is None:
+                cache = _QUERY_CACHES[self.name] = KnowledgeQueryCache(max_size=self.query_cache_size,
+                                                                       ttl=self.query_cache_ttl)
+        return cache
+
+    def invalidate_query_cache(self) -> None:
+        """Drop the cached query results, called whenever documents are written to the knowledge."""
+        with _QUERY_CACHES_LOCK:
+            cache = _QUERY_CACHES.get(self.name)
+        if cache is not None:
+            cache.invalidate()
+
+    def _get_query_cache_key(self, query_kwargs: Dict[str, Any]) -> Optional[str]:
+        """Return the cache key of a query, None if the query can not be cached.
+
+        The key covers the query string with its whitespace normalized, the stores, the top k and
+        every other query argument. Queries with images are not cached.
+        """
+        if query_kwargs.get("query_image_bundles"):
+            return None
+        query_kwargs = dict(query_kwargs)
+        query_str = query_kwargs.pop("query_str", None)
+        if isinstance(query_str, str):
+            query_str = " ".join(query_str.split())
+        try:
+            return json.dumps([query_str, self.stores, self.rag_router, query_kwargs],
+                              sort_keys=True, ensure_ascii=False, default=sorted)
+        except TypeError:
+            return None
+
+    def _query_knowledge(self, **kwargs) -> List[Document]:
         query = Query(**kwargs)
         query = self._paraphrase_query(query)
         query_tasks = self._route_rag(query)
@@ -214,7 +601,7 @@ class Knowledge(ComponentBase):
         futures = []
         for query_task in query_tasks:
             futures.append(
-                self.query_executor.submit(
+                self._get_query_executor().submit(
                     StoreManager().get_instance_obj(query_task[1]).query,
                     query_task[0]))
         wait(futures, return_when=ALL_COMPLETED)
@@ -232,6 +619,42 @@ class Knowledge(ComponentBase):
         retrieved_docs = self._rag_post_process(retrieved_docs, query)
         return retrieved_docs
 
+    @trace_knowledge
+    async def async_query_knowledge(self, **kwargs) -> List[Document]:
+        """Asynchronously query the knowledge.
+
+        The query is paraphrased, routed, sent to every store with `async_query` at once by
+        `asyncio.gather` and post processed with `async_process_docs`, so the stores and
+        processors with a native async implementation use no worker thread. The query cache
+        is shared with `query_knowledge`.
+        """
+        cache = self.get_query_cache()
+        cache_key = self._get_query_cache_key(kwargs) if cache else None
+        if cache_key is None:
+            return await self._async_query_knowledge(**kwargs)
+        return await cache.async_get_or_compute(cache_key, lambda: self._async_query_knowledge(**kwargs))
+
+    async def _async_query_knowledge(self, **kwargs) -> List[Document]:
+        query = Query(**kwargs)
+        query = await self._async_paraphrase_query(query)
+        query_tasks = await self._async_route_rag(query)
+
+        task_results = await asyncio.gather(
+            *[StoreManager().get_instance_obj(query_task[1]).async_query(query_task[0])
+              for query_task in query_tasks],
+            return_exceptions=True)
+        retrieved_docs = {}
+        for task_result in task_results:
+            if isinstance(task_result, Exception):
+                LOGGER.error(f"Exception occurred in knowledge query: {task_result}")
+                continue
+            for _doc in task_result:
+                if _doc.id not in retrieved_docs:
+                    retrieved_docs[_doc.id] = _doc
+        retrieved_docs = list(retrieved_docs.values())
+        retrieved_docs = await self._async_rag_post_process(retrieved_docs, query)
+        return retrieved_docs
+
     def to_llm(self, retrieved_docs: List[Document]) -> Any:
         """Transfer list docs to llm input"""
         retrieved_texts = [doc.text for doc in retrieved_docs]
@@ -268,6 +691,18 @@ class Knowledge(ComponentBase):
             self.readers = knowledge_configer.readers
         if hasattr(knowledge_configer, "tracing"):
             self.tracing = knowledge_configer.tracing
+        if hasattr(knowledge_configer, "stream_insert"):
+            self.stream_insert = knowledge_configer.stream_insert
+        if hasattr(knowledge_configer, "insert_batch_size"):
+            self.insert_batch_size = knowledge_configer.insert_batch_size
+        if hasattr(knowledge_configer, "ingest_workers"):
+            self.ingest_workers = knowledge_configer.ingest_workers
+        if hasattr(knowledge_configer, "manifest_path"):
+            self.manifest_path = knowledge_configer.manifest_path
+        if hasattr(knowledge_configer, "query_cache_size"):
+            self.query_cache_size = knowledge_configer.query_cache_size
+        if hasattr(knowledge_configer, "query_cache_ttl"):
+            self.query_cache_ttl = knowledge_configer.query_cache_ttl
         return self
 
     def langchain_query(self, query: str) -> str:
@@ -285,7 +720,7 @@ class Knowledge(ComponentBase):
         Query documents from the store and return the results.
         """
         parse_query = parse_json_markdown(query)
-        knowledge = await asyncio.to_thread(self.query_knowledge, **parse_query)
+        knowledge = await self.async_query_knowledge(**parse_query)
         return "This is Query Result:\n" + self.to_llm(knowledge)
 
     def as_langchain_tool(self) -> LangchainTool:
@@ -337,7 +772,14 @@ class Knowledge(ComponentBase):
         copied.insert_processors = self.insert_processors.copy()
         copied.update_processors = self.update_processors.copy()
         copied.post_processors = self.post_processors.copy()
-        copied.readers = deepcopy(self.readers)
+        copied.readers = self.readers.copy()
         if self.ext_info is not None:
-            copied.ext_info = deepcopy(self.ext_info)
+            # the copies share a read-only snapshot of ext_info, frozen again once ext_info changed
+            self._frozen_ext_info = freeze_snapshot(self.ext_info, self._frozen_ext_info)
+            copied.ext_info = CopyOnWriteDict(self._frozen_ext_info)
         return copied
+
+
+def _read_source(reader: Reader, source_path: str) -> List[Document]:
+    """Read a source in a worker thread or process of the bulk ingestion."""
+    return reader.load_data(source_path)
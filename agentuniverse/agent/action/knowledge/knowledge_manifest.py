@@ -0,0 +1,98 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 00:10
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: knowledge_manifest.py
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from agentuniverse.agent.action.knowledge.store.document import Document
+
+# Version of the manifest file layout
+MANIFEST_VERSION = 1
+# Size of the blocks read when hashing a source file
+HASH_BLOCK_SIZE = 1 << 20
+
+
+class KnowledgeManifest(object):
+    """The ingestion manifest of a knowledge base, kept as a json file.
+
+    For every ingested source, the manifest records the sha256 of the source file and the
+    digest of every chunk written into the stores, keyed by the chunk id. A source whose hash
+    is unchanged is skipped, and for a changed source only the new or changed chunks are
+    written, while the chunks gone from the source are deleted.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the KnowledgeManifest, loading the manifest file if it exists.
+
+        Args:
+            path(str): the path of the manifest json file
+        """
+        self.path: str = path
+        self.sources: Dict[str, Dict] = {}
+        self.__lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.sources = json.load(f).get('sources', {})
+
+    @staticmethod
+    def hash_file(source_path: str) -> Optional[str]:
+        """Return the sha256 of a source file, None for a source which is not a local file."""
+        if not os.path.isfile(source_path):
+            return None
+        digest = hashlib.sha256()
+        with open(source_path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def chunk_digest(document: Document) -> str:
+        """Return the digest of the text and metadata of a chunk."""
+        content = json.dumps([document.text, document.metadata], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def get_source_hash(self, source_path: str) -> Optional[str]:
+        with self.__lock:
+            return self.sources.get(source_path, {}).get('hash')
+
+    def get_chunks(self, source_path: str) -> Dict[str, str]:
+        """Return the digest of each chunk of the source, keyed by the chunk id."""
+        with self.__lock:
+            return dict(self.sources.get(source_path, {}).get('chunks', {}))
+
+    def list_sources(self) -> List[str]:
+        with self.__lock:
+            return list(self.sources.keys())
+
+    def get_chunk_ids(self, exclude_source: Optional[str] = None) -> Set[str]:
+        """Return the ids of the chunks recorded for every source but the excluded one."""
+        with self.__lock:
+            return {chunk_id for source_path, entry in self.sources.items() if source_path != exclude_source
+                    for chunk_id in entry.get('chunks', {})}
+
+    def set_source(self, source_path: str, source_hash: Optional[str], documents: List[Document]) -> None:
+        """Record the hash and the chunks of an ingested source."""
+        chunks = {document.id: self.chunk_digest(document) for document in documents}
+        with self.__lock:
+            self.sources[source_path] = {'hash': source_hash, 'chunks': chunks}
+
+    def remove_source(self, source_path: str) -> None:
+        with self.__lock:
+            self.sources.pop(source_path, None)
+
+    def save(self) -> None:
+        """Write the manifest to a temp file, then replace the manifest file."""
+        with self.__lock:
+            content = json.dumps({'version': MANIFEST_VERSION, 'sources': self.sources}, ensure_ascii=False)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with open(f'{self.path}.tmp', 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(f'{self.path}.tmp', self.path)
@@ -0,0 +1,140 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 01:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: knowledge_query_cache.py
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from agentuniverse.agent.action.knowledge.store.document import Document
+
+
+class KnowledgeQueryCache(object):
+    """An LRU cache of the knowledge query results, with an optional ttl.
+
+    Concurrent lookups of the same missed key are coalesced: the first caller runs the query
+    while the others wait for its result. `invalidate` drops every entry, and a query which was
+    in flight during an invalidation returns its result without caching it. Every caller gets its
+    own copy of the documents, so a caller mutating them never changes the cached result.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: Optional[float] = None):
+        """Initialize the KnowledgeQueryCache.
+
+        Args:
+            max_size(int): the max number of query results kept
+            ttl(float): the seconds a query result stays valid, None keeps it until evicted
+        """
+        self.max_size: int = max_size
+        self.ttl: Optional[float] = ttl
+        self.__entries: OrderedDict = OrderedDict()
+        self.__in_flight: Dict[str, Future] = {}
+        self.__generation: int = 0
+        self.__lock = threading.Lock()
+        self.__stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'coalesced': 0}
+
+    def get_or_compute(self, key: str, compute: Callable[[], List[Document]]) -> List[Document]:
+        """Return the cached result of the key, running `compute` once on a miss."""
+        cached, future, generation = self.__lookup(key)
+        if cached is not None:
+            return cached
+        if generation is None:
+            return self.__copy_documents(future.result())
+        try:
+            result = compute()
+        except BaseException as e:
+            self.__fail(key, future, e)
+            raise
+        return self.__complete(key, future, generation, result)
+
+    async def async_get_or_compute(self, key: str,
+                                   compute: Callable[[], Awaitable[List[Document]]]) -> List[Document]:
+        """Return the cached result of the key, awaiting `compute` once on a miss.
+
+        Sync and async lookups of the same key are coalesced together.
+        """
+        cached, future, generation = self.__lookup(key)
+        if cached is not None:
+            return cached
+        if generation is None:
+            return self.__copy_documents(await asyncio.wrap_future(future))
+        try:
+            result = await compute()
+        except BaseException as e:
+            self.__fail(key, future, e)
+            raise
+        return self.__complete(key, future, generation, result)
+
+    def __lookup(self, key: str) -> Tuple[Optional[List[Document]], Optional[Future], Optional[int]]:
+        """Return a copy of the cached result of the key, or the future of the query in flight
+        along with the cache generation if the caller has to run the query."""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and (self.ttl is None or entry[1] > time.monotonic()):
+                self.__entries.move_to_end(key)
+                self.__stats['hits'] += 1
+                cached = entry[0]
+            else:
+                cached = None
+                if entry is not None:
+                    del self.__entries[key]
+                future = self.__in_flight.get(key)
+                if future is not None:
+                    self.__stats['coalesced'] += 1
+                    return None, future, None
+                future = self.__in_flight[key] = Future()
+                self.__stats['misses'] += 1
+                return None, future, self.__generation
+        # The cached documents are never mutated, so they are copied out of the lock
+        return self.__copy_documents(cached), None, None
+
+    def __complete(self, key: str, future: Future, generation: int, result: List[Document]) -> List[Document]:
+        # The caller keeps the computed documents, the cache and the coalesced callers share a copy
+        snapshot = self.__copy_documents(result)
+        with self.__lock:
+            self.__finish(key, future)
+            # A result computed across an invalidation may be stale, so it is not cached
+            if generation == self.__generation and self.max_size > 0:
+                expire_at = time.monotonic() + self.ttl if self.ttl is not None else None
+                self.__entries[key] = (snapshot, expire_at)
+                self.__entries.move_to_end(key)
+                while len(self.__entries) > self.max_size:
+                    self.__entries.popitem(last=False)
+        future.set_result(snapshot)
+        return result
+
+    @staticmethod
+    def __copy_documents(documents: List[Document]) -> List[Document]:
+        """Return deep copies of the documents."""
+        return [document.model_copy(deep=True) for document in documents]
+
+    def __fail(self, key: str, future: Future, error: BaseException) -> None:
+        with self.__lock:
+            self.__finish(key, future)
+        future.set_exception(error)
+
+    def invalidate(self) -> None:
+        """Drop every cached result, the queries in flight are no longer joined nor cached."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__in_flight.clear()
+            self.__generation += 1
+
+    def __finish(self, key: str, future: Future) -> None:
+        if self.__in_flight.get(key) is future:
+            del self.__in_flight[key]
+
+    def get_stats(self) -> Dict[str, float]:
+        """Return the hit, miss and coalesced counts of the cache, and its hit rate."""
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['size'] = len(self.__entries)
+        lookups = stats['hits'] + stats['misses'] + stats['coalesced']
+        stats['hit_rate'] = (stats['hits'] + stats['coalesced']) / lookups if lookups else 0.0
+        return stats
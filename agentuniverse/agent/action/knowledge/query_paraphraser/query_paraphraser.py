@@ -6,6 +6,7 @@
 # @Email   : fanen.lhy@antgroup.com
 # @FileName: query_paraphraser.py
 
+import asyncio
 from abc import abstractmethod
 from typing import Optional
 
@@ -26,6 +27,11 @@ class QueryParaphraser(ComponentBase):
     def query_paraphrase(self, origin_query: Query) -> Query:
         """Paraphrase the origin query string to different style."""
 
+    async def async_query_paraphrase(self, origin_query: Query) -> Query:
+        """Asynchronously paraphrase the origin query, `query_paraphrase` runs in a worker
+        thread by default."""
+        return await asyncio.to_thread(self.query_paraphrase, origin_query)
+
 
     def _initialize_by_component_configer(self,
                                          query_paraphraser_config: ComponentConfiger) \
@@ -17,3 +17,7 @@ class BaseRouter(RagRouter):
     def _rag_route(self, query: Query, store_list: List[str]) \
             -> List[Tuple[Query, str]]:
         return [(query, store) for store in store_list]
+
+    async def _async_rag_route(self, query: Query, store_list: List[str]) \
+            -> List[Tuple[Query, str]]:
+        return self._rag_route(query, store_list)
@@ -6,6 +6,7 @@
 # @Email   : fanen.lhy@antgroup.com
 # @FileName: rag_router.py
 
+import asyncio
 from abc import abstractmethod
 from typing import List, Optional, Tuple
 
@@ -28,6 +29,17 @@ class RagRouter(ComponentBase):
          query-store pair."""
         return self._rag_route(query, store_list)
 
+    async def async_rag_route(self, query: Query, store_list: List[str]) \
+            -> List[Tuple[Query, str]]:
+        """Asynchronously accept query a list of store instance name, and return a list of
+         query-store pair."""
+        return await self._async_rag_route(query, store_list)
+
+    async def _async_rag_route(self, query: Query, store_list: List[str]) \
+            -> List[Tuple[Query, str]]:
+        """Route the query in a worker thread by default, since routers may call an llm."""
+        return await asyncio.to_thread(self._rag_route, query, store_list)
+
     def _rag_route(self, query: Query, store_list: List[str]) \
             -> List[Tuple[Query, str]]:
         """Accept query a list of store instance name, and return a list of
@@ -7,7 +7,7 @@
 # @FileName: docx_reader.py
 from typing import Union
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import ClassVar, List, Optional, Dict
 
 from agentuniverse.agent.action.knowledge.reader.reader import Reader
 from agentuniverse.agent.action.knowledge.store.document import Document
@@ -15,6 +15,7 @@ from agentuniverse.agent.action.knowledge.store.document import Document
 
 class DocxReader(Reader):
     """Docx reader."""
+    cpu_bound: ClassVar[bool] = True
 
     def _load_data(self, file: Union[str, Path], ext_info: Optional[Dict] = None) -> List[Document]:
         """Parse the docx file.
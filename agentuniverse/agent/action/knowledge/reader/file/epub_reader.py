@@ -5,7 +5,7 @@
 # @Author  : SaladDay
 # @FileName: epub_reader.py
 from pathlib import Path
-from typing import Union, List, Optional, Dict
+from typing import ClassVar, Iterator, Union, List, Optional, Dict
 import re
 
 from agentuniverse.agent.action.knowledge.reader.reader import Reader
@@ -18,6 +18,7 @@ class EpubReader(Reader):
 
     Used to read and parse EPUB format e-books, supports chapter extraction and metadata parsing.
     """
+    cpu_bound: ClassVar[bool] = True
 
     def _load_data(self, file: Union[str, Path], ext_info: Optional[Dict] = None) -> List[Document]:
         """Parse EPUB file.
@@ -32,6 +33,18 @@ class EpubReader(Reader):
         Note:
             `ebooklib` is required to read EPUB files: `pip install EbookLib`
         """
+        return list(self._iter_data(file, ext_info))
+
+    def _iter_data(self, file: Union[str, Path], ext_info: Optional[Dict] = None) -> Iterator[Document]:
+        """Parse EPUB file chapter by chapter.
+
+        Args:
+            file: EPUB file path or file object
+            ext_info: Additional metadata information
+
+        Returns:
+            Iterator[Document]: The documents of the non-empty chapters, in reading order
+        """
         try:
             import ebooklib
             from ebooklib import epub
@@ -46,7 +59,6 @@ class EpubReader(Reader):
 
         # Load the EPUB book
         book = epub.read_epub(str(file))
-        document_list = []
 
         # Extract book metadata
         book_metadata = {
@@ -80,9 +92,7 @@ class EpubReader(Reader):
                     if ext_info is not None:
                         metadata.update(ext_info)
                     
-                    document_list.append(Document(text=text_content, metadata=metadata))
-
-        return document_list
+                    yield Document(text=text_content, metadata=metadata)
 
     def _extract_text_from_html(self, html_content: str) -> str:
         """Extract plain text from HTML content.
@@ -6,7 +6,7 @@
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: pdf_reader.py
 from pathlib import Path
-from typing import List, Optional, Dict, Union
+from typing import ClassVar, Iterator, List, Optional, Dict, Union
 
 from agentuniverse.agent.action.knowledge.reader.reader import Reader
 from agentuniverse.agent.action.knowledge.store.document import Document
@@ -14,10 +14,19 @@ from agentuniverse.agent.action.knowledge.store.document import Document
 
 class PdfReader(Reader):
     """PDF reader."""
+    cpu_bound: ClassVar[bool] = True
 
     def _load_data(self, file: Union[str, Path], ext_info: Optional[Dict] = None) -> List[Document]:
         """Parse the pdf file.
 
+        Note:
+            `pypdf` is required to read PDF files: `pip install pypdf`
+        """
+        return list(self._iter_data(file, ext_info))
+
+    def _iter_data(self, file: Union[str, Path], ext_info: Optional[Dict] = None) -> Iterator[Document]:
+        """Parse the pdf file page by page.
+
         Note:
             `pypdf` is required to read PDF files: `pip install pypdf`
         """
@@ -36,8 +45,7 @@ class PdfReader(Reader):
             # Get the number of pages in the PDF document
             num_pages = len(pdf.pages)
 
-            # Iterate over every page
-            docs = []
+            # Iterate over every page, each page is yielded once extracted
             for page in range(num_pages):
                 # Extract the text from the page
                 page_text = pdf.pages[page].extract_text()
@@ -47,5 +55,4 @@ class PdfReader(Reader):
                 if ext_info is not None:
                     metadata.update(ext_info)
 
-                docs.append(Document(text=page_text, metadata=metadata))
-            return docs
+                yield Document(text=page_text, metadata=metadata)
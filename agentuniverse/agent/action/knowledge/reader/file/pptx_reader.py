@@ -6,7 +6,7 @@
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: pptx_reader.py
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import ClassVar, Dict, List, Optional, Union
 
 from agentuniverse.agent.action.knowledge.reader.reader import Reader
 from agentuniverse.agent.action.knowledge.store.document import Document
@@ -14,6 +14,7 @@ from agentuniverse.agent.action.knowledge.store.document import Document
 
 class PptxReader(Reader):
     """Pptx reader."""
+    cpu_bound: ClassVar[bool] = True
 
     def _load_data(self, file: Union[str, Path], ext_info: Optional[Dict] = None) -> List[Document]:
         """Parse the pptx file.
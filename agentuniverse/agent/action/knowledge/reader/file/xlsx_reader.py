@@ -5,17 +5,25 @@
 # @Author  : Assistant
 # @FileName: xlsx_reader.py
 from pathlib import Path
-from typing import Union, List, Optional, Dict
+from typing import ClassVar, Iterator, Union, List, Optional, Dict
 
 from agentuniverse.agent.action.knowledge.reader.reader import Reader
 from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
 
 
 class XlsxReader(Reader):
     """Excel (.xlsx) file reader.
     
     Used to read and parse Excel format files, supports multiple sheets and various data types.
+
+    Attributes:
+        max_rows_per_document (int): The max number of rows in a document of `iter_data`, which
+            bounds the memory of a streamed sheet however large it is. `load_data` returns one
+            document per sheet, holding the whole sheet.
     """
+    cpu_bound: ClassVar[bool] = True
+    max_rows_per_document: int = 1000
 
     def _load_data(self, file: Union[str, Path], ext_info: Optional[Dict] = None) -> List[Document]:
         """Parse Excel file.
@@ -25,11 +33,30 @@ class XlsxReader(Reader):
             ext_info: Additional metadata information
 
         Returns:
-            List[Document]: List of documents containing Excel content
+            List[Document]: One document per non-empty sheet
 
         Note:
             `openpyxl` is required to read Excel files: `pip install openpyxl`
         """
+        return list(self._iter_sheet_documents(file, ext_info))
+
+    def _iter_data(self, file: Union[str, Path], ext_info: Optional[Dict] = None) -> Iterator[Document]:
+        """Parse Excel file lazily, in documents of at most `max_rows_per_document` rows.
+
+        Args:
+            file: Excel file path or file object
+            ext_info: Additional metadata information
+
+        Returns:
+            Iterator[Document]: Documents of consecutive rows of a sheet, the rows are given by
+                the `start_row` and `end_row` metadata
+        """
+        return self._iter_sheet_documents(file, ext_info, self.max_rows_per_document)
+
+    def _iter_sheet_documents(self, file: Union[str, Path], ext_info: Optional[Dict] = None,
+                              max_rows: Optional[int] = None) -> Iterator[Document]:
+        """Yield the documents of every sheet, each holding at most `max_rows` non-empty rows, or the
+        whole sheet if `max_rows` is not set."""
         try:
             import openpyxl
         except ImportError:
@@ -41,49 +68,55 @@ class XlsxReader(Reader):
         if isinstance(file, str):
             file = Path(file)
 
-        # Load the workbook
-        workbook = openpyxl.load_workbook(file, data_only=True)
-        document_list = []
-
-        # Process each worksheet
-        for sheet_name in workbook.sheetnames:
-            worksheet = workbook[sheet_name]
-            
-            # Extract data from the worksheet
-            sheet_data = []
-            max_row = worksheet.max_row
-            max_col = worksheet.max_column
-            
-            # Read all data from the worksheet
-            for row in range(1, max_row + 1):
-                row_data = []
-                for col in range(1, max_col + 1):
-                    cell = worksheet.cell(row=row, column=col)
-                    if cell.value is not None:
-                        # Convert cell value to string, handling different data types
-                        if isinstance(cell.value, (int, float)):
-                            row_data.append(str(cell.value))
-                        else:
-                            row_data.append(str(cell.value))
-                    else:
-                        row_data.append("")
-                
-                # Only add non-empty rows
-                if any(cell.strip() for cell in row_data):
-                    sheet_data.append(" | ".join(row_data))
-
-            # Create document for this sheet
-            if sheet_data:
-                sheet_content = "\n".join(sheet_data)
-                metadata = {
-                    "file_name": file.name,
-                    "sheet_name": sheet_name,
-                    "max_row": max_row,
-                    "max_col": max_col
-                }
-                if ext_info is not None:
-                    metadata.update(ext_info)
-                
-                document_list.append(Document(text=sheet_content, metadata=metadata))
-
-        return document_list
+        # Load the workbook in read-only mode, which streams the rows instead of building
+        # every cell of the workbook in memory
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        try:
+            # Process each worksheet
+            for sheet_name in workbook.sheetnames:
+                worksheet = workbook[sheet_name]
+
+                def make_document(rows: List[str], start_row: int, end_row: int) -> Document:
+                    metadata = {
+                        "file_name": file.name,
+                        "sheet_name": sheet_name,
+                        "start_row": start_row,
+                        "end_row": end_row,
+                        "max_row": worksheet.max_row or row_count,
+                        "max_col": worksheet.max_column or col_count
+                    }
+                    if ext_info is not None:
+                        metadata.update(ext_info)
+                    return Document(text="\n".join(rows), metadata=metadata)
+
+                # Extract data from the worksheet
+                sheet_data = []
+                start_row, end_row = 0, 0
+                row_count, col_count = 0, 0
+                for row in worksheet.iter_rows(values_only=True):
+                    row_count += 1
+                    col_count = max(col_count, len(row))
+                    row_data = ["" if value is None else str(value) for value in row]
+
+                    # Only add non-empty rows
+                    if any(cell.strip() for cell in row_data):
+                        if not sheet_data:
+                            start_row = row_count
+                        sheet_data.append(" | ".join(row_data))
+                        end_row = row_count
+                        if max_rows and len(sheet_data) >= max_rows:
+                            yield make_document(sheet_data, start_row, end_row)
+                            sheet_data = []
+
+                # Create document for the rest of this sheet
+                if sheet_data:
+                    yield make_document(sheet_data, start_row, end_row)
+        finally:
+            # A read-only workbook keeps the file open until closed
+            workbook.close()
+
+    def _initialize_by_component_configer(self, reader_configer: ComponentConfiger) -> 'XlsxReader':
+        super()._initialize_by_component_configer(reader_configer)
+        if hasattr(reader_configer, "max_rows_per_document"):
+            self.max_rows_per_document = reader_configer.max_rows_per_document
+        return self
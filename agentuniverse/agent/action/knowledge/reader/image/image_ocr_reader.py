@@ -3,7 +3,7 @@
 
 # @Time    : 2025/9/29
 # @FileName: image_ocr_reader.py
-from typing import List, Optional, Dict, Union
+from typing import ClassVar, List, Optional, Dict, Union
 from pathlib import Path
 
 from agentuniverse.agent.action.knowledge.reader.reader import Reader
@@ -19,6 +19,7 @@ class ImageOCRReader(Reader):
       - or pip install pytesseract pillow
       - or pip install easyocr
     """
+    cpu_bound: ClassVar[bool] = True
 
     def _load_data(self, file: Union[str, Path], ext_info: Optional[Dict] = None) -> List[Document]:
         print(f"debugging: ImageOCRReader start load file={file}")
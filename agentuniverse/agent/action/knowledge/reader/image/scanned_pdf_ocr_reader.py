@@ -3,7 +3,7 @@
 
 # @Time    : 2025/9/29
 # @FileName: scanned_pdf_ocr_reader.py
-from typing import List, Optional, Dict, Union
+from typing import ClassVar, List, Optional, Dict, Union
 from pathlib import Path
 
 from agentuniverse.agent.action.knowledge.reader.reader import Reader
@@ -17,6 +17,7 @@ class ScannedPdfOCRReader(Reader):
       1) Try to extract text with pypdf. If empty/None, fallback to OCR.
       2) OCR via PaddleOCR -> pytesseract -> easyocr.
     """
+    cpu_bound: ClassVar[bool] = True
 
     def _load_data(self, file: Union[str, Path], ext_info: Optional[Dict] = None) -> List[Document]:
         print(f"debugging: ScannedPdfOCRReader start load file={file}")
@@ -6,7 +6,7 @@
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: reader.py
 from abc import abstractmethod
-from typing import List, Any, Optional
+from typing import ClassVar, List, Any, Iterator, Optional
 
 from agentuniverse.agent.action.knowledge.store.document import Document
 from agentuniverse.base.component.component_base import ComponentEnum
@@ -15,8 +15,14 @@ from agentuniverse.base.config.component_configer.component_configer import Comp
 
 
 class Reader(ComponentBase):
-    """The basic class for the knowledge reader."""
+    """The basic class for the knowledge reader.
+
+    Attributes:
+        cpu_bound (ClassVar[bool]): Whether parsing is CPU bound, such as pdf parsing or OCR, so that
+            bulk ingestion runs the reader in a process pool instead of a thread pool.
+    """
     component_type: ComponentEnum = ComponentEnum.READER
+    cpu_bound: ClassVar[bool] = False
     name: Optional[str] = None
     description: Optional[str] = None
 
@@ -24,10 +30,22 @@ class Reader(ComponentBase):
         """Load data from the input params."""
         return self._load_data(*args, **kwargs)
 
+    def iter_data(self, *args: Any, **kwargs: Any) -> Iterator[Document]:
+        """Load data from the input params lazily, one document at a time.
+
+        Readers able to parse a source piece by piece, such as the pages of a pdf, override
+        `_iter_data` so that a large source is never held in memory as a whole.
+        """
+        return self._iter_data(*args, **kwargs)
+
     @abstractmethod
     def _load_data(self, *args: Any, **kwargs: Any) -> List[Document]:
         """Load data from the input params."""
 
+    def _iter_data(self, *args: Any, **kwargs: Any) -> Iterator[Document]:
+        """Load data from the input params lazily, defaults to the documents of `_load_data`."""
+        yield from self._load_data(*args, **kwargs)
+
     def _initialize_by_component_configer(self,
                                          reader_configer: ComponentConfiger) \
             -> 'Reader':
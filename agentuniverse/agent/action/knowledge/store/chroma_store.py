@@ -5,8 +5,9 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: chroma_store.py
+import asyncio
 from urllib.parse import urlparse
-from typing import List, Any, Optional
+from typing import List, Any, Callable, Optional
 from pydantic import SkipValidation
 
 import chromadb
@@ -31,6 +32,9 @@ class ChromaStore(Store):
         collection_name (str): The name of the chroma collection to use.
         collection (Collection): A chroma collection object.
         persist_path (Optional[str]): Path to save the chroma database.
+        embedding_batch_size (int): Number of texts sent to the embedding model per call.
+        write_batch_size (int): Number of documents written to the collection per call.
+        write_concurrency (int): Max number of batches embedded and written concurrently.
     """
 
     collection_name: Optional[str] = 'chroma_db'
@@ -38,6 +42,9 @@ class ChromaStore(Store):
     persist_path: Optional[str] = None
     embedding_model: Optional[str] = None
     similarity_top_k: Optional[int] = 10
+    embedding_batch_size: int = 32
+    write_batch_size: int = 1000
+    write_concurrency: int = 4
 
     def _new_client(self) -> Any:
         """Initialize the chroma client."""
@@ -84,6 +91,23 @@ class ChromaStore(Store):
             embedding = EmbeddingManager().get_instance_obj(
                 self.embedding_model
             ).get_embeddings([query.query_str], text_type="query")[0]
+        return self._query_collection(query, embedding)
+
+    async def async_query(self, query: Query, **kwargs) -> List[Document]:
+        """Asynchronously query the chroma collection, the query is embedded by the async client
+        of the embedding model.
+
+        The collection is searched in a worker thread since the chroma client is synchronous.
+        """
+        embedding = query.embeddings
+        if self.embedding_model is not None and len(embedding) == 0:
+            embedding = (await EmbeddingManager().get_instance_obj(
+                self.embedding_model
+            ).async_get_embeddings([query.query_str], text_type="query"))[0]
+        return await asyncio.to_thread(self._query_collection, query, embedding)
+
+    def _query_collection(self, query: Query, embedding: List) -> List[Document]:
+        """Query the collection by the embedding, or by the query text if there is none."""
         if len(embedding) > 0:
             query_result = self.collection.query(
                 n_results=query.similarity_top_k if query.similarity_top_k else self.similarity_top_k,
@@ -108,49 +132,56 @@ class ChromaStore(Store):
             If there is no embedding in the specific document, but the embedding model is configured in the store,
             the embedding data of the document is automatically obtained by the embedding model.
         """
-
-        for document in documents:
-            embedding = document.embedding
-            if self.embedding_model is not None and len(embedding) == 0:
-                embedding = EmbeddingManager().get_instance_obj(
-                    self.embedding_model
-                ).get_embeddings([document.text])[0]
-            self.collection.add(
-                documents=[document.text],
-                metadatas=[document.metadata],
-                embeddings=[embedding] if len(embedding) > 0 else None,
-                ids=[document.id]
-            )
+        self._bulk_write(documents, self.collection.add)
 
     def upsert_document(self, documents: List[Document], **kwargs):
         """Upsert document into the store."""
-        for document in documents:
-            embedding = document.embedding
-            if self.embedding_model is not None and len(embedding) == 0:
-                embedding = EmbeddingManager().get_instance_obj(
-                    self.embedding_model
-                ).get_embeddings([document.text])[0]
-            self.collection.upsert(
-                documents=[document.text],
-                metadatas=[document.metadata],
-                embeddings=[embedding] if embedding is not None else None,
-                ids=[document.id]
-            )
+        self._bulk_write(documents, self.collection.upsert)
 
     def update_document(self, documents: List[Document], **kwargs):
         """Update document into the store."""
-        for document in documents:
-            embedding = document.embedding
-            if self.embedding_model is not None and len(embedding) == 0:
-                embedding = EmbeddingManager().get_instance_obj(
-                    self.embedding_model
-                ).get_embeddings([document.text])[0]
-            self.collection.update(
-                documents=[document.text],
-                metadatas=[document.metadata],
-                embeddings=[embedding] if embedding is not None else None,
-                ids=[document.id]
-            )
+        self._bulk_write(documents, self.collection.update)
+
+    async def async_insert_document(self, documents: List[Document], **kwargs: Any):
+        """Asynchronously insert documents, embedded by the async embedding client."""
+        documents = await self._async_embed_documents(documents, self.embedding_model, self.embedding_batch_size)
+        await asyncio.to_thread(self._bulk_write, documents, self.collection.add)
+
+    async def async_upsert_document(self, documents: List[Document], **kwargs):
+        """Asynchronously upsert documents, embedded by the async embedding client."""
+        documents = await self._async_embed_documents(documents, self.embedding_model, self.embedding_batch_size)
+        await asyncio.to_thread(self._bulk_write, documents, self.collection.upsert)
+
+    async def async_update_document(self, documents: List[Document], **kwargs):
+        """Asynchronously update documents, embedded by the async embedding client."""
+        documents = await self._async_embed_documents(documents, self.embedding_model, self.embedding_batch_size)
+        await asyncio.to_thread(self._bulk_write, documents, self.collection.update)
+
+    def _bulk_write(self, documents: List[Document], write_fn: Callable):
+        """Write the documents in batches of `write_batch_size` with at most `write_concurrency`
+        batches in flight, each batch is embedded in calls of `embedding_batch_size` texts.
+
+        Args:
+            documents (List[Document]): The documents to be written.
+            write_fn (Callable): The collection method writing a batch, such as `add` or `upsert`.
+        """
+
+        def write_batch(batch: List[Document]):
+            embeddings = self._embed_documents(batch, self.embedding_model, self.embedding_batch_size)
+            # Documents without embedding are embedded by the embedding function of the collection.
+            for with_embedding in (True, False):
+                rows = [(document, embedding) for document, embedding in zip(batch, embeddings)
+                        if (len(embedding) > 0) == with_embedding]
+                if not rows:
+                    continue
+                write_fn(
+                    documents=[document.text for document, _ in rows],
+                    metadatas=[document.metadata for document, _ in rows],
+                    embeddings=[embedding for _, embedding in rows] if with_embedding else None,
+                    ids=[document.id for document, _ in rows]
+                )
+
+        self._write_in_batches(documents, write_batch, self.write_batch_size, self.write_concurrency)
 
     @staticmethod
     def to_documents(query_result: QueryResult) -> List[Document]:
@@ -182,4 +213,10 @@ class ChromaStore(Store):
             self.embedding_model = chroma_store_configer.embedding_model
         if hasattr(chroma_store_configer, "similarity_top_k"):
             self.similarity_top_k = chroma_store_configer.similarity_top_k
+        if hasattr(chroma_store_configer, "embedding_batch_size"):
+            self.embedding_batch_size = chroma_store_configer.embedding_batch_size
+        if hasattr(chroma_store_configer, "write_batch_size"):
+            self.write_batch_size = chroma_store_configer.write_batch_size
+        if hasattr(chroma_store_configer, "write_concurrency"):
+            self.write_concurrency = chroma_store_configer.write_concurrency
         return self
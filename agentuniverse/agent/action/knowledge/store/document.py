@@ -5,10 +5,11 @@
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: document.py
 import uuid
-from typing import Dict, Any, Optional, List, Set
+from typing import Dict, Any, Optional, List, Set, Union
 
+import numpy as np
 from langchain_core.documents.base import Document as LCDocument
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, field_serializer, model_validator
 
 
 class Document(BaseModel):
@@ -18,7 +19,9 @@ class Document(BaseModel):
         id (str): Unique identifier for the document.
         text (Optional[str]): The content of the document.
         metadata (Dict[str, Any]): Metadata associated with the document.
-        embedding (List[float]): Embedding data associated with the document
+        embedding (Union[np.ndarray, List[float]]): Embedding data associated with the document,
+            either a float list or, in the compact mode, a float32 numpy array which may be a view
+            into the buffer of a store.
     """
     class Config:
         arbitrary_types_allowed = True
@@ -26,7 +29,7 @@ class Document(BaseModel):
     id: str = None
     text: Optional[str] = ""
     metadata: Optional[Dict[str, Any]] = None
-    embedding: List[float] = Field(default_factory=list)
+    embedding: Union[np.ndarray, List[float]] = Field(default_factory=list)
     keywords: Set[str] = Field(default_factory=set)
 
     @model_validator(mode='before')
@@ -36,6 +39,30 @@ class Document(BaseModel):
             values['id'] = str(uuid.uuid5(uuid.NAMESPACE_URL, text))
         return values
 
+    @field_serializer('embedding', when_used='json')
+    def serialize_embedding(self, embedding: Union[np.ndarray, List[float]]) -> List[float]:
+        return embedding.tolist() if isinstance(embedding, np.ndarray) else embedding
+
+    @staticmethod
+    def compact_embedding(embedding: Union[np.ndarray, List[float]]) -> np.ndarray:
+        """Return the embedding as a float32 numpy array, without copying a float32 array."""
+        return np.asarray(embedding, dtype=np.float32)
+
+    def get_embedding_array(self) -> np.ndarray:
+        """Return the embedding as a float32 numpy array, for vector math on either representation."""
+        return self.compact_embedding(self.embedding)
+
+    def to_compact(self) -> 'Document':
+        """Return a shallow copy of the document keeping its embedding as a float32 numpy array.
+
+        A float32 vector takes 4 bytes per dimension, instead of the 32 bytes of a boxed float in a
+        list, so in-memory stores holding many documents use a fraction of the memory.
+        """
+        if len(self.embedding) == 0 or (isinstance(self.embedding, np.ndarray)
+                                        and self.embedding.dtype == np.float32):
+            return self
+        return self.model_copy(update={'embedding': self.compact_embedding(self.embedding)})
+
     def as_langchain(self) -> LCDocument:
         """Convert to LangChain document format."""
         metadata = self.metadata or {}
@@ -5,9 +5,11 @@
 # @Email   : saswatsusmoy9@gmail.com
 # @FileName: faiss_store.py
 
+import asyncio
 import logging
 import os
 import pickle
+import threading
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -23,6 +25,7 @@ except ImportError as e:
 
 from agentuniverse.agent.action.knowledge.embedding.embedding_manager import EmbeddingManager
 from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.mmap_document_store import MmapDocumentStore
 from agentuniverse.agent.action.knowledge.store.query import Query
 from agentuniverse.agent.action.knowledge.store.store import Store
 from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
@@ -38,6 +41,10 @@ DEFAULT_INDEX_CONFIG = {
     "nprobe": 10,  # For IVF search
 }
 
+# Record types of the append-only metadata log
+INSERT_RECORD = "insert"
+DELETE_RECORD = "delete"
+
 # Set up logger
 logger = logging.getLogger(__name__)
 
@@ -55,9 +62,21 @@ class FAISSStore(Store):
         embedding_model (Optional[str]): Name of the embedding model to use.
         similarity_top_k (Optional[int]): Default number of top results to return.
         faiss_index (faiss.Index): The FAISS index object.
-        document_store (Dict[str, Document]): In-memory document storage.
+        document_store (Dict[str, Document]): Document storage, backed by the memory-mapped
+            metadata snapshot once a snapshot is loaded or written.
         id_to_index (Dict[str, int]): Mapping from document ID to FAISS index position.
         index_to_id (Dict[int, str]): Mapping from FAISS index position to document ID.
+        embedding_batch_size (int): Number of texts sent to the embedding model per call.
+        auto_flush (bool): Whether to persist the index and metadata after every write operation.
+            Disable it for bulk ingestion and call `flush()` or `checkpoint()` explicitly.
+        compaction_ratio (float): Deleted vectors are kept in the index as tombstones, the index
+            is compacted once the ratio of tombstones exceeds this value.
+        read_only (bool): Whether to memory-map the index file read-only instead of reading it into
+            memory, so that processes serving the same index share its pages. Write operations
+            are rejected in this mode.
+        compact_embedding (bool): Whether to keep the document embeddings as float32 numpy arrays,
+            views into the vector batches added to the index or into the memory-mapped snapshot,
+            instead of float lists, which cuts the memory held by the document store several-fold.
     """
 
     index_path: Optional[str] = None
@@ -69,7 +88,16 @@ class FAISSStore(Store):
     document_store: Dict[str, Document] = None
     id_to_index: Dict[str, int] = None
     index_to_id: Dict[int, str] = None
+    embedding_batch_size: int = 32
+    auto_flush: bool = True
+    compaction_ratio: float = 0.3
+    read_only: bool = False
+    compact_embedding: bool = False
     _next_index: int = 0
+    _pending_records: List[tuple] = None
+    _log_record_count: int = 0
+    _needs_checkpoint: bool = False
+    _write_lock: Any = None
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -77,6 +105,8 @@ class FAISSStore(Store):
         self.id_to_index = {}
         self.index_to_id = {}
         self._next_index = 0
+        self._pending_records = []
+        self._write_lock = threading.RLock()
         if self.index_config is None:
             self.index_config = DEFAULT_INDEX_CONFIG.copy()
 
@@ -124,7 +154,12 @@ class FAISSStore(Store):
         """Load existing FAISS index and metadata from disk."""
         if self.index_path and os.path.exists(self.index_path):
             try:
-                self.faiss_index = faiss.read_index(self.index_path)
+                if self.read_only:
+                    # Flat codes are mapped in place where the faiss build supports it
+                    io_flags = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+                    self.faiss_index = faiss.read_index(self.index_path, io_flags)
+                else:
+                    self.faiss_index = faiss.read_index(self.index_path)
                 logger.info(f"Loaded FAISS index from {self.index_path}")
             except Exception as e:
                 logger.warning(f"Failed to load FAISS index: {e}")
@@ -134,7 +169,14 @@ class FAISSStore(Store):
             try:
                 with open(self.metadata_path, "rb") as f:
                     metadata = pickle.load(f)  # noqa: S301
+                if MmapDocumentStore.is_snapshot(metadata):
+                    self._load_document_snapshot(metadata)
+                else:
+                    # Snapshots written by older versions pickle the whole document store
                     self.document_store = metadata.get("document_store", {})
+                    if self.compact_embedding:
+                        self.document_store = {doc_id: document.to_compact()
+                                               for doc_id, document in self.document_store.items()}
                     self.id_to_index = metadata.get("id_to_index", {})
                     self.index_to_id = metadata.get("index_to_id", {})
                     self._next_index = metadata.get("next_index", 0)
@@ -144,50 +186,224 @@ class FAISSStore(Store):
                 self._reset_metadata()
         else:
             self._reset_metadata()
+        self._replay_metadata_log()
+
+        # Vectors added to the index without a logged mapping are treated as tombstones
+        if self.faiss_index is not None:
+            self._next_index = max(self._next_index, self.faiss_index.ntotal)
 
         # If no index was loaded and we have metadata, create empty index
         if self.faiss_index is None and self.document_store:
             # Try to infer dimension from existing documents
             for doc in self.document_store.values():
-                if doc.embedding and len(doc.embedding) > 0:
+                if len(doc.embedding) > 0:
                     dimension = len(doc.embedding)
                     self.faiss_index = self._create_faiss_index(dimension)
                     break
 
+    def _load_document_snapshot(self, metadata: Optional[dict] = None):
+        """Map the columnar metadata snapshot, documents are decoded on access only."""
+        document_store = MmapDocumentStore(self.metadata_path, metadata, compact=self.compact_embedding)
+        self.document_store = document_store
+        self.id_to_index = {}
+        self.index_to_id = {}
+        for doc_id, index_pos in document_store.entries:
+            if index_pos >= 0:
+                self.id_to_index[doc_id] = index_pos
+                self.index_to_id[index_pos] = doc_id
+        self._next_index = document_store.next_index
+
+    def _check_writable(self):
+        """Reject write operations on a read-only store."""
+        if self.read_only:
+            READ_ONLY_MSG = f"FAISS store {self.name} is read only, write operations are not allowed."
+            raise ValueError(READ_ONLY_MSG)
+
     def _reset_metadata(self):
         """Reset metadata to empty state."""
         self.document_store = {}
         self.id_to_index = {}
         self.index_to_id = {}
         self._next_index = 0
+        self._pending_records = []
+        self._log_record_count = 0
+
+    @property
+    def metadata_log_path(self) -> Optional[str]:
+        """Path of the append-only metadata log next to the metadata snapshot."""
+        return f"{self.metadata_path}.log" if self.metadata_path else None
+
+    def _replay_metadata_log(self):
+        """Apply the records appended to the metadata log since the last checkpoint."""
+        log_path = self.metadata_log_path
+        if not log_path or not os.path.exists(log_path):
+            return
+        record_count = 0
+        with open(log_path, "rb") as f:
+            while True:
+                try:
+                    record = pickle.load(f)  # noqa: S301
+                except EOFError:
+                    break
+                except Exception as e:
+                    # A partially written tail record is left by an interrupted flush
+                    logger.warning(f"Stop replaying truncated metadata log: {e}")
+                    break
+                if record[0] == INSERT_RECORD:
+                    _, document, index_pos = record
+                    if self.compact_embedding:
+                        document = document.to_compact()
+                    self.document_store[document.id] = document
+                    self.id_to_index[document.id] = index_pos
+                    self.index_to_id[index_pos] = document.id
+                    self._next_index = max(self._next_index, index_pos + 1)
+                elif record[0] == DELETE_RECORD:
+                    self._drop_document(record[1])
+                record_count += 1
+        self._log_record_count = record_count
+        logger.info(f"Replayed {record_count} records from {log_path}")
+
+    def _drop_document(self, document_id: str):
+        """Remove a document from the metadata, its vector stays in the index as a tombstone."""
+        self.document_store.pop(document_id, None)
+        index_pos = self.id_to_index.pop(document_id, None)
+        if index_pos is not None:
+            self.index_to_id.pop(index_pos, None)
+
+    def get_tombstone_count(self) -> int:
+        """Get the number of deleted vectors still kept in the index."""
+        if self.faiss_index is None:
+            return 0
+        return max(self.faiss_index.ntotal - len(self.index_to_id), 0)
 
-    def _save_index_and_metadata(self):
-        """Save FAISS index and metadata to disk."""
+    def flush(self):
+        """Persist the index and append the pending metadata changes to the metadata log.
+
+        The log is folded into a new metadata snapshot once it outgrows the snapshot.
+        """
+        self._check_writable()
+        with self._write_lock:
+            if self._needs_checkpoint or (self.metadata_path and not os.path.exists(self.metadata_path)):
+                self.checkpoint()
+                return
+            self._save_index()
+            log_path = self.metadata_log_path
+            if self._pending_records and log_path:
+                try:
+                    Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+                    with open(log_path, "ab") as f:
+                        for record in self._pending_records:
+                            pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    self._log_record_count += len(self._pending_records)
+                except Exception:
+                    logger.exception("Failed to append metadata log")
+                    return
+            self._pending_records = []
+            if self._log_record_count > max(len(self.document_store), 1000):
+                self.checkpoint()
+
+    def checkpoint(self):
+        """Persist the index and a full metadata snapshot, then truncate the metadata log."""
+        self._check_writable()
+        with self._write_lock:
+            self._save_index_and_metadata()
+            self._pending_records = []
+            self._log_record_count = 0
+            self._needs_checkpoint = False
+            log_path = self.metadata_log_path
+            if log_path and os.path.exists(log_path):
+                os.remove(log_path)
+
+    def _persist(self, records: List[tuple]):
+        """Queue the metadata log records of a write operation and flush them if auto flush is on."""
+        self._pending_records.extend(records)
+        if self.faiss_index is not None and \
+                self.get_tombstone_count() > self.compaction_ratio * self.faiss_index.ntotal:
+            self.compact()
+        if self.auto_flush:
+            self.flush()
+
+    def compact(self):
+        """Rebuild the index from the stored embeddings of the live documents to drop the tombstones.
+
+        Index positions change, so the next flush writes a full checkpoint.
+        """
+        self._check_writable()
+        with self._write_lock:
+            documents = []
+            embeddings = []
+            for index_pos, doc_id in sorted(self.index_to_id.items()):
+                document = self.document_store[doc_id]
+                embedding = document.embedding
+                if len(embedding) == 0:
+                    # Documents persisted by older versions may not keep their embeddings
+                    embedding = self._reconstruct_embedding(index_pos, document)
+                if len(embedding) == 0:
+                    logger.warning(f"No embedding for document {doc_id} during compaction, dropping it")
+                    self.document_store.pop(doc_id)
+                    continue
+                documents.append(document)
+                embeddings.append(embedding)
+            self.faiss_index = None
+            self.id_to_index = {}
+            self.index_to_id = {}
+            self._next_index = 0
+            if documents:
+                self._add_to_index(documents, embeddings)
+            self._needs_checkpoint = True
+            logger.info(f"Compacted FAISS index to {len(documents)} vectors")
+
+    def _reconstruct_embedding(self, index_pos: int, document: Document) -> List[float]:
+        """Read the vector back from the index, or embed the document text again if the index
+        type does not support reconstruction."""
+        try:
+            return self.faiss_index.reconstruct(int(index_pos)).tolist()
+        except Exception:
+            if self.embedding_model is None:
+                return []
+            return self._get_embedding(document.text)
+
+    def _save_index(self):
+        """Save FAISS index to disk."""
         if self.faiss_index and self.index_path:
             try:
                 # Ensure directory exists
                 Path(self.index_path).parent.mkdir(parents=True, exist_ok=True)
-                faiss.write_index(self.faiss_index, self.index_path)
+                # Write to a temp file then replace, processes mapping the index keep the old file
+                tmp_path = f"{self.index_path}.tmp"
+                faiss.write_index(self.faiss_index, tmp_path)
+                os.replace(tmp_path, self.index_path)
                 logger.info(f"Saved FAISS index to {self.index_path}")
             except Exception:
                 logger.exception("Failed to save FAISS index")
+        elif self.faiss_index is None and self.index_path and os.path.exists(self.index_path):
+            os.remove(self.index_path)
 
+    def _save_index_and_metadata(self):
+        """Save FAISS index and metadata snapshot to disk."""
+        self._save_index()
         if self.metadata_path:
             try:
                 # Ensure directory exists
                 Path(self.metadata_path).parent.mkdir(parents=True, exist_ok=True)
-                metadata = {
-                    "document_store": self.document_store,
-                    "id_to_index": self.id_to_index,
-                    "index_to_id": self.index_to_id,
-                    "next_index": self._next_index,
-                }
-                with open(self.metadata_path, "wb") as f:
-                    pickle.dump(metadata, f)
+                # Documents are written as columns, then mapped again to release the written ones
+                MmapDocumentStore.write(self.metadata_path, self._iter_snapshot_documents(),
+                                        len(self.document_store), self._next_index,
+                                        dtype=np.float32 if self.compact_embedding else np.float64)
+                self._load_document_snapshot()
                 logger.info(f"Saved metadata to {self.metadata_path}")
             except Exception:
                 logger.exception("Failed to save metadata")
 
+    def _iter_snapshot_documents(self):
+        """Yield the index position and document of every stored document in index order, -1 for
+        a document without vector."""
+        for index_pos, doc_id in sorted(self.index_to_id.items()):
+            yield index_pos, self.document_store[doc_id]
+        for doc_id in list(self.document_store):
+            if doc_id not in self.id_to_index:
+                yield -1, self.document_store[doc_id]
+
     def _get_embedding(self, text: str, text_type: str = "document") -> List[float]:
         """Get embedding for a text using the configured embedding model.
 
@@ -198,18 +414,101 @@ class FAISSStore(Store):
         Returns:
             List[float]: The embedding vector.
         """
+        return self._get_embeddings([text], text_type=text_type)[0]
+
+    def _get_embeddings(self, texts: List[str], text_type: str = "document") -> List[List[float]]:
+        """Get embeddings for texts using the configured embedding model, `embedding_batch_size`
+        texts per call.
+
+        Args:
+            texts (List[str]): The texts to embed.
+            text_type (str): Type of text ("document" or "query").
+
+        Returns:
+            List[List[float]]: The embedding vectors in the order of the texts, an empty vector
+                for each text of a failed batch.
+        """
         if not self.embedding_model:
             NO_EMBEDDING_MSG = "No embedding model configured. Please specify an embedding_model."
             raise ValueError(NO_EMBEDDING_MSG)
 
-        try:
-            embedding_instance = EmbeddingManager().get_instance_obj(self.embedding_model)
-            embeddings = embedding_instance.get_embeddings([text], text_type=text_type)
-            return embeddings[0] if embeddings else []
-        except Exception as e:
-            # For testing purposes, if embedding manager fails, return empty list
-            logger.warning(f"Failed to get embeddings: {e}")
-            return []
+        embeddings = []
+        batch_size = max(self.embedding_batch_size or 1, 1)
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            try:
+                embedding_instance = EmbeddingManager().get_instance_obj(self.embedding_model)
+                batch_embeddings = list(embedding_instance.get_embeddings(batch, text_type=text_type) or [])
+            except Exception as e:
+                # For testing purposes, if embedding manager fails, return empty list
+                logger.warning(f"Failed to get embeddings: {e}")
+                batch_embeddings = []
+            if len(batch_embeddings) != len(batch):
+                batch_embeddings = batch_embeddings[:len(batch)] + [[]] * (len(batch) - len(batch_embeddings))
+            embeddings.extend(batch_embeddings)
+        return embeddings
+
+    async def _async_get_embeddings(self, texts: List[str], text_type: str = "document") -> List[List[float]]:
+        """Asynchronously get embeddings for texts, like `_get_embeddings` with the batches of
+        `embedding_batch_size` texts embedded concurrently by the async embedding client."""
+        if not self.embedding_model:
+            NO_EMBEDDING_MSG = "No embedding model configured. Please specify an embedding_model."
+            raise ValueError(NO_EMBEDDING_MSG)
+
+        batch_size = max(self.embedding_batch_size or 1, 1)
+        batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            try:
+                embedding_instance = EmbeddingManager().get_instance_obj(self.embedding_model)
+                batch_embeddings = list(
+                    await embedding_instance.async_get_embeddings(batch, text_type=text_type) or [])
+            except Exception as e:
+                logger.warning(f"Failed to get embeddings: {e}")
+                batch_embeddings = []
+            return batch_embeddings[:len(batch)] + [[]] * (len(batch) - len(batch_embeddings))
+
+        embeddings = []
+        for batch_embeddings in await asyncio.gather(*[embed_batch(batch) for batch in batches]):
+            embeddings.extend(batch_embeddings)
+        return embeddings
+
+    def _search(self, query_vectors: np.ndarray, top_k_list: List[int]) -> List[List[Document]]:
+        """Search the index with one vector per query in a single call.
+
+        Args:
+            query_vectors (np.ndarray): The stacked query vectors.
+            top_k_list (List[int]): The number of results to return for each query.
+
+        Returns:
+            List[List[Document]]: The documents retrieved for each query.
+        """
+        # Set search parameters for IVF indexes
+        if hasattr(self.faiss_index, "nprobe"):
+            self.faiss_index.nprobe = self.index_config.get("nprobe", 10)
+
+        # Over-fetch by the tombstone count so that deleted vectors never shrink the result
+        k = min(max(top_k_list) + self.get_tombstone_count(), self.faiss_index.ntotal)  # Can't search for more than available
+        distances, indices = self.faiss_index.search(query_vectors, k)
+
+        # Convert results to documents
+        results = []
+        for row, top_k in enumerate(top_k_list):
+            documents = []
+            for i, idx in enumerate(indices[row]):
+                if len(documents) >= top_k:
+                    break
+                if idx != -1 and idx in self.index_to_id:
+                    doc_id = self.index_to_id[idx]
+                    if doc_id in self.document_store:
+                        doc = self.document_store[doc_id]
+                        # Add distance/score to metadata, the embedding is shared with the stored document
+                        doc_copy = doc.model_copy(
+                            update={"metadata": {**(doc.metadata or {}), "score": float(distances[row][i])}}
+                        )
+                        documents.append(doc_copy)
+            results.append(documents)
+        return results
 
     def query(self, query: Query, **kwargs) -> List[Document]:  # noqa: C901
         """Query the FAISS index with the given query and return the top k results.
@@ -233,47 +532,93 @@ class FAISSStore(Store):
                 logger.warning("No embeddings provided in query and no embedding model configured")
                 return []
             embedding = [self._get_embedding(query.query_str, text_type="query")]
+        return self._query_by_embedding(query, embedding)
+
+    async def async_query(self, query: Query, **kwargs) -> List[Document]:
+        """Asynchronously query the FAISS index, the query is embedded by the async client of
+        the embedding model and the index is searched in a worker thread.
+
+        Args:
+            query (Query): The query object.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            List[Document]: List of documents retrieved by the query.
+        """
+        if not self.faiss_index or self.faiss_index.ntotal == 0:
+            return []
+
+        embedding = query.embeddings
+        if len(embedding) == 0:
+            if not query.query_str:
+                return []
+            if self.embedding_model is None:
+                logger.warning("No embeddings provided in query and no embedding model configured")
+                return []
+            embedding = (await self._async_get_embeddings([query.query_str], text_type="query"))[:1]
+        return await asyncio.to_thread(self._query_by_embedding, query, embedding)
 
+    def _query_by_embedding(self, query: Query, embedding: List[List[float]]) -> List[Document]:
+        """Search the index with the first query vector, for the top k of the query."""
         if not embedding or len(embedding[0]) == 0:
             return []
 
-        # Convert to numpy array
+        # Convert to numpy array, only the first query vector is searched
         query_vector = np.array(embedding, dtype=np.float32)
         if query_vector.ndim == 1:
             query_vector = query_vector.reshape(1, -1)
 
-        # Set search parameters for IVF indexes
-        if hasattr(self.faiss_index, "nprobe"):
-            self.faiss_index.nprobe = self.index_config.get("nprobe", 10)
-
         # Perform search
-        k = query.similarity_top_k if query.similarity_top_k else self.similarity_top_k
-        k = min(k, self.faiss_index.ntotal)  # Can't search for more than available
+        top_k = query.similarity_top_k if query.similarity_top_k else self.similarity_top_k
+        if top_k <= 0 or not self.index_to_id:
+            return []
 
         try:
-            distances, indices = self.faiss_index.search(query_vector, k)
-
-            # Convert results to documents
-            documents = []
-            for i, idx in enumerate(indices[0]):
-                if idx != -1 and idx in self.index_to_id:
-                    doc_id = self.index_to_id[idx]
-                    if doc_id in self.document_store:
-                        doc = self.document_store[doc_id]
-                        # Add distance/score to metadata
-                        doc_copy = Document(
-                            id=doc.id,
-                            text=doc.text,
-                            metadata={**(doc.metadata or {}), "score": float(distances[0][i])},
-                            embedding=doc.embedding,
-                        )
-                        documents.append(doc_copy)
-            else:
-                return documents
+            return self._search(query_vector[:1], [top_k])[0]
         except Exception:
             logger.exception("Error during FAISS search")
             return []
 
+    def query_batch(self, queries: List[Query], **kwargs) -> List[List[Document]]:
+        """Query the FAISS index with several queries at once.
+
+        Queries without embeddings are embedded in batches, and all query vectors are
+        searched in a single FAISS search over the stacked matrix.
+
+        Args:
+            queries (List[Query]): The query objects.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            List[List[Document]]: The documents retrieved for each query, in the order of the queries.
+        """
+        results: List[List[Document]] = [[] for _ in queries]
+        if not queries or not self.faiss_index or self.faiss_index.ntotal == 0 or not self.index_to_id:
+            return results
+
+        embeddings: List[List[float]] = [query.embeddings[0] if query.embeddings else [] for query in queries]
+        to_embed = [i for i, query in enumerate(queries) if not query.embeddings and query.query_str]
+        if to_embed:
+            if self.embedding_model is None:
+                logger.warning("No embeddings provided in query and no embedding model configured")
+            else:
+                texts = [queries[i].query_str for i in to_embed]
+                for i, embedding in zip(to_embed, self._get_embeddings(texts, text_type="query")):
+                    embeddings[i] = embedding
+
+        rows = [i for i, embedding in enumerate(embeddings) if len(embedding) > 0 and
+                (queries[i].similarity_top_k or self.similarity_top_k) > 0]
+        if not rows:
+            return results
+        query_vectors = np.array([embeddings[i] for i in rows], dtype=np.float32)
+        top_k_list = [queries[i].similarity_top_k or self.similarity_top_k for i in rows]
+        try:
+            for i, documents in zip(rows, self._search(query_vectors, top_k_list)):
+                results[i] = documents
+        except Exception:
+            logger.exception("Error during FAISS batch search")
+        return results
+
     def insert_document(self, documents: List[Document], **kwargs):  # noqa: C901
         """Insert documents into the FAISS index.
 
@@ -281,28 +626,36 @@ class FAISSStore(Store):
             documents (List[Document]): The documents to be inserted.
             **kwargs: Arbitrary keyword arguments.
         """
+        self._check_writable()
         if not documents:
             return
 
         # Prepare embeddings and documents
-        embeddings_to_add = []
-        docs_to_add = []
-
+        candidates = []
+        seen_ids = set()
         for document in documents:
             # Skip if document already exists
-            if document.id in self.document_store:
+            if document.id in self.document_store or document.id in seen_ids:
+                continue
+            if len(document.embedding) == 0 and self.embedding_model is None:
+                logger.warning(
+                    f"No embedding for document {document.id} and no embedding model configured, skipping"
+                )
                 continue
+            seen_ids.add(document.id)
+            candidates.append(document)
 
-            embedding = document.embedding
-            if len(embedding) == 0:
-                if self.embedding_model is not None:
-                    embedding = self._get_embedding(document.text)
-                else:
-                    logger.warning(
-                        f"No embedding for document {document.id} and no embedding model configured, skipping"
-                    )
-                    continue
+        # Embed all documents lacking embeddings in batches
+        embeddings = [document.embedding for document in candidates]
+        to_embed = [i for i, embedding in enumerate(embeddings) if len(embedding) == 0]
+        if to_embed:
+            texts = [candidates[i].text for i in to_embed]
+            for i, embedding in zip(to_embed, self._get_embeddings(texts)):
+                embeddings[i] = embedding
 
+        embeddings_to_add = []
+        docs_to_add = []
+        for document, embedding in zip(candidates, embeddings):
             if len(embedding) == 0:
                 logger.warning(f"No embedding for document {document.id}, skipping")
                 continue
@@ -313,60 +666,101 @@ class FAISSStore(Store):
         if not embeddings_to_add:
             return
 
+        with self._write_lock:
+            records = self._add_to_index(docs_to_add, embeddings_to_add)
+            self._persist(records)
+
+    def _add_to_index(self, documents: List[Document], embeddings: List[List[float]]) -> List[tuple]:
+        """Add the embeddings to the index and register the documents at the new positions.
+
+        Returns:
+            List[tuple]: The metadata log records of the added documents.
+        """
         # Initialize index if needed
         if self.faiss_index is None:
-            dimension = len(embeddings_to_add[0])
+            dimension = len(embeddings[0])
             self.faiss_index = self._create_faiss_index(dimension)
 
             # Train index if needed (for IVF indexes)
             if hasattr(self.faiss_index, "is_trained") and not self.faiss_index.is_trained:
                 nlist = self.index_config.get("nlist", 100)
-                if len(embeddings_to_add) < nlist:
+                if len(embeddings) < nlist:
                     warning_msg = (
-                        f"Not enough vectors ({len(embeddings_to_add)}) to train IVF index "
+                        f"Not enough vectors ({len(embeddings)}) to train IVF index "
                         f"properly (need at least {nlist})"
                     )
                     logger.warning(warning_msg)
-                train_vectors = np.array(embeddings_to_add, dtype=np.float32)
+                train_vectors = np.array(embeddings, dtype=np.float32)
                 self.faiss_index.train(train_vectors)
 
         # Convert embeddings to numpy array
-        embeddings_array = np.array(embeddings_to_add, dtype=np.float32)
+        embeddings_array = np.array(embeddings, dtype=np.float32)
 
         # Add to FAISS index
         self.faiss_index.add(embeddings_array)
 
         # Update metadata
-        for i, document in enumerate(docs_to_add):
+        records = []
+        for i, document in enumerate(documents):
             index_pos = self._next_index + i
+            if self.compact_embedding:
+                # A row view of the added batch, the vectors are never copied to python floats
+                document = document.model_copy(update={"embedding": embeddings_array[i]})
+            elif document.embedding is not embeddings[i]:
+                # Keep the embedding for compaction, so that the document is never embedded again
+                document = document.model_copy(update={"embedding": embeddings[i]})
             self.document_store[document.id] = document
             self.id_to_index[document.id] = index_pos
             self.index_to_id[index_pos] = document.id
-
-        self._next_index += len(docs_to_add)
-
-        # Save to disk
-        self._save_index_and_metadata()
+            records.append((INSERT_RECORD, document, index_pos))
+
+        self._next_index += len(documents)
+        return records
+
+    async def async_insert_document(self, documents: List[Document], **kwargs):
+        """Asynchronously insert documents, the new documents are embedded by the async
+        embedding client and then written into the index in a worker thread."""
+        documents = await self._async_embed_new_documents(documents, skip_existing=True)
+        await asyncio.to_thread(self.insert_document, documents, **kwargs)
+
+    async def async_upsert_document(self, documents: List[Document], **kwargs):
+        """Asynchronously upsert documents, embedded by the async embedding client."""
+        documents = await self._async_embed_new_documents(documents, skip_existing=False)
+        await asyncio.to_thread(self.upsert_document, documents, **kwargs)
+
+    async def async_update_document(self, documents: List[Document], **kwargs):
+        """Asynchronously update documents, the same as upsert for FAISS."""
+        await self.async_upsert_document(documents, **kwargs)
+
+    async def _async_embed_new_documents(self, documents: List[Document], skip_existing: bool) -> List[Document]:
+        """Fill the missing embeddings of the documents by the async embedding client, the
+        documents already in the index are dropped when `skip_existing` is set."""
+        if skip_existing:
+            documents = [document for document in documents if document.id not in self.document_store]
+        to_embed = [i for i, document in enumerate(documents) if len(document.embedding) == 0]
+        if not to_embed or self.embedding_model is None:
+            return documents
+        embeddings = await self._async_get_embeddings([documents[i].text for i in to_embed])
+        documents = list(documents)
+        for i, embedding in zip(to_embed, embeddings):
+            if len(embedding) > 0:
+                documents[i] = documents[i].model_copy(update={"embedding": embedding})
+        return documents
 
     def upsert_document(self, documents: List[Document], **kwargs):
         """Upsert documents into the FAISS index."""
-        # For FAISS, we need to delete and re-insert for updates
-        docs_to_insert = []
-        docs_to_update = []
-
-        for document in documents:
-            if document.id in self.document_store:
-                docs_to_update.append(document)
-            else:
-                docs_to_insert.append(document)
-
-        # Delete existing documents
-        for document in docs_to_update:
-            self.delete_document(document.id)
-
-        # Insert all documents
-        all_docs = docs_to_update + docs_to_insert
-        self.insert_document(all_docs, **kwargs)
+        self._check_writable()
+        # Existing documents are tombstoned in one batch, then all documents are re-inserted
+        with self._write_lock:
+            records = []
+            for document in documents:
+                if document.id in self.document_store:
+                    self._drop_document(document.id)
+                    records.append((DELETE_RECORD, document.id))
+            self._pending_records.extend(records)
+            self.insert_document(documents, **kwargs)
+            if self._pending_records and self.auto_flush:
+                self.flush()
 
     def update_document(self, documents: List[Document], **kwargs):
         """Update documents in the FAISS index."""
@@ -376,36 +770,27 @@ class FAISSStore(Store):
     def delete_document(self, document_id: str, **kwargs):
         """Delete a document from the FAISS index.
 
-        Note: FAISS doesn't support direct deletion, so we rebuild the index
-        without the deleted document.
+        Note: the vector of the document is kept in the index as a tombstone and
+        skipped by queries, the index is compacted once tombstones pile up.
         """
-        if document_id not in self.document_store:
-            return
-
-        # Remove from metadata
-        del self.document_store[document_id]
-        if document_id in self.id_to_index:
-            del self.id_to_index[document_id]
-
-        # Rebuild index_to_id mapping
-        self.index_to_id = {v: k for k, v in self.id_to_index.items()}
-
-        # For simplicity, we rebuild the entire index
-        # In production, you might want to use a more efficient approach
-        if self.document_store:
-            documents = list(self.document_store.values())
-            self._reset_faiss_index()
-            self.insert_document(documents)
-        else:
-            self._reset_faiss_index()
+        self._check_writable()
+        with self._write_lock:
+            if document_id not in self.document_store:
+                return
+            self._drop_document(document_id)
+            self._persist([(DELETE_RECORD, document_id)])
 
     def _reset_faiss_index(self):
         """Reset the FAISS index to empty state."""
-        self.faiss_index = None
-        self.id_to_index = {}
-        self.index_to_id = {}
-        self._next_index = 0
-        self._save_index_and_metadata()
+        self._check_writable()
+        with self._write_lock:
+            self.faiss_index = None
+            self.id_to_index = {}
+            self.index_to_id = {}
+            self._next_index = 0
+            self._needs_checkpoint = True
+            if self.auto_flush:
+                self.flush()
 
     def get_document_count(self) -> int:
         """Get the total number of documents in the store."""
@@ -435,5 +820,15 @@ class FAISSStore(Store):
             self.embedding_model = faiss_store_configer.embedding_model
         if hasattr(faiss_store_configer, "similarity_top_k"):
             self.similarity_top_k = faiss_store_configer.similarity_top_k
+        if hasattr(faiss_store_configer, "embedding_batch_size"):
+            self.embedding_batch_size = faiss_store_configer.embedding_batch_size
+        if hasattr(faiss_store_configer, "auto_flush"):
+            self.auto_flush = faiss_store_configer.auto_flush
+        if hasattr(faiss_store_configer, "compaction_ratio"):
+            self.compaction_ratio = faiss_store_configer.compaction_ratio
+        if hasattr(faiss_store_configer, "read_only"):
+            self.read_only = faiss_store_configer.read_only
+        if hasattr(faiss_store_configer, "compact_embedding"):
+            self.compact_embedding = faiss_store_configer.compact_embedding
 
         return self
@@ -5,6 +5,8 @@
 # @Author  : fanen.lhy
 # @Email   : fanen.lhy@antgroup.com
 # @FileName: milvus_store.py
+import json
+import threading
 from typing import List, Optional, Any
 
 try:
@@ -48,7 +50,14 @@ class MilvusStore(Store):
     embedding_model: Optional[str] = None
     similarity_top_k: Optional[int] = 10
     query_embedding: bool = False
+    embedding_batch_size: int = 32
+    write_batch_size: int = 1000
+    write_concurrency: int = 4
+    _collection_lock: Any = None
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._collection_lock = threading.Lock()
 
     def _connect_to_milvus(self, connection_args: dict):
         """Connect to Milvus server."""
@@ -93,6 +102,12 @@ class MilvusStore(Store):
             self.similarity_top_k = milvus_store_configer.similarity_top_k
         if hasattr(milvus_store_configer, "query_embedding"):
             self.similarity_top_k = milvus_store_configer.query_embedding
+        if hasattr(milvus_store_configer, "embedding_batch_size"):
+            self.embedding_batch_size = milvus_store_configer.embedding_batch_size
+        if hasattr(milvus_store_configer, "write_batch_size"):
+            self.write_batch_size = milvus_store_configer.write_batch_size
+        if hasattr(milvus_store_configer, "write_concurrency"):
+            self.write_concurrency = milvus_store_configer.write_concurrency
         return self
 
     def _create_or_load_collection(self,
@@ -206,37 +221,34 @@ class MilvusStore(Store):
         Returns:
         None
         """
-        for document in documents:
-            embedding = document.embedding
-            if len(embedding) == 0:
-                if not self.embedding_model:
-                    raise Exception("Milvus store can only save vector, "
-                                    "you should provide embedding in your document or specify an embedding model.")
-                else:
-                    embedding = EmbeddingManager().get_instance_obj(
-                        self.embedding_model
-                    ).get_embeddings([document.text])[0]
+        if not documents:
+            return
 
-            if not self.collection:
-                self._create_or_load_collection(
-                    dim=len(embedding),
-                    max_length=max_length,
-                    index_params=index_params
-                )
-            expr = f'id == "{document.id}"'
-            existing_docs = self.collection.query(expr)
-            entities = [
-                [document.id],
-                [embedding],
-                [document.text],
-                [document.metadata]
-            ]
-            if existing_docs:
-                self.collection.delete(expr)
-                self.collection.insert(entities)
-            else:
-                self.collection.insert(entities)
-            self.collection.load()
+        def write_batch(batch: List[Document]):
+            embeddings = self._embed_documents(batch, self.embedding_model, self.embedding_batch_size)
+            if any(len(embedding) == 0 for embedding in embeddings):
+                raise Exception("Milvus store can only save vector, "
+                                "you should provide embedding in your document or specify an embedding model.")
+            with self._collection_lock:
+                if not self.collection:
+                    self._create_or_load_collection(
+                        dim=len(embeddings[0]),
+                        max_length=max_length,
+                        index_params=index_params
+                    )
+            # Replace the existing documents of the batch with one delete and one insert.
+            self.collection.delete(f"id in {json.dumps([document.id for document in batch], ensure_ascii=False)}")
+            self.collection.insert([
+                [document.id for document in batch],
+                embeddings,
+                [document.text for document in batch],
+                [document.metadata for document in batch]
+            ])
+
+        # Duplicated ids in the documents keep their last version.
+        documents = list({document.id: document for document in documents}.values())
+        self._write_in_batches(documents, write_batch, self.write_batch_size, self.write_concurrency)
+        self.collection.load()
 
     def insert_document(self,
                          documents: List[Document],
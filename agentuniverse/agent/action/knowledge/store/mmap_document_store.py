@@ -0,0 +1,199 @@
+# !/usr/bin/env python3
+
+# @Time    : 2026/10/18 20:10
+# @Author  : saswatsusmoy
+# @Email   : saswatsusmoy9@gmail.com
+# @FileName: mmap_document_store.py
+
+import glob
+import mmap
+import os
+import pickle
+import uuid
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from agentuniverse.agent.action.knowledge.store.document import Document
+
+# Version of the columnar snapshot layout
+SNAPSHOT_VERSION = 2
+
+
+class MmapDocumentStore(MutableMapping):
+    """A document mapping backed by a memory-mapped columnar snapshot.
+
+    The snapshot keeps one row per document, written by `write`:
+        <path>                           manifest of the pickled (document id, index position)
+                                         entries, the next index and the snapshot generation
+        <path>.<generation>.blob         pickled (text, metadata) of every row, concatenated
+        <path>.<generation>.offsets.npy  int64 offsets of the rows in the blob, one more than the rows
+        <path>.<generation>.embeddings.npy
+                                         float64, or float32 for compact stores, embedding matrix,
+                                         absent if the embeddings are ragged
+
+    The data files of a generation are never rewritten, a new snapshot is swapped in by replacing
+    the manifest only, so readers always see the files of a single generation.
+
+    Rows are decoded on access only, and the blob and embedding pages are shared through the
+    page cache by every process mapping the same snapshot. Documents set after loading are kept
+    in an in-memory overlay until the next snapshot. In the compact mode, the embedding of a
+    decoded document is a read-only view of its row in the mapped embedding matrix.
+    """
+
+    def __init__(self, path: str, snapshot: Optional[dict] = None, compact: bool = False):
+        if snapshot is None:
+            with open(path, "rb") as f:
+                snapshot = pickle.load(f)  # noqa: S301
+        self.path: str = path
+        self.compact: bool = compact
+        self.entries: List[Tuple[str, int]] = snapshot.get("entries", [])
+        self.next_index: int = snapshot.get("next_index", 0)
+        self._rows: Dict[str, int] = {doc_id: row for row, (doc_id, _) in enumerate(self.entries)}
+        self._overlay: Dict[str, Document] = {}
+        self._hidden: set = set()
+        data_path = MmapDocumentStore._data_path(path, snapshot.get("generation"))
+        self._offsets = np.load(f"{data_path}.offsets.npy", mmap_mode="r")
+        self._embeddings = None
+        if os.path.exists(f"{data_path}.embeddings.npy"):
+            self._embeddings = np.load(f"{data_path}.embeddings.npy", mmap_mode="r")
+        self._blob = None
+        if os.path.getsize(f"{data_path}.blob") > 0:
+            with open(f"{data_path}.blob", "rb") as f:
+                self._blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def is_snapshot(metadata: dict) -> bool:
+        """Whether the loaded metadata file is a columnar snapshot."""
+        return isinstance(metadata, dict) and metadata.get("version") == SNAPSHOT_VERSION
+
+    @staticmethod
+    def _data_path(path: str, generation: Optional[str]) -> str:
+        """Return the prefix of the data files of a generation, snapshots written without
+        generation keep them next to the entry file."""
+        return f"{path}.{generation}" if generation else path
+
+    @staticmethod
+    def write(path: str, documents: Iterable[Tuple[int, Document]], count: int, next_index: int,
+              dtype: type = np.float64):
+        """Write the documents as a columnar snapshot, one document in memory at a time.
+
+        The data files are written under a new generation, then the manifest is written to a temp
+        file and swapped in with a single replace, so a crash or a concurrent reader never mixes the
+        files of two snapshots. The generation of the replaced manifest is kept for the processes
+        still loading it, older generations are removed.
+
+        Args:
+            path (str): Path of the snapshot entry file.
+            documents (Iterable[Tuple[int, Document]]): The index position and document of each
+                row, the position is -1 for a document without vector.
+            count (int): The number of documents.
+            next_index (int): The next free index position.
+            dtype (type): The dtype of the embedding matrix.
+        """
+        generation = uuid.uuid4().hex
+        data_path = MmapDocumentStore._data_path(path, generation)
+        entries = []
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        embeddings = None
+        has_embeddings = count > 0
+        with open(f"{data_path}.blob", "wb") as f:
+            for row, (index_pos, document) in enumerate(documents):
+                entries.append((document.id, index_pos))
+                f.write(pickle.dumps((document.text, document.metadata), protocol=pickle.HIGHEST_PROTOCOL))
+                offsets[row + 1] = f.tell()
+                if not has_embeddings:
+                    continue
+                if embeddings is None and len(document.embedding) > 0:
+                    embeddings = np.lib.format.open_memmap(f"{data_path}.embeddings.npy", mode="w+",
+                                                           dtype=dtype,
+                                                           shape=(count, len(document.embedding)))
+                if embeddings is None or len(document.embedding) != embeddings.shape[1]:
+                    # Ragged or missing embeddings are not kept in the snapshot
+                    has_embeddings = False
+                    continue
+                embeddings[row] = document.embedding
+        if embeddings is not None:
+            embeddings.flush()
+            del embeddings
+        if not has_embeddings and os.path.exists(f"{data_path}.embeddings.npy"):
+            os.remove(f"{data_path}.embeddings.npy")
+        with open(f"{data_path}.offsets.npy", "wb") as f:
+            np.save(f, offsets)
+
+        previous_generation = MmapDocumentStore._read_generation(path)
+        with open(f"{path}.tmp", "wb") as f:
+            pickle.dump({"version": SNAPSHOT_VERSION, "entries": entries, "next_index": next_index,
+                         "generation": generation}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{path}.tmp", path)
+        MmapDocumentStore._remove_generations(path, keep={generation, previous_generation})
+
+    @staticmethod
+    def _read_generation(path: str) -> Optional[str]:
+        """Return the generation of the current manifest, None if it has none."""
+        try:
+            with open(path, "rb") as f:
+                metadata = pickle.load(f)  # noqa: S301
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        return metadata.get("generation") if MmapDocumentStore.is_snapshot(metadata) else None
+
+    @staticmethod
+    def _remove_generations(path: str, keep: set):
+        """Remove the data files of the generations not kept, including the ones written without
+        generation. Files still mapped by another process stay readable until unmapped."""
+        stale_paths = []
+        if None not in keep:
+            stale_paths.extend(f"{path}{suffix}" for suffix in (".blob", ".offsets.npy", ".embeddings.npy"))
+        for data_file in glob.glob(f"{glob.escape(path)}.*.*"):
+            generation = data_file[len(path) + 1:].split(".", 1)[0]
+            if len(generation) == 32 and generation not in keep:
+                stale_paths.append(data_file)
+        for stale_path in stale_paths:
+            try:
+                if os.path.exists(stale_path):
+                    os.remove(stale_path)
+            except OSError:
+                # The file is still in use on platforms which can not remove mapped files
+                pass
+
+    def __getitem__(self, document_id: str) -> Document:
+        if document_id in self._overlay:
+            return self._overlay[document_id]
+        row = self._rows.get(document_id)
+        if row is None or document_id in self._hidden:
+            raise KeyError(document_id)
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        text, metadata = pickle.loads(self._blob[start:end]) if end > start else ("", None)  # noqa: S301
+        embedding = []
+        if self._embeddings is not None:
+            embedding = self._embeddings[row] if self.compact else self._embeddings[row].tolist()
+        return Document(id=document_id, text=text, metadata=metadata, embedding=embedding)
+
+    def __setitem__(self, document_id: str, document: Document):
+        if document_id in self._rows:
+            self._hidden.add(document_id)
+        self._overlay[document_id] = document
+
+    def __delitem__(self, document_id: str):
+        if document_id in self._overlay:
+            del self._overlay[document_id]
+        elif document_id in self._rows and document_id not in self._hidden:
+            self._hidden.add(document_id)
+        else:
+            raise KeyError(document_id)
+
+    def __contains__(self, document_id) -> bool:
+        if document_id in self._overlay:
+            return True
+        return document_id in self._rows and document_id not in self._hidden
+
+    def __iter__(self) -> Iterator[str]:
+        for document_id in self._rows:
+            if document_id not in self._hidden:
+                yield document_id
+        yield from list(self._overlay)
+
+    def __len__(self) -> int:
+        return len(self._rows) - len(self._hidden) + len(self._overlay)
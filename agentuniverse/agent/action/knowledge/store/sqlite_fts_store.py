@@ -0,0 +1,160 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 21:40
+# @Author  : fanen.lhy
+# @Email   : fanen.lhy@antgroup.com
+# @FileName: sqlite_fts_store.py
+import json
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+import jieba
+
+from agentuniverse.agent.action.knowledge.doc_processor.jieba_keyword_extractor import \
+    chinese_stopwords, stop_words
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.query import Query
+from agentuniverse.agent.action.knowledge.store.sqlite_store import DEFAULT_PRAGMAS, MAX_BATCH_IDS
+from agentuniverse.agent.action.knowledge.store.store import Store
+from agentuniverse.base.config.component_configer.component_configer import \
+    ComponentConfiger
+
+
+class SQLiteFTSStore(Store):
+    """Keyword store built on the SQLite FTS5 full-text index.
+
+    Texts are segmented by jieba before indexing, so the FTS5 tokenizer only splits the words on
+    whitespace, and documents are ranked by the native `bm25()` of FTS5. The segmented text is
+    kept in the `documents` table, which is the external content of the `documents_fts` index,
+    linked by the explicit `rowid_pk` key so that a VACUUM can not renumber the rows.
+
+    Attributes:
+        db_path (str): Path of the SQLite database file.
+        fts_tokenizer (str): FTS5 tokenizer applied to the jieba segmented text.
+        similarity_top_k (int): Number of top documents returned by a query.
+        pragmas (Dict[str, Any]): Connection pragmas, merged with the SQLiteStore defaults.
+    """
+    db_path: str = 'sqlite_fts_store.db'
+    conn: Optional[sqlite3.Connection] = None
+    fts_tokenizer: str = 'unicode61 remove_diacritics 2'
+    similarity_top_k: int = 10
+    pragmas: Dict[str, Any] = None
+
+    def _new_client(self):
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        pragmas = {**DEFAULT_PRAGMAS, **(self.pragmas or {})}
+        for name, value in pragmas.items():
+            self.conn.execute(f'PRAGMA {name} = {value}')
+        self._create_tables()
+
+    def _create_tables(self):
+        with self.conn:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS documents (
+                    rowid_pk INTEGER PRIMARY KEY,
+                    id TEXT NOT NULL UNIQUE,
+                    text TEXT,
+                    tokens TEXT,
+                    metadata TEXT
+                )
+            ''')
+            self.conn.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                    tokens, content='documents', content_rowid='rowid_pk', tokenize='{self.fts_tokenizer}'
+                )
+            ''')
+            # Keep the external content index in sync with the documents table
+            self.conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+                    INSERT INTO documents_fts (rowid, tokens) VALUES (new.rowid_pk, new.tokens);
+                END
+            ''')
+            self.conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+                    INSERT INTO documents_fts (documents_fts, rowid, tokens) VALUES ('delete', old.rowid_pk, old.tokens);
+                END
+            ''')
+
+    def _initialize_by_component_configer(self,
+                                          sqlite_fts_store_configer: ComponentConfiger) -> 'SQLiteFTSStore':
+        super()._initialize_by_component_configer(sqlite_fts_store_configer)
+        if hasattr(sqlite_fts_store_configer, "db_path"):
+            self.db_path = sqlite_fts_store_configer.db_path
+        if hasattr(sqlite_fts_store_configer, "fts_tokenizer"):
+            self.fts_tokenizer = sqlite_fts_store_configer.fts_tokenizer
+        if hasattr(sqlite_fts_store_configer, "similarity_top_k"):
+            self.similarity_top_k = sqlite_fts_store_configer.similarity_top_k
+        if hasattr(sqlite_fts_store_configer, "pragmas"):
+            self.pragmas = sqlite_fts_store_configer.pragmas
+        return self
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Segment the text by jieba, dropping stopwords and punctuation."""
+        return [word for word in jieba.lcut(text or '')
+                if any(char.isalnum() for char in word)
+                and word not in chinese_stopwords and word.lower() not in stop_words]
+
+    def insert_document(self, documents: List[Document], **kwargs):
+        rows = {}
+        for document in documents:
+            metadata = json.dumps(
+                document.metadata) if document.metadata else None
+            rows[document.id] = (document.id, document.text,
+                                 ' '.join(self.tokenize(document.text)), metadata)
+        with self.conn:
+            self._remove_documents(list(rows.keys()))
+            self.conn.executemany(
+                'INSERT INTO documents (id, text, tokens, metadata) VALUES (?, ?, ?, ?)',
+                list(rows.values())
+            )
+
+    def upsert_document(self, documents: List[Document], **kwargs):
+        self.insert_document(documents, **kwargs)
+
+    def update_document(self, documents: List[Document], **kwargs):
+        self.insert_document(documents, **kwargs)
+
+    def delete_document(self, document_id: str, **kwargs):
+        with self.conn:
+            self._remove_documents([document_id])
+
+    def _remove_documents(self, document_ids: List[str]):
+        """Delete the documents, the trigger removes them from the index."""
+        for start in range(0, len(document_ids), MAX_BATCH_IDS):
+            batch = document_ids[start:start + MAX_BATCH_IDS]
+            self.conn.execute(f'DELETE FROM documents WHERE id IN ({", ".join("?" * len(batch))})', batch)
+
+    def optimize(self):
+        """Merge the segments of the full-text index, run it after a large ingestion."""
+        with self.conn:
+            self.conn.execute("INSERT INTO documents_fts (documents_fts) VALUES ('optimize')")
+
+    def query(self, query: Query, **kwargs) -> List[Document]:
+        if len(query.keywords) > 0:
+            query_terms = [term for keyword in query.keywords for term in self.tokenize(keyword)]
+        else:
+            query_terms = self.tokenize(query.query_str)
+        if not query_terms:
+            return []
+        # Every term is quoted as a phrase, any of them matches.
+        match_expression = ' OR '.join('"' + term.replace('"', '""') + '"' for term in dict.fromkeys(query_terms))
+        top_k = query.similarity_top_k if query.similarity_top_k else self.similarity_top_k
+
+        cursor = self.conn.execute('''
+            SELECT d.id, d.text, d.metadata, bm25(documents_fts) AS score
+            FROM documents_fts
+            JOIN documents d ON d.rowid_pk = documents_fts.rowid
+            WHERE documents_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+        ''', (match_expression, top_k))
+        results = []
+        for doc_row in cursor.fetchall():
+            metadata = json.loads(doc_row[2]) if doc_row[2] else {}
+            # bm25() of FTS5 is lower for better matches
+            metadata['score'] = -doc_row[3]
+            results.append(Document(id=doc_row[0], text=doc_row[1], metadata=metadata))
+        cursor.close()
+        return results
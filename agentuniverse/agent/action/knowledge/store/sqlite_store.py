@@ -8,7 +8,8 @@
 import sqlite3
 import json
 import math
-from typing import List, Optional, Set
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Set
 from collections import Counter
 
 import jieba
@@ -21,20 +22,89 @@ from agentuniverse.base.config.component_configer.component_configer import \
     ComponentConfiger
 
 
+# Connection pragmas, overridden by the `pragmas` of the store config.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -65536,
+    'temp_store': 'MEMORY',
+}
+
+# Lookup indexes as (name, table, columns), dropped during a bulk load.
+INDEXES = [
+    ('idx_inverted_index_term', 'inverted_index', 'term, doc_id'),
+    ('idx_inverted_index_doc_id', 'inverted_index', 'doc_id'),
+    ('idx_term_frequency_term', 'term_frequency', 'term, doc_id, tf'),
+    ('idx_term_frequency_doc_id', 'term_frequency', 'doc_id'),
+]
+
+# Max number of ids bound to one statement.
+MAX_BATCH_IDS = 500
+
+
 class SQLiteStore(Store):
+    """Keyword store scoring documents with BM25 on top of SQLite.
+
+    Term frequencies and lengths of the documents are computed once at write time and kept in the
+    `term_frequency` and `documents` tables, and the corpus statistics are kept up to date in the
+    `corpus_stats` table, so a query is scored by a single set-based statement.
+
+    The connection pragmas default to `DEFAULT_PRAGMAS` and are merged with the `pragmas` of the
+    store config. Use `bulk_load()` to ingest a large corpus without maintaining the indexes.
+    """
     db_path: str = 'sqlite_store.db'
     conn: Optional[sqlite3.Connection] = None
     k1: float = 1.5
     b: float = 0.75
     keyword_extractor: Optional[str] = None
     similarity_top_k: int = 10
+    pragmas: Dict[str, Any] = None
 
     def _new_client(self):
         self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._apply_pragmas()
         self._create_tables()
+        self._create_indexes()
+
+    def _apply_pragmas(self):
+        pragmas = {**DEFAULT_PRAGMAS, **(self.pragmas or {})}
+        for name, value in pragmas.items():
+            self.conn.execute(f'PRAGMA {name} = {value}')
+
+    def _create_indexes(self):
+        with self.conn:
+            for name, table, columns in INDEXES:
+                self.conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})')
+
+    def _drop_indexes(self):
+        with self.conn:
+            for name, _, _ in INDEXES:
+                self.conn.execute(f'DROP INDEX IF EXISTS {name}')
+
+    @contextmanager
+    def bulk_load(self):
+        """Ingest documents without maintaining the lookup indexes and without syncing every
+        transaction, the indexes are built once when the block exits.
+
+        Example:
+            with store.bulk_load():
+                store.insert_document(documents)
+        """
+        synchronous = self.conn.execute('PRAGMA synchronous').fetchone()[0]
+        self._drop_indexes()
+        self.conn.execute('PRAGMA synchronous = OFF')
+        try:
+            yield self
+        finally:
+            self.conn.execute(f'PRAGMA synchronous = {synchronous}')
+            self._create_indexes()
+            self.conn.execute('ANALYZE')
 
     def _create_tables(self):
         with self.conn:
+            has_term_frequency = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'term_frequency'"
+            ).fetchone() is not None
             self.conn.execute('''
                 CREATE TABLE IF NOT EXISTS documents (
                     id TEXT PRIMARY KEY,
@@ -50,6 +120,38 @@ class SQLiteStore(Store):
                     FOREIGN KEY (doc_id) REFERENCES documents (id)
                 )
             ''')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS term_frequency (
+                    term TEXT,
+                    doc_id TEXT,
+                    tf INT,
+                    FOREIGN KEY (doc_id) REFERENCES documents (id)
+                )
+            ''')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS corpus_stats (
+                    key TEXT PRIMARY KEY,
+                    value INT
+                )
+            ''')
+            if not has_term_frequency:
+                self._rebuild_statistics()
+
+    def _rebuild_statistics(self):
+        """Compute the term frequencies and corpus statistics of the documents written by older
+        versions, which only kept the document texts."""
+        rows = self.conn.execute('SELECT id, text FROM documents').fetchall()
+        for doc_id, text in rows:
+            self.conn.executemany(
+                'INSERT INTO term_frequency (term, doc_id, tf) VALUES (?, ?, ?)',
+                [(term, doc_id, tf) for term, tf in Counter(jieba.lcut(text or '')).items()]
+            )
+        doc_count, word_count = self.conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(word_count), 0) FROM documents').fetchone()
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO corpus_stats (key, value) VALUES (?, ?)',
+            [('doc_count', doc_count), ('word_count', word_count)]
+        )
 
     def _initialize_by_component_configer(self,
                                           sqlite_store_configer: ComponentConfiger) -> 'DocProcessor':
@@ -64,50 +166,29 @@ class SQLiteStore(Store):
             self.keyword_extractor = sqlite_store_configer.keyword_extractor
         if hasattr(sqlite_store_configer, "similarity_top_k"):
             self.similarity_top_k = sqlite_store_configer.similarity_top_k
+        if hasattr(sqlite_store_configer, "pragmas"):
+            self.pragmas = sqlite_store_configer.pragmas
         return self
 
+    def _get_corpus_stat(self, key: str) -> int:
+        cursor = self.conn.execute('SELECT value FROM corpus_stats WHERE key = ?', (key,))
+        row = cursor.fetchone()
+        cursor.close()
+        return row[0] if row and row[0] is not None else 0
 
     def _get_all_docs_count(self) -> int:
-        with self.conn:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM documents')
-            count = cursor.fetchone()[0]
-            cursor.close()
-        return count
+        return self._get_corpus_stat('doc_count')
 
     def _get_all_docs_words_count(self) -> int:
-        with self.conn:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT SUM(word_count) FROM documents')
-            total_word_count = cursor.fetchone()[0]
-            cursor.close()
-        return total_word_count if total_word_count is not None else 0
-
-    def compute_bm25(self, query_text, doc_text, inverted_index,
-                     total_doc_count, total_word_count):
-        k1 = self.k1
-        b = self.b
-        query_words = jieba.lcut(query_text)
-        doc_words = jieba.lcut(doc_text)
-        doc_length = len(doc_words)
-        avg_doc_length = total_word_count / total_doc_count
-        bm25_score = 0
-
-        doc_counter = Counter(doc_words)
-
-        for term in query_words:
-            if term in inverted_index:
-                term_freq = doc_counter[term]
-                num_docs_with_term = len(inverted_index[term])
-                idf = math.log((total_doc_count - num_docs_with_term + 0.5) / (
-                        num_docs_with_term + 0.5) + 1)
-                bm25_term_score = idf * (term_freq * (k1 + 1)) / (
-                        term_freq + k1 * (
-                        1 - b + b * (doc_length / avg_doc_length)))
-                bm25_score += bm25_term_score
-
-        return bm25_score
+        return self._get_corpus_stat('word_count')
 
+    def _update_corpus_stats(self, doc_count_delta: int, word_count_delta: int):
+        for key, delta in (('doc_count', doc_count_delta), ('word_count', word_count_delta)):
+            self.conn.execute(
+                'INSERT INTO corpus_stats (key, value) VALUES (?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET value = value + excluded.value',
+                (key, delta)
+            )
 
     def _get_document_keyword(self, document: Document) -> Set[str]:
         if not self.keyword_extractor:
@@ -119,54 +200,72 @@ class SQLiteStore(Store):
                 .process_docs([document])
             return _doc[0].keywords
 
-    def insert_document(self, documents: List[Document], **kwargs):
+    def _write_documents(self, documents: List[Document]):
+        """Replace the documents, along with their keywords, term frequencies and the corpus
+        statistics. Tokenization and keyword extraction run before the transaction."""
+        rows = {}
+        for document in documents:
+            self._get_document_keyword(document)
+            rows[document.id] = (document, Counter(jieba.lcut(document.text or '')))
+        document_rows = []
+        keyword_rows = []
+        term_frequency_rows = []
+        word_count = 0
+        for document, term_counter in rows.values():
+            metadata = json.dumps(
+                document.metadata) if document.metadata else None
+            doc_length = sum(term_counter.values())
+            word_count += doc_length
+            document_rows.append((document.id, document.text, doc_length, metadata))
+            keyword_rows.extend((term, document.id) for term in set(document.keywords))
+            term_frequency_rows.extend((term, document.id, tf) for term, tf in term_counter.items())
         with self.conn:
-            for document in documents:
-                metadata = json.dumps(
-                    document.metadata) if document.metadata else None
-                self.conn.execute(
-                    'INSERT OR REPLACE INTO documents (id, text, word_count, metadata) VALUES (?, ?, ?, ?)',
-                    (document.id, document.text, len(jieba.lcut(document.text)), metadata)
-                )
-                self._get_document_keyword(document)
-                for term in set(document.keywords):
-                    self.conn.execute(
-                        'INSERT INTO inverted_index (term, doc_id) VALUES (?, ?)',
-                        (term, document.id)
-                    )
+            self._remove_documents(list(rows.keys()))
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO documents (id, text, word_count, metadata) VALUES (?, ?, ?, ?)',
+                document_rows
+            )
+            self.conn.executemany(
+                'INSERT INTO inverted_index (term, doc_id) VALUES (?, ?)',
+                keyword_rows
+            )
+            self.conn.executemany(
+                'INSERT INTO term_frequency (term, doc_id, tf) VALUES (?, ?, ?)',
+                term_frequency_rows
+            )
+            self._update_corpus_stats(len(rows), word_count)
+
+    def _remove_documents(self, document_ids: List[str]):
+        """Delete the documents and their postings, must run inside a transaction.
+
+        The ids are collected into a temp table and each table is cleared by a single statement,
+        so the postings are scanned once even while `bulk_load` has dropped the doc_id indexes.
+        """
+        existing_rows = []
+        for start in range(0, len(document_ids), MAX_BATCH_IDS):
+            batch = document_ids[start:start + MAX_BATCH_IDS]
+            existing_rows.extend(self.conn.execute(
+                f'SELECT id, word_count FROM documents WHERE id IN ({", ".join("?" * len(batch))})',
+                batch).fetchall())
+        if not existing_rows:
+            return
+        self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS removed_ids (id TEXT PRIMARY KEY)')
+        self.conn.execute('DELETE FROM removed_ids')
+        self.conn.executemany('INSERT OR IGNORE INTO removed_ids (id) VALUES (?)',
+                              [(row[0],) for row in existing_rows])
+        for table, column in (('documents', 'id'), ('inverted_index', 'doc_id'), ('term_frequency', 'doc_id')):
+            self.conn.execute(f'DELETE FROM {table} WHERE {column} IN (SELECT id FROM removed_ids)')
+        self._update_corpus_stats(-len(existing_rows), -sum(row[1] or 0 for row in existing_rows))
+
+    def insert_document(self, documents: List[Document], **kwargs):
+        self._write_documents(documents)
 
     def delete_document(self, document_id: int):
         with self.conn:
-            self.conn.execute(
-                'DELETE FROM documents WHERE id = ?',
-                (document_id,)
-            )
-            self.conn.execute(
-                'DELETE FROM inverted_index WHERE doc_id = ?',
-                (document_id,)
-            )
+            self._remove_documents([document_id])
 
     def upsert_document(self, documents: List[Document], **kwargs):
-        with self.conn:
-            for document in documents:
-                metadata = json.dumps(
-                    document.metadata) if document.metadata else None
-                self.conn.execute(
-                    'INSERT OR REPLACE INTO documents (id, text, word_count, metadata) VALUES (?, ?, ?, ?)',
-                    (
-                    document.id, document.text, len(jieba.lcut(document.text)),
-                    metadata)
-                )
-                self.conn.execute(
-                    'DELETE FROM inverted_index WHERE doc_id = ?',
-                    (document.id,)
-                )
-                self._get_document_keyword(document)
-                for term in set(document.keywords):
-                    self.conn.execute(
-                        'INSERT INTO inverted_index (term, doc_id) VALUES (?, ?)',
-                        (term, document.id)
-                    )
+        self._write_documents(documents)
 
     def query(self, query: Query, **kwargs) -> List[Document]:
         if len(query.keywords) > 0:
@@ -174,51 +273,56 @@ class SQLiteStore(Store):
         else:
             query_terms = self._get_document_keyword(Document(text=query.query_str))
             query.keywords = query_terms
+        query_terms = list(query_terms)
+        if not query_terms:
+            return []
 
-        # Get doc_id from inverted index.
-        relevant_docs = set()
-        inverted_index = {}
-        with self.conn:
-            for keyword in query_terms:
-                cursor = self.conn.cursor()
-                cursor.execute(
-                    'SELECT doc_id FROM inverted_index WHERE term = ?',
-                    (keyword,))
-                docs_with_keyword = [row[0] for row in cursor.fetchall()]
-                inverted_index[keyword] = docs_with_keyword
-                relevant_docs.update(docs_with_keyword)
-                cursor.close()
-
-        # Count every document's bm25.
-        doc_scores = []
         total_doc_count = self._get_all_docs_count()
         total_word_count = self._get_all_docs_words_count()
-        for doc_id in relevant_docs:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT text FROM documents WHERE id = ?',
-                           (doc_id,))
-            doc_text = cursor.fetchone()[0]
-            cursor.close()
-
-            bm25_score = self.compute_bm25(query.query_str, doc_text,
-                                           inverted_index, total_doc_count, total_word_count)
-            doc_scores.append((doc_id, bm25_score))
-
-        # Order the docs with bm25, and return top k.
-        doc_scores.sort(key=lambda x: x[1], reverse=True)
-        top_docs = doc_scores[:self.similarity_top_k]
-        results = []
-        for doc_id, score in top_docs:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT * FROM documents WHERE id = ?',
-                           (doc_id,))
-            doc_row = cursor.fetchone()
-            cursor.close()
+        if total_doc_count == 0:
+            return []
+        avg_doc_length = total_word_count / total_doc_count or 1
 
+        # Weight every query word by its idf, words repeated in the query count repeatedly.
+        term_placeholders = ', '.join('?' * len(query_terms))
+        doc_freq = dict(self.conn.execute(
+            f'SELECT term, COUNT(*) FROM inverted_index WHERE term IN ({term_placeholders}) GROUP BY term',
+            query_terms).fetchall())
+        query_counter = Counter(word for word in jieba.lcut(query.query_str or '') if word in query_terms)
+        weights = []
+        for term, count in query_counter.items():
+            num_docs_with_term = doc_freq.get(term, 0)
+            idf = math.log((total_doc_count - num_docs_with_term + 0.5) / (
+                    num_docs_with_term + 0.5) + 1)
+            weights.extend([term, count * idf])
+
+        # Score the candidate docs from the postings, and return top k.
+        weights_cte = ', '.join(['(?, ?)'] * len(query_counter)) if query_counter else "(NULL, 0)"
+        cursor = self.conn.execute(f'''
+            WITH query_weights (term, weight) AS (VALUES {weights_cte}),
+            candidates AS (
+                SELECT DISTINCT doc_id FROM inverted_index WHERE term IN ({term_placeholders})
+            )
+            SELECT d.id, d.text, d.word_count, d.metadata,
+                COALESCE(SUM(w.weight * tf.tf * (? + 1)
+                    / (tf.tf + ? * (1 - ? + ? * d.word_count / ?))), 0) AS score
+            FROM candidates c
+            JOIN documents d ON d.id = c.doc_id
+            LEFT JOIN term_frequency tf ON tf.doc_id = c.doc_id
+                AND tf.term IN (SELECT term FROM query_weights)
+            LEFT JOIN query_weights w ON w.term = tf.term
+            GROUP BY d.id
+            ORDER BY score DESC
+            LIMIT ?
+        ''', [*weights, *query_terms, self.k1, self.k1, self.b, self.b, avg_doc_length,
+              self.similarity_top_k])
+        results = []
+        for doc_row in cursor.fetchall():
             document = Document(id=doc_row[0], text=doc_row[1],
                                 word_count=doc_row[2],
-                                metadata=json.loads(doc_row[3]))
+                                metadata=json.loads(doc_row[3]) if doc_row[3] else None)
             results.append(document)
+        cursor.close()
 
         return results
 
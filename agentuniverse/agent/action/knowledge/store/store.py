@@ -5,14 +5,17 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: store.py
-from typing import Any, List, Optional
+import asyncio
+from typing import Any, Callable, List, Optional
 
 from agentuniverse.base.component.component_base import ComponentEnum
 from agentuniverse.base.component.component_base import ComponentBase
 from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
 from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.embedding.embedding_manager import EmbeddingManager
 from agentuniverse.agent.action.knowledge.store.query import Query
 from agentuniverse.agent_serve.web.post_fork_queue import add_post_fork
+from agentuniverse.agent_serve.web.thread_with_result import ThreadPoolExecutorWithReturnValue
 
 
 class Store(ComponentBase):
@@ -65,8 +68,12 @@ class Store(ComponentBase):
         raise NotImplementedError
 
     async def async_query(self, query: Query, **kwargs) -> List[Document]:
-        """Asynchronously query documents."""
-        raise NotImplementedError
+        """Asynchronously query documents.
+
+        The sync method runs in a worker thread by default, stores may override it with a native
+        async implementation.
+        """
+        return await asyncio.to_thread(self.query, query, **kwargs)
 
     def insert_document(self, documents: List[Document], **kwargs):
         """Insert documents into the store."""
@@ -74,7 +81,7 @@ class Store(ComponentBase):
 
     async def async_insert_document(self, documents: List[Document], **kwargs):
         """Asynchronously insert documents into the store."""
-        raise NotImplementedError
+        return await asyncio.to_thread(self.insert_document, documents, **kwargs)
 
     def delete_document(self, document_id: str, **kwargs):
         """Delete the specific document by the document id."""
@@ -82,7 +89,7 @@ class Store(ComponentBase):
 
     async def async_delete_document(self, document_id: str, **kwargs):
         """Asynchronously delete the specific document by the document id."""
-        raise NotImplementedError
+        return await asyncio.to_thread(self.delete_document, document_id, **kwargs)
 
     def upsert_document(self, documents: List[Document], **kwargs):
         """Upsert document into the store."""
@@ -90,7 +97,7 @@ class Store(ComponentBase):
 
     async def async_upsert_document(self, documents: List[Document], **kwargs):
         """Asynchronously upsert documents into the store."""
-        raise NotImplementedError
+        return await asyncio.to_thread(self.upsert_document, documents, **kwargs)
 
     def update_document(self, documents: List[Document], **kwargs):
         """Update document into the store."""
@@ -98,7 +105,66 @@ class Store(ComponentBase):
 
     async def async_update_document(self, documents: List[Document], **kwargs):
         """Asynchronously update documents into the store."""
-        raise NotImplementedError
+        return await asyncio.to_thread(self.update_document, documents, **kwargs)
+
+    @staticmethod
+    def _embed_documents(documents: List[Document], embedding_model: Optional[str],
+                         batch_size: int) -> List[List[float]]:
+        """Return the embedding of each document, the documents without embedding are embedded
+        by the embedding model in batches of `batch_size` texts.
+
+        Documents without embedding keep an empty embedding if no embedding model is configured.
+        """
+        embeddings = [document.embedding for document in documents]
+        to_embed = [i for i, embedding in enumerate(embeddings) if len(embedding) == 0]
+        if not to_embed or embedding_model is None:
+            return embeddings
+        embedding_instance = EmbeddingManager().get_instance_obj(embedding_model)
+        batch_size = max(batch_size or 1, 1)
+        for start in range(0, len(to_embed), batch_size):
+            batch = to_embed[start:start + batch_size]
+            batch_embeddings = embedding_instance.get_embeddings([documents[i].text for i in batch])
+            for i, embedding in zip(batch, batch_embeddings):
+                embeddings[i] = embedding
+        return embeddings
+
+    @staticmethod
+    async def _async_embed_documents(documents: List[Document], embedding_model: Optional[str],
+                                     batch_size: int) -> List[Document]:
+        """Return the documents with the missing embeddings filled by the async embedding client
+        of the embedding model, batches of `batch_size` texts are embedded concurrently.
+
+        The documents are returned unchanged if no embedding model is configured.
+        """
+        to_embed = [i for i, document in enumerate(documents) if len(document.embedding) == 0]
+        if not to_embed or embedding_model is None:
+            return documents
+        embedding_instance = EmbeddingManager().get_instance_obj(embedding_model)
+        batch_size = max(batch_size or 1, 1)
+        batches = [to_embed[start:start + batch_size] for start in range(0, len(to_embed), batch_size)]
+        batch_embeddings = await asyncio.gather(*[
+            embedding_instance.async_get_embeddings([documents[i].text for i in batch]) for batch in batches])
+        documents = list(documents)
+        for batch, embeddings in zip(batches, batch_embeddings):
+            for i, embedding in zip(batch, embeddings):
+                documents[i] = documents[i].model_copy(update={"embedding": embedding})
+        return documents
+
+    @staticmethod
+    def _write_in_batches(documents: List[Document], write_batch: Callable[[List[Document]], Any],
+                          batch_size: int, concurrency: int = 1):
+        """Split the documents into batches of `batch_size` and write them by `write_batch`, with at
+        most `concurrency` batches in flight. The first error of a batch is raised."""
+        batch_size = max(batch_size or 1, 1)
+        batches = [documents[start:start + batch_size] for start in range(0, len(documents), batch_size)]
+        if len(batches) <= 1 or concurrency <= 1:
+            for batch in batches:
+                write_batch(batch)
+            return
+        with ThreadPoolExecutorWithReturnValue(max_workers=min(concurrency, len(batches))) as executor:
+            futures = [executor.submit(write_batch, batch) for batch in batches]
+            for future in futures:
+                future.result()
 
     def create_copy(self):
         # TODO: Store copy need to solve thread lock problem
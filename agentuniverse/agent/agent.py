@@ -9,7 +9,6 @@ import json
 import uuid
 from abc import abstractmethod, ABC
 from datetime import datetime
-from threading import Thread
 from typing import Optional, Any, List
 
 from langchain_core.runnables import RunnableSerializable, RunnableConfig
@@ -43,6 +42,7 @@ from agentuniverse.base.context.framework_context_manager import \
     FrameworkContextManager
 from agentuniverse.base.util.agent_util import process_agent_llm_config
 from agentuniverse.base.util.common_util import stream_output
+from agentuniverse.base.util.executor_registry import ExecutorRegistry
 from agentuniverse.base.util.logging.logging_util import LOGGER
 from agentuniverse.base.util.memory_util import generate_messages, get_memory_string
 from agentuniverse.base.util.system_util import process_dict_with_funcs, is_system_builtin
@@ -545,19 +545,22 @@ class Agent(ComponentBase, ABC):
 
     def summarize_memory(self, agent_input: dict[str, Any] = {}, memory: Memory = None):
         def do_summarize(params):
-            content = memory.summarize_memory(**params)
-            memory.add([
-                Message(
-                    id=str(uuid.uuid4().hex),
-                    source=self.agent_model.info.get('name'),
-                    content=content,
-                    type='summarize'
-                )
-            ], session_id=params['session_id'], agent_id=params['agent_id'])
+            try:
+                content = memory.summarize_memory(**params)
+                memory.add([
+                    Message(
+                        id=str(uuid.uuid4().hex),
+                        source=self.agent_model.info.get('name'),
+                        content=content,
+                        type='summarize'
+                    )
+                ], session_id=params['session_id'], agent_id=params['agent_id'])
+            except Exception as e:
+                LOGGER.error(f"Summarize memory failed: {e}")
 
         if memory:
             params = self.get_memory_params(agent_input)
-            Thread(target=do_summarize, args=(params,)).start()
+            ExecutorRegistry().get_executor('memory_summarize', max_workers=4).submit(do_summarize, params)
 
     def load_summarize_memory(self, memory: Memory, agent_input: dict[str, Any] = {}) -> str:
         if memory:
@@ -589,5 +592,5 @@ class Agent(ComponentBase, ABC):
     def create_copy(self):
         copied = self.model_copy()
         if self.agent_model is not None:
-            copied.agent_model = self.agent_model.model_copy(deep=True)
+            copied.agent_model = self.agent_model.create_copy()
         return copied
@@ -8,6 +8,8 @@
 from typing import Optional
 from pydantic import BaseModel
 
+from agentuniverse.base.util.copy_util import copy_on_write, freeze_snapshot
+
 
 class AgentModel(BaseModel):
     """The parent class of all agent models, containing only attributes."""
@@ -18,6 +20,8 @@ class AgentModel(BaseModel):
     memory: Optional[dict] = dict()
     action: Optional[dict] = dict()
     work_pattern: Optional[dict] = dict()
+    # the frozen snapshots of the config dicts, shared by the copies of this model
+    _frozen_fields: Optional[dict] = None
 
     def llm_params(self) -> dict:
         """
@@ -33,3 +37,15 @@ class AgentModel(BaseModel):
             else:
                 params[key] = value
         return params
+
+    def create_copy(self) -> 'AgentModel':
+        """
+        Returns:
+            AgentModel: A copy sharing a frozen snapshot of the config dicts, which are copied on write.
+        """
+        # the config dicts of this model stay mutable, the snapshot is only frozen again once they changed
+        frozen_fields = self._frozen_fields or {}
+        snapshots = {name: freeze_snapshot(getattr(self, name), frozen_fields.get(name))
+                     for name in self.model_fields}
+        self._frozen_fields = snapshots
+        return self.model_copy(update={name: copy_on_write(snapshot) for name, snapshot in snapshots.items()})
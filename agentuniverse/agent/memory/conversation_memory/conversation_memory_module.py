@@ -6,25 +6,28 @@
 # @Email   : weizhongjie.wzj@antgroup.com
 # @FileName: conversation_memory_module.py
 
+import atexit
 import datetime
 import json
 import queue
+import threading
+import time
 import traceback
 import uuid
-from concurrent.futures.thread import ThreadPoolExecutor
 from threading import Thread
 from typing import List, Optional
 
 from agentuniverse.agent.agent_manager import AgentManager
 
 from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.memory.conversation_memory.conversation_memory_writer import ConversationMemoryWriter
 from agentuniverse.agent.memory.conversation_memory.conversation_message import ConversationMessage
 from agentuniverse.agent.memory.conversation_memory.enum import ConversationMessageSourceType
-from agentuniverse.agent.memory.memory_manager import MemoryManager
 from agentuniverse.agent.output_object import OutputObject
 from agentuniverse.base.annotation.singleton import singleton
 from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
 from agentuniverse.base.context.framework_context_manager import FrameworkContextManager
+from agentuniverse.base.util.executor_registry import ExecutorRegistry
 from agentuniverse.base.util.logging.logging_util import LOGGER
 
 
@@ -96,24 +99,25 @@ def generate_relation_str_en(source: str, target: str, source_type: str, target_
     return None
 
 
-def sync_to_sub_agent_memory(message: ConversationMessage, session_id: str, memory_name: str):
-    def add_message(agent_name: str, memory_names: list, collect_type: str):
+def get_sub_agent_memory_names(message: ConversationMessage) -> List[str]:
+    """Return the conversation memories of the agents on both ends of the message which collect it."""
+
+    def add_memory_name(agent_name: str, collect_type: str):
         agent_instance = AgentManager().get_instance_obj(agent_name)
         agent_memory = agent_instance.agent_model.memory.get('conversation_memory')
         collection_types = agent_instance.agent_model.memory.get('collection_types')
         if collection_types and collect_type not in collection_types:
             return
-        if agent_memory:
-            memory_instance = MemoryManager().get_instance_obj(agent_memory)
-            memory_instance.add([message], session_id=session_id)
+        if agent_memory and agent_memory not in memory_names:
             memory_names.append(agent_memory)
 
-    memory_names = [memory_name]
+    memory_names = []
     if message.source_type == ConversationMessageSourceType.AGENT.value:
-        add_message(message.source, memory_names, message.target_type)
+        add_memory_name(message.source, message.target_type)
 
     if message.target_type == ConversationMessageSourceType.AGENT.value:
-        add_message(message.target, memory_names, message.source_type)
+        add_memory_name(message.target, message.source_type)
+    return memory_names
 
 
 @singleton
@@ -127,22 +131,107 @@ class ConversationMemoryModule:
         self.collection_types = conversation_memory_configer.get('collection_types', ['agent', 'user'])
         self.conversation_format = conversation_memory_configer.get('conversation_format', 'cn')
         self.max_content_length = conversation_memory_configer.get('max_content_length', 8000)
-        self.queue = queue.Queue(1000)
-        self.thread_pool = ThreadPoolExecutor(max_workers=conversation_memory_configer.get('thread_pool', 4))
+        # The policy applied when the trace queue is full: `drop_new`, `drop_oldest` or `block`.
+        self.overflow_policy = conversation_memory_configer.get('overflow_policy', 'drop_new')
+        if self.overflow_policy not in ('drop_new', 'drop_oldest', 'block'):
+            raise ValueError(f"Unsupported conversation memory overflow policy: {self.overflow_policy}")
+        self.block_timeout = conversation_memory_configer.get('block_timeout', 1.0)
+        self.queue = queue.Queue(conversation_memory_configer.get('queue_size', 1000))
+        self.dropped_count = 0
+        self.__dropped_lock = threading.Lock()
+        self.writer = ConversationMemoryWriter(
+            flush_interval=conversation_memory_configer.get('flush_interval', 1.0),
+            batch_size=conversation_memory_configer.get('batch_size', 100),
+            max_pending=conversation_memory_configer.get('max_pending', 10000))
+        self.thread_pool = ExecutorRegistry().get_executor('conversation_memory',
+                                                           conversation_memory_configer.get('thread_pool', 4))
         Thread(target=self._consume_queue, daemon=True).start()
+        atexit.register(self.shutdown)
 
     def _consume_queue(self):
         while True:
             func = self.queue.get()
             try:
-                self.thread_pool.submit(func)
+                future = self.thread_pool.submit(func)
+                future.add_done_callback(lambda f: self.queue.task_done())
+            except RuntimeError:
+                # The pool is shut down at interpreter exit, run the remaining traces inline.
+                self._run_trace(func)
+                self.queue.task_done()
             except Exception as e:
                 LOGGER.error(f"Failed to process trace info: {e}")
                 # 打印详细堆栈信息
                 traceback.print_exc()
-            finally:
                 self.queue.task_done()
 
+    @staticmethod
+    def _run_trace(func) -> None:
+        try:
+            func()
+        except Exception as e:
+            LOGGER.error(f"Failed to process trace info: {e}")
+
+    def _enqueue(self, func) -> None:
+        """Put a trace into the queue, applying the overflow policy when the queue is full."""
+        try:
+            if self.overflow_policy == 'block':
+                self.queue.put(func, timeout=self.block_timeout)
+                return
+            self.queue.put_nowait(func)
+            return
+        except queue.Full:
+            if self.overflow_policy != 'drop_oldest':
+                self._record_dropped()
+                return
+        while True:
+            try:
+                self.queue.get_nowait()
+                self.queue.task_done()
+                self._record_dropped()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(func)
+                return
+            except queue.Full:
+                continue
+
+    def _record_dropped(self) -> None:
+        with self.__dropped_lock:
+            self.dropped_count += 1
+            dropped_count = self.dropped_count
+        if dropped_count == 1 or dropped_count % 1000 == 0:
+            LOGGER.warn(f"The conversation memory queue is full, {dropped_count} traces dropped in total.")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the queued traces to be processed, then write every pending message.
+
+        Args:
+            timeout(float): the max seconds to wait for the queued traces, None to wait until done.
+        Returns:
+            bool: whether every queued trace was processed in time.
+        """
+        done = True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    done = False
+                    break
+                self.queue.all_tasks_done.wait(remaining)
+        self.writer.flush()
+        return done
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Process the queued traces and write the pending messages, used at interpreter exit."""
+        self.flush(timeout)
+        self.writer.close()
+
+    def get_stats(self) -> dict:
+        """Return the queued and dropped trace counts and the stats of the memory writer."""
+        return {'queued': self.queue.qsize(), 'dropped_traces': self.dropped_count, **self.writer.get_stats()}
+
     def _add_trace_info(self, source: str,
                         source_type: str,
                         target: str,
@@ -207,11 +296,12 @@ class ConversationMemoryModule:
             },
             content=f"{content}"
         )
-        if self.instance_name:
-            memory = MemoryManager().get_instance_obj(self.instance_name)
-            if memory:
-                memory.add([message], session_id=kwargs.get('session_id'))
-        sync_to_sub_agent_memory(message, kwargs.get('session_id'), self.instance_name)
+        memory_names = [self.instance_name] if self.instance_name else []
+        for agent_memory in get_sub_agent_memory_names(message):
+            if agent_memory not in memory_names:
+                memory_names.append(agent_memory)
+        for memory_name in memory_names:
+            self.writer.append(memory_name, kwargs.get('session_id'), message)
 
     def _add_trace(self, start_info, target_info: dict, type: str, params: dict, session_id: str, trace_id: str,
                    pair_id: str):
@@ -243,7 +333,7 @@ class ConversationMemoryModule:
             self._add_trace(start_info, target_info, type, params, session_id,
                             trace_id, pair_id)
 
-        self.queue.put_nowait(add_trace)
+        self._enqueue(add_trace)
 
     def add_tool_input_info(self, start_info: dict, target: str, params: dict, pair_id: str, auto: bool = True):
         """Add trace info to the memory."""
@@ -329,7 +419,7 @@ class ConversationMemoryModule:
                 "type": "agent"
             }
             self._add_trace(target_info, start_info, 'output', params, session_id, trace_id, pair_id)
-        self.queue.put_nowait(add_trace)
+        self._enqueue(add_trace)
 
     def add_llm_input_info(self, start_info: dict, target: str, prompt: str, pair_id: str, auto=True):
         if not self.collection_current_agent_memory(start_info, 'llm', auto):
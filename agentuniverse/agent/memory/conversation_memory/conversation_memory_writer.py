@@ -0,0 +1,122 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 04:10
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: conversation_memory_writer.py
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from agentuniverse.agent.memory.memory_manager import MemoryManager
+from agentuniverse.agent.memory.message import Message
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+
+class ConversationMemoryWriter(object):
+    """The write-behind buffer of the conversation memory.
+
+    Messages appended to the writer are kept in memory and written by a background thread, either
+    every `flush_interval` seconds or as soon as `batch_size` messages are pending. The pending
+    messages are grouped by memory and session, so each group is written with a single
+    `Memory.add` call. When `max_pending` messages are pending, `append` blocks until the next
+    flush, pushing back on the producers instead of growing without a bound.
+    """
+
+    def __init__(self, flush_interval: float = 1.0, batch_size: int = 100, max_pending: int = 10000):
+        """Initialize the ConversationMemoryWriter and start its flush thread.
+
+        Args:
+            flush_interval(float): the max seconds a message stays pending
+            batch_size(int): the number of pending messages which triggers a flush
+            max_pending(int): the max number of pending messages
+        """
+        self.flush_interval: float = flush_interval
+        self.batch_size: int = batch_size
+        self.max_pending: int = max_pending
+        self.__pending: List[Tuple[str, Optional[str], Message]] = []
+        self.__condition = threading.Condition()
+        self.__write_lock = threading.Lock()
+        self.__closed: bool = False
+        self.__stats: Dict[str, int] = {'appended': 0, 'written': 0, 'failed': 0, 'dropped': 0, 'batches': 0}
+        self.__thread = threading.Thread(target=self.__run, name='conversation_memory_writer', daemon=True)
+        self.__thread.start()
+
+    def append(self, memory_name: str, session_id: Optional[str], message: Message) -> bool:
+        """Append a message to be written into the memory, return False if the writer is closed."""
+        with self.__condition:
+            while len(self.__pending) >= self.max_pending and not self.__closed:
+                self.__condition.notify_all()
+                self.__condition.wait()
+            if self.__closed:
+                self.__stats['dropped'] += 1
+                return False
+            self.__pending.append((memory_name, session_id, message))
+            self.__stats['appended'] += 1
+            if len(self.__pending) >= self.batch_size:
+                self.__condition.notify_all()
+        return True
+
+    def flush(self) -> None:
+        """Write every pending message on the calling thread."""
+        with self.__write_lock:
+            self.__write(self.__take_pending())
+
+    def close(self) -> None:
+        """Stop the flush thread and write the pending messages, later appends are dropped."""
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+        self.__thread.join()
+        self.flush()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return the appended, written, failed and dropped message counts, the number of
+        batches written and the number of pending messages."""
+        with self.__condition:
+            stats = dict(self.__stats)
+            stats['pending'] = len(self.__pending)
+        return stats
+
+    def __run(self) -> None:
+        while True:
+            with self.__condition:
+                deadline = time.monotonic() + self.flush_interval
+                while not self.__closed and len(self.__pending) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.__condition.wait(remaining)
+                if self.__closed:
+                    return
+            with self.__write_lock:
+                self.__write(self.__take_pending())
+
+    def __take_pending(self) -> List[Tuple[str, Optional[str], Message]]:
+        with self.__condition:
+            batch, self.__pending = self.__pending, []
+            self.__condition.notify_all()
+        return batch
+
+    def __write(self, batch: List[Tuple[str, Optional[str], Message]]) -> None:
+        # Called under the write lock, which is taken before the pending messages are taken, so the
+        # batches, and the messages of a session, are written in their append order.
+        if not batch:
+            return
+        groups: Dict[Tuple[str, Optional[str]], List[Message]] = {}
+        for memory_name, session_id, message in batch:
+            groups.setdefault((memory_name, session_id), []).append(message)
+        for (memory_name, session_id), messages in groups.items():
+            try:
+                memory = MemoryManager().get_instance_obj(memory_name)
+                if memory is None:
+                    raise ValueError(f'memory {memory_name} not found')
+                memory.add(messages, session_id=session_id)
+                result = 'written'
+            except Exception as e:
+                LOGGER.error(f"Failed to write {len(messages)} messages into memory {memory_name}: {e}")
+                result = 'failed'
+            with self.__condition:
+                self.__stats[result] += len(messages)
+                self.__stats['batches'] += 1
@@ -255,14 +255,25 @@ class SqliteMemoryStorage(MemoryStorage):
             return
 
         with self.session() as session:
+            # look up the existing messages in one query, then insert the new ones in a single commit
+            model_class = self.memory_converter.get_sql_model_class()
+            message_ids = [message.id for message in message_list if message.id]
+            existing_ids = set()
+            if message_ids:
+                existing_ids = {row[0] for row in session.query(getattr(model_class, 'message_id')).filter(
+                    getattr(model_class, 'message_id').in_(message_ids))}
+            new_models = []
             for message in message_list:
-                existing_message = session.query(self.memory_converter.get_sql_model_class()).filter_by(
-                    message_id=message.id).first()
-                if not existing_message:
-                    session.add(self.memory_converter.to_sql_model(message=message,
-                                                                   session_id=session_id if session_id else None,
-                                                                   agent_id=agent_id, **kwargs))
-            session.commit()
+                if message.id:
+                    if message.id in existing_ids:
+                        continue
+                    existing_ids.add(message.id)
+                new_models.append(self.memory_converter.to_sql_model(message=message,
+                                                                     session_id=session_id if session_id else None,
+                                                                     agent_id=agent_id, **kwargs))
+            if new_models:
+                session.add_all(new_models)
+                session.commit()
 
     def get(self, session_id: str = None, agent_id: str = None, top_k=20, trace_id: str = None, **kwargs) -> List[
         ConversationMessage]:
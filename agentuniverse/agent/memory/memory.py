@@ -5,7 +5,9 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: memory.py
-from typing import Optional, List
+from concurrent.futures import Future, wait
+from functools import partial
+from typing import Callable, Optional, List
 from langchain_core.memory import BaseMemory
 from pydantic import Extra
 
@@ -21,7 +23,9 @@ from agentuniverse.base.component.component_base import ComponentBase
 from agentuniverse.base.component.component_enum import ComponentEnum
 from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
 from agentuniverse.base.config.component_configer.configers.memory_configer import MemoryConfiger
-from agentuniverse.base.util.memory_util import get_memory_tokens, get_memory_string
+from agentuniverse.base.util.executor_registry import ExecutorRegistry
+from agentuniverse.base.util.logging.logging_util import LOGGER
+from agentuniverse.base.util.memory_util import get_message_tokens, get_memory_string
 
 
 class Memory(ComponentBase):
@@ -36,6 +40,10 @@ class Memory(ComponentBase):
         memory_compressor (Optional[str]): The name of the memory compressor instance.
         memory_storages (Optional[str]): The name list of the memory storage instances.
         memory_retrieval_storage (Optional[str]): The name of the memory retrieval storage instance.
+        storage_timeout (Optional[float]): The seconds to wait for each storage to add or delete messages,
+            a storage running longer is left to finish in the background, None to wait until done.
+        async_storages (Optional[List[str]]): The names of the secondary storages written without waiting,
+            the memory retrieval storage is always waited for.
     """
 
     name: Optional[str] = ""
@@ -47,6 +55,8 @@ class Memory(ComponentBase):
     memory_storages: Optional[List[str]] = ['ram_memory_storage']
     memory_retrieval_storage: Optional[str] = None
     summarize_agent_id: Optional[str] = 'memory_summarize_agent'
+    storage_timeout: Optional[float] = None
+    async_storages: Optional[List[str]] = None
 
     class Config:
         extra = Extra.allow
@@ -63,17 +73,60 @@ class Memory(ComponentBase):
         """Add messages to the memory."""
         if not message_list:
             return
-        for storage in self.memory_storages:
-            memory_storage: MemoryStorage = MemoryStorageManager().get_instance_obj(storage)
-            if memory_storage:
-                memory_storage.add(message_list, session_id, agent_id, **kwargs)
+        self._fan_out('add', lambda memory_storage: memory_storage.add(message_list, session_id, agent_id, **kwargs))
 
     def delete(self, session_id: str = None, **kwargs) -> None:
         """Delete messages from the memory."""
+        self._fan_out('delete', lambda memory_storage: memory_storage.delete(session_id, **kwargs))
+
+    def _fan_out(self, operation: str, func: Callable[[MemoryStorage], None]) -> None:
+        """Run the operation on every memory storage concurrently.
+
+        The storages run on the shared `memory_storage` executor, and the caller waits for all but
+        the async storages, up to `storage_timeout` seconds. The errors of every storage are logged,
+        and the first error raised by a waited storage is raised again.
+        """
+        storages = []
         for storage in self.memory_storages:
             memory_storage: MemoryStorage = MemoryStorageManager().get_instance_obj(storage)
             if memory_storage:
-                memory_storage.delete(session_id, **kwargs)
+                storages.append((storage, memory_storage))
+        if not storages:
+            return
+        if len(storages) == 1 and self.storage_timeout is None and not self._is_async_storage(storages[0][0]):
+            func(storages[0][1])
+            return
+
+        executor = ExecutorRegistry().get_executor('memory_storage')
+        waited_futures = {}
+        for storage, memory_storage in storages:
+            future = executor.submit(func, memory_storage)
+            if self._is_async_storage(storage):
+                future.add_done_callback(partial(self._log_storage_error, operation, storage))
+            else:
+                waited_futures[future] = storage
+        if not waited_futures:
+            return
+
+        done, not_done = wait(waited_futures, timeout=self.storage_timeout)
+        for future in not_done:
+            storage = waited_futures[future]
+            LOGGER.warn(f"Memory {self.name} {operation} on storage {storage} did not finish "
+                        f"in {self.storage_timeout}s, it keeps running in the background.")
+            future.add_done_callback(partial(self._log_storage_error, operation, storage))
+        failed_futures = [future for future in waited_futures if future in done and future.exception() is not None]
+        for future in failed_futures:
+            self._log_storage_error(operation, waited_futures[future], future)
+        if failed_futures:
+            raise failed_futures[0].exception()
+
+    def _is_async_storage(self, storage: str) -> bool:
+        return bool(self.async_storages) and storage in self.async_storages \
+            and storage != self.memory_retrieval_storage
+
+    def _log_storage_error(self, operation: str, storage: str, future: Future) -> None:
+        if future.exception() is not None:
+            LOGGER.error(f"Memory {self.name} {operation} on storage {storage} failed: {future.exception()}")
 
     def get(self, session_id: str = None, agent_id: str = None, prune: bool = False, **kwargs) -> List[Message]:
         """Get messages from the memory."""
@@ -99,16 +152,20 @@ class Memory(ComponentBase):
         new_memories = memories[:]
 
         agent_llm_name = self.agent_llm_name if hasattr(self, 'agent_llm_name') else None
-        tokens = get_memory_tokens(new_memories, agent_llm_name)
+        # The message token counts are cached, so the oldest messages are dropped off a running
+        # sum instead of tokenizing the remaining history again for every dropped message
+        token_counts = get_message_tokens(new_memories, agent_llm_name)
+        tokens = sum(token_counts)
 
         if tokens <= self.max_tokens:
             return new_memories
 
-        pruned_memories = []
-        while tokens > self.max_tokens:
-            pruned_memory = new_memories.pop(0)
-            pruned_memories.append(pruned_memory)
-            tokens = get_memory_tokens(new_memories, agent_llm_name)
+        pruned_count = 0
+        while tokens > self.max_tokens and pruned_count < len(new_memories):
+            tokens -= token_counts[pruned_count]
+            pruned_count += 1
+        pruned_memories = new_memories[:pruned_count]
+        new_memories = new_memories[pruned_count:]
 
         if pruned_memories:
             memory_compressor: MemoryCompressor = MemoryCompressorManager().get_instance_obj(self.memory_compressor)
@@ -173,10 +230,16 @@ class Memory(ComponentBase):
             self.memory_retrieval_storage = self.memory_storages[0]
         if component_configer.memory_summarize_agent:
             self.summarize_agent_id = component_configer.memory_summarize_agent
+        if component_configer.storage_timeout:
+            self.storage_timeout = component_configer.storage_timeout
+        if component_configer.async_storages:
+            self.async_storages = component_configer.async_storages
         return self
 
     def create_copy(self):
         copied = self.model_copy()
         if self.memory_storages is not None:
             copied.memory_storages = self.memory_storages.copy()
+        if self.async_storages is not None:
+            copied.async_storages = self.async_storages.copy()
         return copied
@@ -5,20 +5,45 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: ram_memory_storage.py
-from typing import Optional, List, Dict
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Optional, List, Dict, Deque
+
+from pydantic import Field, PrivateAttr
 
 from agentuniverse.agent.memory.memory_storage.memory_storage import MemoryStorage
 from agentuniverse.agent.memory.message import Message
+from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
 
 
 class RamMemoryStorage(MemoryStorage):
     """The ram memory storage class.
 
+    By default the storage is unbounded. Set `max_sessions` and/or `session_ttl` to evict the least
+    recently used and the idle sessions, and `max_session_messages` to keep only the latest messages
+    of each agent in a session, like a ring buffer. The sessions are kept in the access order and
+    each of them has its own lock, so request threads never mutate a message list concurrently.
+
     Attributes:
-        messages (dict[str, dict[str, list[Message]]]): The messages in the ram memory.
+        messages (dict[str, dict[str, deque[Message]]]): The messages in the ram memory.
+        max_sessions (Optional[int]): The max number of sessions kept, None for no limit.
+        session_ttl (Optional[float]): The seconds a session is kept since its last access, None for no limit.
+        max_session_messages (Optional[int]): The max number of messages kept for each agent of a
+            session, None for no limit.
     """
 
-    messages: Optional[Dict[str, Dict[str, List[Message]]]] = dict()
+    messages: Optional[Dict[str, Dict[str, Deque[Message]]]] = Field(default_factory=OrderedDict)
+    max_sessions: Optional[int] = None
+    session_ttl: Optional[float] = None
+    max_session_messages: Optional[int] = None
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _session_locks: Dict[str, threading.Lock] = PrivateAttr(default_factory=dict)
+    _last_access: Dict[str, float] = PrivateAttr(default_factory=dict)
+    _session_sizes: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _stats: Dict[str, int] = PrivateAttr(
+        default_factory=lambda: {'evicted_sessions': 0, 'expired_sessions': 0, 'dropped_messages': 0})
 
     def add(self, message_list: List[Message], session_id: str = '', agent_id: str = '', **kwargs) -> None:
         """Add messages to the memory db.
@@ -30,9 +55,21 @@ class RamMemoryStorage(MemoryStorage):
         """
         if not message_list:
             return
-        session = self.messages.setdefault(session_id, {})
-        agent_messages = session.setdefault(agent_id, [])
-        agent_messages.extend(message_list)
+        session, session_lock = self._get_session(session_id, create=True)
+        with session_lock:
+            agent_messages = session.setdefault(agent_id, deque())
+            size_delta = 0
+            dropped = 0
+            for message in message_list:
+                if self.max_session_messages and len(agent_messages) >= self.max_session_messages:
+                    size_delta -= self._message_size(agent_messages.popleft())
+                    dropped += 1
+                agent_messages.append(message)
+                size_delta += self._message_size(message)
+        with self._lock:
+            self._stats['dropped_messages'] += dropped
+            if session_id in self._session_sizes:
+                self._session_sizes[session_id] += size_delta
 
     def delete(self, session_id: str = None, agent_id: str = None, **kwargs) -> None:
         """Delete the memory from the database.
@@ -41,11 +78,21 @@ class RamMemoryStorage(MemoryStorage):
             session_id (str): The session id of the memory to delete.
             agent_id (str): The agent id of the memory to delete.
         """
-        if session_id is not None:
-            if agent_id is None:
-                self.messages.pop(session_id, None)
-            else:
-                self.messages.get(session_id, {}).pop(agent_id, None)
+        if session_id is None:
+            return
+        if agent_id is None:
+            with self._lock:
+                self._drop_session(session_id)
+            return
+        session, session_lock = self._get_session(session_id)
+        if session is None:
+            return
+        with session_lock:
+            removed = session.pop(agent_id, None) or []
+        size = sum(self._message_size(message) for message in removed)
+        with self._lock:
+            if session_id in self._session_sizes:
+                self._session_sizes[session_id] -= size
 
     def get(self, session_id: str = '', agent_id: str = '', top_k=10, **kwargs) -> \
             List[Message]:
@@ -59,5 +106,83 @@ class RamMemoryStorage(MemoryStorage):
         Returns:
             List[Message]: The list of aU messages.
         """
-        memories = self.messages.get(session_id, {}).get(agent_id, [])
+        session, session_lock = self._get_session(session_id)
+        if session is None:
+            return []
+        with session_lock:
+            memories = list(session.get(agent_id, ()))
         return memories[-top_k:]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return the session and message counts, the estimated size of the message contents in
+        characters, and the counts of the evicted sessions and dropped messages."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['sessions'] = len(self.messages)
+            stats['content_size'] = sum(self._session_sizes.values())
+            sessions = [(session, self._session_locks[session_id]) for session_id, session in self.messages.items()]
+        message_count = 0
+        for session, session_lock in sessions:
+            with session_lock:
+                message_count += sum(len(agent_messages) for agent_messages in session.values())
+        stats['messages'] = message_count
+        return stats
+
+    def _get_session(self, session_id: str, create: bool = False):
+        """Return the session and its lock, refreshing its access order, and evict the expired and
+        the least recently used sessions."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            session = self.messages.get(session_id)
+            if session is None:
+                if not create:
+                    return None, None
+                session = self.messages[session_id] = {}
+                self._session_locks[session_id] = threading.Lock()
+                self._session_sizes[session_id] = 0
+            self.messages.move_to_end(session_id)
+            self._last_access[session_id] = now
+            if create and self.max_sessions:
+                while len(self.messages) > self.max_sessions:
+                    self._drop_session(next(iter(self.messages)))
+                    self._stats['evicted_sessions'] += 1
+            return session, self._session_locks[session_id]
+
+    def _evict_expired(self, now: float) -> None:
+        # The sessions are kept in the access order, so the expired ones are at the head.
+        if not self.session_ttl:
+            return
+        while self.messages:
+            session_id = next(iter(self.messages))
+            if now - self._last_access[session_id] <= self.session_ttl:
+                break
+            self._drop_session(session_id)
+            self._stats['expired_sessions'] += 1
+
+    def _drop_session(self, session_id: str) -> None:
+        self.messages.pop(session_id, None)
+        self._session_locks.pop(session_id, None)
+        self._last_access.pop(session_id, None)
+        self._session_sizes.pop(session_id, None)
+
+    @staticmethod
+    def _message_size(message: Message) -> int:
+        return len(message.content) if isinstance(message.content, (str, list)) else 0
+
+    def _initialize_by_component_configer(self, memory_storage_config: ComponentConfiger) -> 'RamMemoryStorage':
+        """Initialize the RamMemoryStorage by the ComponentConfiger object.
+
+        Args:
+            memory_storage_config(ComponentConfiger): A configer contains ram_memory_storage basic info.
+        Returns:
+            RamMemoryStorage: A RamMemoryStorage instance.
+        """
+        super()._initialize_by_component_configer(memory_storage_config)
+        if getattr(memory_storage_config, 'max_sessions', None):
+            self.max_sessions = memory_storage_config.max_sessions
+        if getattr(memory_storage_config, 'session_ttl', None):
+            self.session_ttl = memory_storage_config.session_ttl
+        if getattr(memory_storage_config, 'max_session_messages', None):
+            self.max_session_messages = memory_storage_config.max_session_messages
+        return self
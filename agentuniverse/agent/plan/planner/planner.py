@@ -178,6 +178,9 @@ class Planner(ComponentBase):
     def stream_output(input_object: InputObject, data: dict):
         """Stream output.
 
+        The put blocks the calling thread while the output stream of an async request is full,
+        see `agentuniverse.base.util.common_util.stream_output`.
+
         Args:
             input_object (InputObject): Agent input object.
             data (dict): The data to be streamed.
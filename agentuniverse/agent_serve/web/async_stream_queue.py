@@ -0,0 +1,90 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 06:00
+# @Author  : fanen.lhy
+# @Email   : fanen.lhy@antgroup.com
+# @FileName: async_stream_queue.py
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Optional, Set
+
+
+class AsyncStreamQueue(asyncio.Queue):
+    """An asyncio queue of a response stream, which agents running in worker threads can write.
+
+    Once bound to the event loop of the stream, `put_nowait` called from another thread hands the
+    item over to the loop thread safely, so the stream consumer is woken up without polling. When
+    the queue is full, the producer thread blocks until the consumer catches up, which keeps the
+    memory of a slow stream bounded. After `close`, the blocked and later puts are dropped, so the
+    producers of a disconnected stream never hang.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        # Updated under the lock, since several producer threads may drop items at once.
+        self.dropped_count: int = 0
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__closed: bool = False
+        self.__thread_puts: Set[concurrent.futures.Future] = set()
+        self.__lock = threading.Lock()
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Bind the queue to the event loop which consumes it."""
+        self.__loop = loop
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    def put_nowait(self, item: Any) -> None:
+        """Put an item into the queue, blocking the calling thread while the queue is full if the
+        caller is not on the event loop of the queue."""
+        loop = self.__loop
+        if not self.__closed and (loop is None or self.__on_loop(loop)):
+            super().put_nowait(item)
+            return
+        with self.__lock:
+            if self.__closed:
+                self.dropped_count += 1
+                return
+            coroutine = self.__put_from_thread(item)
+            try:
+                future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+            except RuntimeError:
+                # the event loop is closed
+                coroutine.close()
+                self.dropped_count += 1
+                return
+            self.__thread_puts.add(future)
+        dropped = False
+        try:
+            future.result()
+        except concurrent.futures.CancelledError:
+            dropped = True
+        finally:
+            with self.__lock:
+                self.__thread_puts.discard(future)
+                if dropped:
+                    self.dropped_count += 1
+
+    def close(self) -> None:
+        """Stop accepting items and release the producer threads blocked on a full queue."""
+        with self.__lock:
+            self.__closed = True
+            futures = list(self.__thread_puts)
+        for future in futures:
+            future.cancel()
+
+    async def __put_from_thread(self, item: Any) -> None:
+        if self.__closed:
+            raise asyncio.CancelledError()
+        await self.put(item)
+
+    @staticmethod
+    def __on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
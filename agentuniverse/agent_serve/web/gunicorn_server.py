@@ -10,10 +10,11 @@ import tomli
 from gunicorn.app.base import BaseApplication
 
 from .flask_server import app
-from .post_fork_queue import POST_FORK_QUEUE
+from .post_fork_queue import execute_post_fork
 from ...base.annotation.singleton import singleton
 from ...base.context.framework_context_manager import FrameworkContextManager
 from agentuniverse.base.tracing.au_trace_manager import AuTraceManager
+from agentuniverse.base.util.executor_registry import ExecutorRegistry
 
 DEFAULT_GUNICORN_CONFIG = {
     'bind': '127.0.0.1:8888',
@@ -28,8 +29,12 @@ DEFAULT_GUNICORN_CONFIG = {
 
 # Execute all func in the queue after fork chile process.
 def post_fork(server, worker):
-    for _func, args, kwargs in POST_FORK_QUEUE:
-        _func(*args, **kwargs)
+    execute_post_fork()
+
+
+# Wait for the tasks of the shared thread pools before the worker process exits.
+def worker_exit(server, worker):
+    ExecutorRegistry().shutdown()
 
 
 class ContextVarResetMiddleware:
@@ -72,8 +77,9 @@ class GunicornApplication(BaseApplication):
             if key in self.cfg.settings and value is not None:
                 self.cfg.set(key.lower(), value)
 
-        # Set post fork.
+        # Set post fork and worker exit.
         self.cfg.set('post_fork', post_fork)
+        self.cfg.set('worker_exit', worker_exit)
 
     def update_config(self, options: dict):
         self.options = options
@@ -10,15 +10,32 @@ from typing import List, Tuple, Callable, Any
 
 FunctionWithArgs = Tuple[Callable, Tuple[Any, ...], dict]
 POST_FORK_QUEUE: List[FunctionWithArgs] = []
+_POST_FORK_EXECUTED = False
 
 
 def add_post_fork(func: Callable, *args: Any, **kwargs: Any) -> None:
     """
     Add func and parameters into a waiting list, all of them will be executed
     after gunicorn worker child processes have been forked, or before flask
-    main app start if you work without gunicorn.
+    main app start if you work without gunicorn. A func added after the
+    waiting list has been executed, like the one of a lazily built component,
+    is executed at once.
     """
 
+    if _POST_FORK_EXECUTED:
+        func(*args, **kwargs)
+        return
     POST_FORK_QUEUE.append((func, args, kwargs))
 
 
+def execute_post_fork() -> None:
+    """Execute all funcs in the waiting list in current process."""
+    global _POST_FORK_EXECUTED
+    for _func, args, kwargs in POST_FORK_QUEUE:
+        _func(*args, **kwargs)
+    _POST_FORK_EXECUTED = True
+
+
+def is_post_fork_executed() -> bool:
+    """Whether the waiting list has been executed in current process."""
+    return _POST_FORK_EXECUTED
@@ -20,6 +20,7 @@ from typing import Optional, AsyncIterator
 from flask import copy_current_request_context
 from loguru import logger
 
+from .async_stream_queue import AsyncStreamQueue
 from .dal.request_library import RequestLibrary
 from .dal.entity.request_do import RequestDO
 from .thread_with_result import ThreadWithReturnValue
@@ -72,7 +73,7 @@ class RequestTask:
         self.saved = saved
         self.last_update_time = time.time()
         self.__request_do__ = self.add_request_do()
-        self.async_queue = asyncio.Queue(maxsize=2000)
+        self.async_queue = AsyncStreamQueue(maxsize=2000)
         self.async_task = None
 
     def update_request_do(self, force: bool = False):
@@ -170,30 +171,69 @@ class RequestTask:
             yield "data:" + json.dumps({"error": {"error_msg": str(e)}}) + "\n\n "
 
     async def async_receive_steps(self) -> AsyncIterator[str]:
+        """Yield the stream data as soon as it is put into the async queue.
+
+        If the stream is closed before the end, e.g. on a client disconnect, the
+        running task is cancelled and the request task goes to canceled state.
+        """
         self.next_state(TaskStateEnum.RUNNING)
         first_chunk = True
         start_time = time.time()
+        completed = False
+        try:
+            async for output in self._async_outputs():
+                if first_chunk:
+                    first_chunk = False
+                    cost_time = time.time() - start_time
+                    logger.bind(
+                        log_type=LogTypeEnum.agent_first_token,
+                        cost_time=cost_time,
+                        context_prefix=get_context_prefix()
+                    ).info("LLM first token generated.")
+                yield "data:" + json.dumps({"process": output},
+                                           ensure_ascii=False) + "\n\n"
+            async for item in self._async_result():
+                yield item
+            completed = True
+        finally:
+            self.async_queue.close()
+            if not completed:
+                self._cancel_async_task()
+
+    async def _async_outputs(self) -> AsyncIterator[str]:
+        """Yield the outputs of the async queue until the EOF, or until the
+        task is done and the queue drained, without polling."""
         while True:
-            try:
-                output: str = await asyncio.wait_for(self.async_queue.get(), timeout=0.5)
-            except asyncio.TimeoutError:
-                await asyncio.sleep(1)
-                print("Waiting for data timed out. Retrying...")
-                continue
-            if output is None:
-                break
-            if output == EOF_SIGNAL:
-                break
-            if first_chunk:
-                first_chunk = False
-                cost_time = time.time() - start_time
-                logger.bind(
-                    log_type=LogTypeEnum.agent_first_token,
-                    cost_time=cost_time,
-                    context_prefix=get_context_prefix()
-                ).info("LLM first token generated.")
-            yield "data:" + json.dumps({"process": output},
-                                       ensure_ascii=False) + "\n\n"
+            if self.async_task is not None and self.async_task.done():
+                if self.async_queue.empty():
+                    return
+                output = self.async_queue.get_nowait()
+            else:
+                getter = asyncio.ensure_future(self.async_queue.get())
+                try:
+                    waiters = {getter} if self.async_task is None else {getter, self.async_task}
+                    await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    if not getter.done():
+                        getter.cancel()
+                if getter.cancelled() or not getter.done():
+                    continue
+                output = getter.result()
+            if output is None or output == EOF_SIGNAL:
+                return
+            yield output
+
+    def _cancel_async_task(self):
+        """Cancel the running task of an unfinished stream."""
+        if self.async_task is not None and not self.async_task.done():
+            self.async_task.cancel()
+        if self.__request_do__.state == TaskStateEnum.RUNNING.value:
+            self.next_state(TaskStateEnum.CANCELED)
+            if self.saved:
+                self.update_request_do(force=True)
+
+    async def _async_result(self) -> AsyncIterator[str]:
+        """Yield the result of the finished async task."""
         try:
             if self.canceled():
                 self.__request_do__.result['result'] = {
@@ -271,7 +311,8 @@ class RequestTask:
 
     async def async_stream_run(self) -> AsyncIterator[str]:
         self.kwargs['output_stream'] = self.async_queue
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
+        self.async_queue.bind_loop(loop)
         self.async_task = loop.create_task(self.func(**self.kwargs))
         async for item in self.async_receive_steps():
             yield item
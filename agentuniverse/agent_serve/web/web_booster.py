@@ -9,7 +9,7 @@
 import sys
 import threading
 
-from .post_fork_queue import POST_FORK_QUEUE
+from .post_fork_queue import execute_post_fork
 
 ACTIVATE_OPTIONS = {
     "gunicorn": False,
@@ -46,6 +46,5 @@ def start_web_server(**kwargs):
         else:
             port = 8888
             host = '0.0.0.0'
-        for _func, args, kwargs in POST_FORK_QUEUE:
-            _func(*args, **kwargs)
+        execute_post_fork()
         app.run(port=port, host=host, debug=False)
@@ -6,9 +6,11 @@
 # @Email   : jerry.zzw@antgroup.com
 # @FileName: agentuniverse.py
 import importlib
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Dict, Tuple, Optional
 
 from agentuniverse.agent_serve.web.mcp.mcp_server_manager import \
     MCPServerManager
@@ -19,6 +21,7 @@ from agentuniverse.base.config.application_configer.app_configer import AppConfi
 from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
 from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
 from agentuniverse.base.component.component_configer_util import ComponentConfigerUtil
+from agentuniverse.base.config.config_scan_cache import ConfigScanCache
 from agentuniverse.base.config.config_type_enum import ConfigTypeEnum
 from agentuniverse.base.config.configer import Configer
 from agentuniverse.base.config.custom_configer.default_llm_configer import DefaultLLMConfiger
@@ -31,10 +34,16 @@ from agentuniverse.base.util.logging.logging_util import init_loggers
 from agentuniverse.agent_serve.web.request_task import RequestLibrary
 from agentuniverse.agent_serve.web.rpc.grpc.grpc_server_booster import set_grpc_config
 from agentuniverse.agent_serve.web.web_booster import ACTIVATE_OPTIONS
-from agentuniverse.agent_serve.web.post_fork_queue import POST_FORK_QUEUE
+from agentuniverse.agent_serve.web.post_fork_queue import execute_post_fork
 from agentuniverse.agent_serve.web.web_util import FlaskServerManager
 from agentuniverse.base.tracing.otel.telemetry_manager import TelemetryManager
 
+# Components which can not be registered lazily: prompts, channels and workflows are looked up by
+# their version, channel name or id, and log sinks take effect when they are built.
+LAZY_UNSUPPORTED_COMPONENT_ENUMS = (ComponentEnum.PROMPT, ComponentEnum.LLM_CHANNEL,
+                                    ComponentEnum.WORKFLOW, ComponentEnum.LOG_SINK)
+
+
 @singleton
 class AgentUniverse(object):
     """AgentUniverse framework object, responsible for the framework initialization,
@@ -59,6 +68,9 @@ class AgentUniverse(object):
         self.__system_default_memory_storage_package = ['agentuniverse.agent.memory.memory_storage']
         self.__system_default_work_pattern_package = ['agentuniverse.agent.work_pattern']
         self.__system_default_log_sink_package = ['agentuniverse.base.util.logging.log_sink.log_sink']
+        self.__scan_max_workers = min(32, (os.cpu_count() or 1) + 4)
+        self.__config_scan_cache: Optional[ConfigScanCache] = None
+        self.__lazy_component_enums: List[ComponentEnum] = []
 
     def start(self, config_path: str = None, core_mode: bool = False):
         """Start the agentUniverse framework.
@@ -132,11 +144,33 @@ class AgentUniverse(object):
         # init monitor module
         Monitor(configer=configer)
 
+        # init the persistent component config scan cache
+        scan_cache_activate = configer.value.get('SCAN_CACHE', {}).get('activate')
+        if scan_cache_activate and scan_cache_activate.lower() == 'true':
+            scan_cache_path = self.__parse_sub_config_path(
+                configer.value.get('SCAN_CACHE', {}).get('cache_path') or './.au_scan_cache',
+                config_path)
+            self.__config_scan_cache = ConfigScanCache(scan_cache_path).load()
+
+        # init the lazy registration, components of these types are built on the first lookup
+        lazy_registration_activate = configer.value.get('LAZY_REGISTRATION', {}).get('activate')
+        if lazy_registration_activate and lazy_registration_activate.lower() == 'true':
+            lazy_component_types = configer.value.get('LAZY_REGISTRATION', {}).get(
+                'component_types', ['agent', 'tool', 'knowledge', 'store'])
+            self.__lazy_component_enums = [ComponentEnum.from_value(component_type.upper())
+                                           for component_type in lazy_component_types]
+            unsupported_enums = [component_enum.value for component_enum in self.__lazy_component_enums
+                                 if component_enum in LAZY_UNSUPPORTED_COMPONENT_ENUMS]
+            if unsupported_enums:
+                raise ValueError(f"LAZY_REGISTRATION does not support the component types {unsupported_enums}, "
+                                 f"they are looked up by another key than their name or take effect when built.")
+
         # scan and register the components
         self.__scan_and_register(self.__config_container.app_configer)
+        if self.__config_scan_cache:
+            self.__config_scan_cache.save()
         if core_mode:
-            for _func, args, kwargs in POST_FORK_QUEUE:
-                _func(*args, **kwargs)
+            execute_post_fork()
 
     def __scan_and_register(self, app_configer: AppConfiger):
         """Scan the component directory and register the components.
@@ -210,11 +244,20 @@ class AgentUniverse(object):
             ComponentEnum.LLM_CHANNEL: core_llm_channel_package_list
         }
 
+        # parse every config file under all the packages only once, then bucket by component type
+        all_package_list = []
+        for package_list in component_package_map.values():
+            for package_name in package_list or []:
+                if package_name not in all_package_list:
+                    all_package_list.append(package_name)
+        package_configer_map = self.__load_package_configers(all_package_list, ConfigTypeEnum.YAML)
+
         component_configer_list_map = {}
         for component_enum, package_list in component_package_map.items():
             if not package_list:
                 continue
-            component_configer_list = self.scan(package_list, ConfigTypeEnum.YAML, component_enum)
+            component_configer_list = self.scan(package_list, ConfigTypeEnum.YAML, component_enum,
+                                                package_configer_map)
             component_configer_list_map[component_enum] = component_configer_list
 
         for component_enum, component_configer_list in component_configer_list_map.items():
@@ -223,13 +266,16 @@ class AgentUniverse(object):
     def scan(self,
              package_list: [str],
              config_type_enum: ConfigTypeEnum,
-             component_enum: ComponentEnum) -> list:
+             component_enum: ComponentEnum,
+             package_configer_map: Dict[str, List[Tuple[ComponentConfiger, str]]] = None) -> list:
         """Scan the component directory and return certain component configer list.
 
         Args:
             package_list(list): the package list
             config_type_enum(ConfigTypeEnum): the configuration file type enumeration
             component_enum(ComponentEnum): the component enumeration
+            package_configer_map(dict): the parsed configers of each package, the packages
+                missing in it will be parsed on demand.
 
         Returns:
             list: the component configer list
@@ -247,19 +293,68 @@ class AgentUniverse(object):
                 if default_llm_configer and default_llm_configer.default_llm:
                     self.__config_container.app_configer.agent_llm_set.add(default_llm_configer.default_llm)
 
+        package_configer_map = package_configer_map or {}
+        missing_package_list = [package_name for package_name in package_list
+                                if package_name not in package_configer_map]
+        if missing_package_list:
+            package_configer_map = {**package_configer_map,
+                                    **self.__load_package_configers(missing_package_list, config_type_enum)}
+
         for package_name in package_list:
-            package_path = self.__package_name_to_path(package_name)
-            path = Path(package_path)
-            config_files = path.rglob(f'*.{config_type_enum.value}')
-            for config_file in config_files:
-                config_file_str = str(config_file)
-                configer = Configer(path=config_file_str).load()
-                component_configer = ComponentConfiger().load_by_configer(configer)
-                component_config_type = component_configer.get_component_config_type()
+            for component_configer, component_config_type in package_configer_map[package_name]:
                 if component_config_type == component_enum.value:
                     component_configer_list.append(component_configer)
         return component_configer_list
 
+    def __load_package_configers(self, package_list: List[str], config_type_enum: ConfigTypeEnum) \
+            -> Dict[str, List[Tuple[ComponentConfiger, str]]]:
+        """Parse all the config files under the given packages in a thread pool.
+
+        A config file shared by several packages is parsed only once.
+
+        Args:
+            package_list(list): the package list
+            config_type_enum(ConfigTypeEnum): the configuration file type enumeration
+
+        Returns:
+            dict: the package name to the list of (component configer, component type) pairs,
+                in the order of the scanned files.
+        """
+        package_file_map = {}
+        for package_name in package_list:
+            package_path = self.__package_name_to_path(package_name)
+            config_files = Path(package_path).rglob(f'*.{config_type_enum.value}')
+            package_file_map[package_name] = [str(config_file) for config_file in config_files]
+
+        config_file_list = list(dict.fromkeys(
+            config_file for config_files in package_file_map.values() for config_file in config_files))
+        with ThreadPoolExecutor(max_workers=self.__scan_max_workers) as executor:
+            parsed_configers = dict(zip(config_file_list, executor.map(self.__parse_config_file, config_file_list)))
+
+        return {package_name: [parsed_configers[config_file] for config_file in config_files]
+                for package_name, config_files in package_file_map.items()}
+
+    def __parse_config_file(self, config_file: str) -> Tuple[ComponentConfiger, str]:
+        """Parse a config file and resolve its component type, through the scan cache if activated.
+
+        Args:
+            config_file(str): the config file path
+
+        Returns:
+            tuple: the component configer and its component type
+        """
+        if not self.__config_scan_cache:
+            configer = Configer(path=config_file).load()
+            component_configer = ComponentConfiger().load_by_configer(configer)
+            return component_configer, component_configer.get_component_config_type()
+
+        configer, component_config_type = self.__config_scan_cache.load_configer(config_file)
+        component_configer = ComponentConfiger().load_by_configer(configer)
+        if component_config_type is None:
+            component_config_type = component_configer.get_component_config_type()
+            self.__config_scan_cache.set_component_type(config_file, component_config_type)
+        return component_configer, component_config_type
+
     def __register(self, component_enum: ComponentEnum, component_configer_list: list[ComponentConfiger]):
         """Register the components.
 
@@ -319,6 +414,10 @@ class AgentUniverse(object):
                         self.__config_container.app_configer.toolkit_configer_map[
                             configer_instance.name] = configer_instance
                         continue
+            lazy_instance_name = self.__get_lazy_instance_name(component_enum, configer_instance)
+            if lazy_instance_name:
+                component_manager_clz().register_configer(lazy_instance_name, configer_instance)
+                continue
             component_clz = ComponentConfigerUtil.get_component_object_clz_by_component_configer(configer_instance)
             component_instance: ComponentBase = component_clz().initialize_by_component_configer(configer_instance)
             if component_instance is None:
@@ -326,6 +425,28 @@ class AgentUniverse(object):
             component_instance.component_config_path = component_configer.configer.path
             component_manager_clz().register(component_instance.get_instance_code(), component_instance)
 
+    def __get_lazy_instance_name(self, component_enum: ComponentEnum,
+                                 configer_instance: ComponentConfiger) -> Optional[str]:
+        """Return the instance name of a lazily registered component, or None if it should be built now.
+
+        Args:
+            component_enum(ComponentEnum): the component enumeration
+            configer_instance(ComponentConfiger): the component configer
+
+        Returns:
+            Optional[str]: the instance name of the component
+        """
+        if component_enum not in self.__lazy_component_enums:
+            return None
+        if component_enum.value == ComponentEnum.AGENT.value:
+            name = (getattr(configer_instance, 'info', None) or {}).get('name')
+        else:
+            name = getattr(configer_instance, 'name', None)
+        if not name:
+            return None
+        appname = self.__config_container.app_configer.base_info_appname
+        return f'{appname}.{component_enum.value.lower()}.{name}'
+
     def __package_name_to_path(self, package_name: str) -> str:
         """Convert the package name to the package path.
 
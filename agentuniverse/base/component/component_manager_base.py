@@ -5,12 +5,13 @@
 # @Author  : jerry.zzw 
 # @Email   : jerry.zzw@antgroup.com
 # @FileName: component_manager_base.py
-import copy
-from typing import TypeVar, Generic
+import threading
+from typing import TypeVar, Generic, Optional
 
 from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
 from agentuniverse.base.component.component_base import ComponentBase
 from agentuniverse.base.component.component_enum import ComponentEnum
+from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
 from agentuniverse.base.util.logging.logging_util import LOGGER
 from agentuniverse.base.util.system_util import is_system_builtin
 
@@ -26,6 +27,11 @@ class ComponentManagerBase(Generic[ComponentTypeVar]):
         # The component pool map, which is used to store the component instance.
         # _instance_obj_map - Format: {component_instance_name: component_instance_obj}.
         self._instance_obj_map: dict[str, ComponentTypeVar] = {}
+        # The lazily registered component configer map, the instance is built on the first lookup.
+        # _configer_map - Format: {component_instance_name: component_configer}.
+        self._configer_map: dict[str, ComponentConfiger] = {}
+        self._default_configer_name: Optional[str] = None
+        self._build_lock = threading.RLock()
         self._component_type: ComponentEnum = component_type
 
     def register(self, component_instance_name: str, component_instance_obj: ComponentTypeVar):
@@ -42,10 +48,43 @@ class ComponentManagerBase(Generic[ComponentTypeVar]):
         if component_instance_obj.default_symbol:
             self._instance_obj_map["__default_instance__"] = component_instance_obj
 
+    def register_configer(self, component_instance_name: str, component_configer: ComponentConfiger):
+        """Register the component configer, the component instance is built on the first lookup."""
+        if component_instance_name in self._instance_obj_map or component_instance_name in self._configer_map:
+            LOGGER.warn(f"{self._component_type.value} component with name "
+                        f"'{component_instance_name}' already exists.")
+            return
+        self._configer_map[component_instance_name] = component_configer
+        if getattr(component_configer, 'default_symbol', False):
+            self._default_configer_name = component_instance_name
+
     def unregister(self, component_instance_name: str):
         """Unregister the component instance abstractmethod."""
+        if self._configer_map.pop(component_instance_name, None) is not None:
+            return
         self._instance_obj_map.pop(component_instance_name)
 
+    def _get_or_build_instance_obj(self, component_instance_name: str) -> Optional[ComponentTypeVar]:
+        """Return the registered component instance, build it first if only its configer is registered."""
+        instance = self._instance_obj_map.get(component_instance_name)
+        if instance is not None or component_instance_name not in self._configer_map:
+            return instance
+        with self._build_lock:
+            component_configer = self._configer_map.get(component_instance_name)
+            if component_configer is None:
+                return self._instance_obj_map.get(component_instance_name)
+            from agentuniverse.base.component.component_configer_util import ComponentConfigerUtil
+            component_clz = ComponentConfigerUtil.get_component_object_clz_by_component_configer(component_configer)
+            instance = component_clz().initialize_by_component_configer(component_configer)
+            self._configer_map.pop(component_instance_name)
+            if instance is None:
+                return None
+            instance.component_config_path = component_configer.configer.path
+            self._instance_obj_map[component_instance_name] = instance
+            if instance.default_symbol:
+                self._instance_obj_map["__default_instance__"] = instance
+            return instance
+
     def get_instance_obj(self, component_instance_name: str,
                          appname: str = None, new_instance: bool = True) -> ComponentTypeVar:
         """Return the component instance object."""
@@ -53,22 +92,26 @@ class ComponentManagerBase(Generic[ComponentTypeVar]):
             return self.get_default_instance(new_instance)
         appname = appname or ApplicationConfigManager().app_configer.base_info_appname
         instance_code = f'{appname}.{self._component_type.value.lower()}.{component_instance_name}'
-        if new_instance:
-            instance = self._instance_obj_map.get(instance_code)
-            if instance:
-                return instance.create_copy()
-        return self._instance_obj_map.get(instance_code)
+        instance = self._get_or_build_instance_obj(instance_code)
+        if new_instance and instance:
+            return instance.create_copy()
+        return instance
 
     def get_default_instance(self, new_instance: bool = False) -> ComponentTypeVar:
         """Return the default instance of component."""
-        if new_instance:
-            return copy.deepcopy(self._instance_obj_map.get("__default_instance__"))
-        return self._instance_obj_map.get("__default_instance__")
+        if "__default_instance__" not in self._instance_obj_map and self._default_configer_name:
+            self._get_or_build_instance_obj(self._default_configer_name)
+        instance = self._instance_obj_map.get("__default_instance__")
+        if new_instance and instance:
+            return instance.create_copy()
+        return instance
 
     def get_instance_name_list(self) -> list[str]:
         """Return the component instance list."""
-        return list(self._instance_obj_map.keys())
+        return list(self._instance_obj_map.keys()) + list(self._configer_map.keys())
 
     def get_instance_obj_list(self) -> list[ComponentTypeVar]:
-        """Return the component instance object list."""
+        """Return the component instance object list, the lazily registered components are built."""
+        for component_instance_name in list(self._configer_map.keys()):
+            self._get_or_build_instance_obj(component_instance_name)
         return list(self._instance_obj_map.values())
@@ -46,6 +46,7 @@ class AppConfiger(object):
         self.__core_log_sink_package_list: Optional[list[str]] = None
         self.__core_llm_channel_package_list: Optional[list[str]] = None
         self.__conversation_memory_configer: Optional[dict] = {}
+        self.__executor_configer: Optional[dict] = {}
         self.__root_package_name: Optional[str] = None
         self.__yaml_func_instance = None
         self.__default_llm_configer: DefaultLLMConfiger = None
@@ -183,6 +184,11 @@ class AppConfiger(object):
     def conversation_memory_configer(self) -> dict:
         return self.__conversation_memory_configer
 
+    @property
+    def executor_configer(self) -> dict:
+        """Return the worker counts of the shared executors, keyed by the executor name."""
+        return self.__executor_configer
+
     @property
     def root_package_name(self) -> str:
         return self.__root_package_name
@@ -296,5 +302,6 @@ class AppConfiger(object):
         self.__core_log_sink_package_list = configer.value.get('CORE_PACKAGE', {}).get('log_sink')
         self.__core_llm_channel_package_list = configer.value.get('CORE_PACKAGE', {}).get('llm_channel')
         self.__conversation_memory_configer = configer.value.get('CONVERSATION_MEMORY', {})
+        self.__executor_configer = configer.value.get('EXECUTOR', {})
         self.__llm_plugins = self.load_llm_plugins(configer.value.get("PLUGINS", {}).get("llm_plugins", []))
         return self
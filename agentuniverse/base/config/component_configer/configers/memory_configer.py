@@ -26,6 +26,8 @@ class MemoryConfiger(ComponentConfiger):
         self.__memory_storages: Optional[List[str]] = None
         self.__memory_retrieval_storage: Optional[str] = None
         self.__memory_summarize_agent: Optional[str] = None
+        self.__storage_timeout: Optional[float] = None
+        self.__async_storages: Optional[List[str]] = None
 
     @property
     def name(self) -> Optional[str]:
@@ -72,6 +74,16 @@ class MemoryConfiger(ComponentConfiger):
         """Return the summarize agent of the Memory."""
         return self.__memory_summarize_agent
 
+    @property
+    def storage_timeout(self) -> Optional[float]:
+        """Return the seconds the Memory waits for each storage write."""
+        return self.__storage_timeout
+
+    @property
+    def async_storages(self) -> Optional[List[str]]:
+        """Return the storages of the Memory written without waiting."""
+        return self.__async_storages
+
     def load(self) -> 'MemoryConfiger':
         """Load the configuration by the Configer object.
         Returns:
@@ -98,6 +110,8 @@ class MemoryConfiger(ComponentConfiger):
             self.__memory_storages = configer.value.get('memory_storages')
             self.__memory_retrieval_storage = configer.value.get('memory_retrieval_storage')
             self.__memory_summarize_agent = configer.value.get('memory_summarize_agent')
+            self.__storage_timeout = configer.value.get('storage_timeout')
+            self.__async_storages = configer.value.get('async_storages')
         except Exception as e:
             raise Exception(f"Failed to parse the Memory configuration: {e}")
         return self
@@ -0,0 +1,128 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 14:05
+# @Author  : jerry.zzw
+# @Email   : jerry.zzw@antgroup.com
+# @FileName: config_scan_cache.py
+import os
+import pickle
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+
+from agentuniverse.base.config.configer import Configer
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+
+class ConfigScanCache(object):
+    """The ConfigScanCache class, which persists the parsed component config files on disk.
+
+    Each entry is keyed by the config file path and validated by the file mtime and size, so
+    only the changed files are parsed again after a restart. The raw yaml value is cached
+    instead of the resolved one, placeholders like `${ENV_KEY}` are still resolved on load
+    and no secret is written to the cache file.
+    """
+
+    # Bump the version when the layout of the cache entries changes.
+    __CACHE_VERSION = 1
+
+    def __init__(self, cache_path: str):
+        """Initialize the ConfigScanCache.
+
+        Args:
+            cache_path(str): the path of the cache file
+        """
+        self.__cache_path: str = cache_path
+        # config file path -> (mtime_ns, size, raw value, component type)
+        self.__entries: Dict[str, Tuple[int, int, dict, Optional[str]]] = {}
+        self.__lock = threading.Lock()
+        self.__dirty: bool = False
+        self.__hits: int = 0
+        self.__misses: int = 0
+
+    @property
+    def cache_path(self) -> str:
+        """Return the path of the cache file."""
+        return self.__cache_path
+
+    @property
+    def hits(self) -> int:
+        """Return the count of the config files loaded from the cache."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """Return the count of the config files parsed from the disk."""
+        return self.__misses
+
+    def load(self) -> 'ConfigScanCache':
+        """Load the cache file, an unreadable or outdated cache file is ignored.
+
+        Returns:
+            ConfigScanCache: the ConfigScanCache object
+        """
+        if not os.path.isfile(self.__cache_path):
+            return self
+        try:
+            with open(self.__cache_path, 'rb') as f:
+                data = pickle.load(f)
+            if isinstance(data, dict) and data.get('version') == self.__CACHE_VERSION:
+                self.__entries = data.get('entries', {})
+        except Exception as e:
+            LOGGER.warn(f"Config scan cache {self.__cache_path} read error, skip it. Error is {str(e)}")
+        return self
+
+    def save(self) -> None:
+        """Write the cache file atomically if any entry changed, entries of the deleted config files
+        are dropped."""
+        with self.__lock:
+            if not self.__dirty:
+                return
+            entries = {path: entry for path, entry in self.__entries.items() if os.path.isfile(path)}
+            self.__dirty = False
+        cache_dir = os.path.dirname(os.path.abspath(self.__cache_path))
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # write to a temp file then replace, so that concurrent workers never read a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix='.au_scan_cache_')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({'version': self.__CACHE_VERSION, 'entries': entries}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.__cache_path)
+        except Exception as e:
+            LOGGER.warn(f"Config scan cache {self.__cache_path} write error, skip it. Error is {str(e)}")
+
+    def load_configer(self, path: str) -> Tuple[Configer, Optional[str]]:
+        """Load the Configer of the config file, and the component type recorded for it.
+
+        Args:
+            path(str): the path of the config file
+        Returns:
+            tuple: the Configer object, and the cached component type or None on a cache miss
+        """
+        stat = os.stat(path)
+        entry = self.__entries.get(path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            with self.__lock:
+                self.__hits += 1
+            return Configer(path=path).load_by_raw_value(entry[2]), entry[3]
+        configer = Configer(path=path).load()
+        with self.__lock:
+            self.__misses += 1
+            self.__entries[path] = (stat.st_mtime_ns, stat.st_size, configer.raw_value, None)
+            self.__dirty = True
+        return configer, None
+
+    def set_component_type(self, path: str, component_type: Optional[str]) -> None:
+        """Record the component type of the config file.
+
+        Args:
+            path(str): the path of the config file
+            component_type(str): the component type of the config file
+        """
+        with self.__lock:
+            entry = self.__entries.get(path)
+            if entry and entry[3] != component_type:
+                self.__entries[path] = (entry[0], entry[1], entry[2], component_type)
+                self.__dirty = True
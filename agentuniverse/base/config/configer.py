@@ -65,6 +65,7 @@ class Configer(object):
         """
         self.__path: str = path
         self.__value: dict = {}
+        self.__raw_value: Optional[dict] = None
 
     @property
     def path(self):
@@ -96,6 +97,23 @@ class Configer(object):
         """
         self.__value = value
 
+    @property
+    def raw_value(self) -> Optional[dict]:
+        """Return the value of the yaml configuration file before the placeholder resolution."""
+        return self.__raw_value
+
+    def load_by_raw_value(self, raw_value: dict) -> 'Configer':
+        """Load the configuration by the raw value, resolving its placeholders.
+
+        Args:
+            raw_value(dict): the value of the configuration file before the placeholder resolution
+        Returns:
+            Configer: the Configer object
+        """
+        self.__raw_value = raw_value
+        self.__value = PlaceholderResolver().resolve(raw_value)
+        return self
+
     def load_by_path(self, path: str) -> 'Configer':
         """Load the configuration file by the given path
         Args:
@@ -111,6 +129,8 @@ class Configer(object):
         # Choose the load method according to the file format.
         load_method = self.__choice_load_method(path)
         config_data = load_method(path)
+        if file_format == ConfigTypeEnum.YAML.value:
+            return self.load_by_raw_value(config_data)
         self.__value = config_data
         return self
 
@@ -191,14 +211,13 @@ class Configer(object):
 
     @staticmethod
     def __load_yaml_file(path: str) -> dict:
-        """Load the yaml file.
+        """Load the yaml file, placeholders are resolved by the caller.
 
         Args:
             path(str): the path of the yaml file
         Returns:
-            dict: the value of the yaml file
+            dict: the raw value of the yaml file
         """
         with open(path, 'r', encoding='utf-8') as stream:
             config_data = yaml.safe_load(stream)
-        config_data = PlaceholderResolver().resolve(config_data)
         return config_data
@@ -16,6 +16,11 @@ from typing import Any, Callable, List
 def stream_output(output_stream: Queue, data: dict):
     """Add data to the output stream.
 
+    The output stream of an async SSE request is an `AsyncStreamQueue`, whose `put_nowait` blocks
+    the calling thread while the stream is full, until the client catches up or disconnects, so
+    agents streaming from a worker thread are slowed down to the pace of the client. Do not put
+    into the stream while holding a lock the consumer side needs.
+
     Args:
         output_stream (Queue): The output stream.
         data (dict): The data to be streamed.
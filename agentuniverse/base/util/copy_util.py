@@ -0,0 +1,204 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 17:02
+# @Author  : jerry.zzw
+# @Email   : jerry.zzw@antgroup.com
+# @FileName: copy_util.py
+from copy import deepcopy
+from typing import Any
+
+# Values of these types are shared between the template and its copies.
+IMMUTABLE_TYPES = (str, bytes, int, float, bool, complex, type(None))
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f'{type(self).__name__} is a read-only snapshot of a component template, '
+                    f'mutate the component or a copy of it instead')
+
+
+class FrozenDict(dict):
+    """A read-only dict of a frozen template snapshot."""
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+    def __copy__(self) -> 'FrozenDict':
+        return self
+
+    def __deepcopy__(self, memo) -> dict:
+        return thaw(self)
+
+
+class FrozenList(list):
+    """A read-only list of a frozen template snapshot."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return FrozenList, (list(self),)
+
+    def __copy__(self) -> 'FrozenList':
+        return self
+
+    def __deepcopy__(self, memo) -> list:
+        return thaw(self)
+
+
+class FrozenSet(frozenset):
+    """A frozen set of a frozen template snapshot, thawed back into a set."""
+
+
+def freeze(value: Any) -> Any:
+    """Return a deep frozen snapshot of the value, a frozen value is returned as is.
+
+    Dicts, lists and sets are frozen into their read-only counterparts. Values of other
+    mutable types can not be frozen, a deep copy of them is kept instead.
+    """
+    if isinstance(value, IMMUTABLE_TYPES + (FrozenDict, FrozenList, FrozenSet)):
+        return value
+    if isinstance(value, CopyOnWriteDict):
+        return value.freeze()
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    if isinstance(value, tuple):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return FrozenSet(value)
+    if isinstance(value, frozenset):
+        return value
+    return deepcopy(value)
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable deep copy of a frozen value."""
+    if isinstance(value, IMMUTABLE_TYPES):
+        return value
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(thaw(item) for item in value)
+    if isinstance(value, FrozenSet):
+        return set(value)
+    if isinstance(value, frozenset):
+        return value
+    return deepcopy(value)
+
+
+def freeze_snapshot(value: Any, snapshot: Any = None) -> Any:
+    """Return the frozen snapshot of a component template field, the field itself is left mutable.
+
+    The previous snapshot is reused while it still equals the value, the comparison allocates
+    nothing, so copying an unchanged template stays cheap, while an in place edit of the template
+    is seen by the copies created after it. Values which only compare equal by identity are frozen
+    again on every call.
+    """
+    if snapshot is not None and snapshot == value:
+        return snapshot
+    return freeze(value)
+
+
+class CopyOnWriteDict(dict):
+    """A dict sharing the values of a frozen template.
+
+    The dict holds the read-only values of the frozen template, a value is thawed into a
+    mutable deep copy on its first access, so mutations on a copy never leak into the template,
+    and values never accessed are never copied. Creating a copy of a frozen template only costs
+    a shallow dict copy. Reads which bypass the dict methods, like the ones of the C api,
+    only ever see the read-only template values.
+    """
+
+    def __init__(self, template: dict = None):
+        super().__init__(freeze(template) if template else {})
+        self._copied_keys = set()
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if key in self._copied_keys or isinstance(value, IMMUTABLE_TYPES):
+            return value
+        value = thaw(value)
+        super().__setitem__(key, value)
+        self._copied_keys.add(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._copied_keys.add(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._copied_keys.discard(key)
+
+    def __iter__(self):
+        # Overriding the iteration makes `dict(copy)`, `{**copy}` and `f(**copy)` read the
+        # values through `__getitem__` instead of the raw dict storage.
+        return super().__iter__()
+
+    def keys(self):
+        return super().keys()
+
+    def get(self, key, default=None) -> Any:
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None) -> Any:
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def pop(self, key, *args) -> Any:
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return super().pop(key, *args)
+
+    def popitem(self) -> tuple:
+        if not self:
+            raise KeyError('popitem(): dictionary is empty')
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def values(self):
+        self._copy_all()
+        return super().values()
+
+    def items(self):
+        self._copy_all()
+        return super().items()
+
+    def copy(self) -> 'CopyOnWriteDict':
+        return CopyOnWriteDict(self)
+
+    def freeze(self) -> FrozenDict:
+        """Return a frozen snapshot of the dict, sharing the template values never accessed."""
+        return FrozenDict({key: freeze(value) if key in self._copied_keys else value
+                           for key, value in super().items()})
+
+    def _copy_all(self) -> None:
+        for key in list(self.keys()):
+            self.__getitem__(key)
+
+
+def copy_on_write(value: Any) -> Any:
+    """Return a copy of the value for a component copy, a dict is copied on write and other mutable
+    values are deep copied."""
+    if isinstance(value, dict):
+        return CopyOnWriteDict(value)
+    if isinstance(value, IMMUTABLE_TYPES + (tuple, frozenset)):
+        return thaw(value)
+    return deepcopy(value)
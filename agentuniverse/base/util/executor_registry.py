@@ -0,0 +1,137 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 02:30
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: executor_registry.py
+import atexit
+import os
+import threading
+from typing import Callable, Dict, Optional
+
+from agentuniverse.agent_serve.web.thread_with_result import ThreadPoolExecutorWithReturnValue, ContextAwareFuture
+from agentuniverse.base.annotation.singleton import singleton
+from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+# The worker count of an executor neither configured nor sized by its first caller
+DEFAULT_MAX_WORKERS = 8
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutorWithReturnValue):
+    """A context preserving thread pool counting its submitted, running and completed tasks."""
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = ''):
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self.__lock = threading.Lock()
+        self.__stats: Dict[str, int] = {'submitted': 0, 'active': 0, 'completed': 0, 'failed': 0}
+
+    def submit(self, fn: Callable, *args, **kwargs) -> ContextAwareFuture:
+        def instrumented():
+            self.__count('active', 1)
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                self.__count('failed', 1)
+                raise
+            finally:
+                self.__count('active', -1)
+                self.__count('completed', 1)
+            return result
+
+        self.__count('submitted', 1)
+        return super().submit(instrumented)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return the task counts, the worker count and the depth of the work queue."""
+        with self.__lock:
+            stats = dict(self.__stats)
+        stats['max_workers'] = self._max_workers
+        stats['threads'] = len(self._threads)
+        stats['queue_depth'] = self._work_queue.qsize()
+        return stats
+
+    def __count(self, key: str, delta: int) -> None:
+        with self.__lock:
+            self.__stats[key] += delta
+
+
+@singleton
+class ExecutorRegistry(object):
+    """The registry of the thread pools shared by the framework components.
+
+    Components ask for a pool by name instead of building their own, so dozens of knowledge
+    bases share one set of threads. The worker count of a pool is read from the `[EXECUTOR]`
+    section of the config, e.g. `knowledge_query = 32`, else taken from the first caller, else
+    `DEFAULT_MAX_WORKERS`. Pools are dropped in a forked child process, whose threads are gone,
+    and built again on demand. Every pool is shut down at the process exit, and by the
+    `worker_exit` hook of a gunicorn worker.
+    """
+
+    def __init__(self):
+        self.__executors: Dict[str, InstrumentedThreadPoolExecutor] = {}
+        self.__lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self.__reset_after_fork)
+        atexit.register(self.__shutdown_at_exit)
+
+    def get_executor(self, name: str, max_workers: Optional[int] = None) -> InstrumentedThreadPoolExecutor:
+        """Return the shared pool of the name, built on the first call.
+
+        Args:
+            name(str): the name of the pool, such as `knowledge_query`
+            max_workers(int): the worker count used if the pool is not configured
+        """
+        executor = self.__executors.get(name)
+        if executor is not None:
+            return executor
+        with self.__lock:
+            executor = self.__executors.get(name)
+            if executor is None:
+                max_workers = self.__get_configured_workers(name) or max_workers or DEFAULT_MAX_WORKERS
+                executor = InstrumentedThreadPoolExecutor(max_workers=max_workers,
+                                                          thread_name_prefix=f'aU {name}')
+                self.__executors[name] = executor
+        return executor
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return the stats of every pool, keyed by the pool name."""
+        with self.__lock:
+            executors = dict(self.__executors)
+        return {name: executor.get_stats() for name, executor in executors.items()}
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        """Shut down every pool, waiting for the running tasks by default. Meant for the process
+        exit, since the components keep the pools they were given.
+
+        Args:
+            wait(bool): whether to wait for the submitted tasks to finish
+            cancel_futures(bool): whether to cancel the tasks not started yet
+        """
+        with self.__lock:
+            executors = self.__executors
+            self.__executors = {}
+        for name, executor in executors.items():
+            LOGGER.info(f"Shutting down executor {name}: {executor.get_stats()}")
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    @staticmethod
+    def __get_configured_workers(name: str) -> Optional[int]:
+        try:
+            return ApplicationConfigManager().app_configer.executor_configer.get(name)
+        except ValueError:
+            # The app config is not loaded, e.g. in unit tests
+            return None
+
+    def __shutdown_at_exit(self) -> None:
+        # The log sinks may already be closed at the interpreter exit, so no stats are logged
+        with self.__lock:
+            executors = self.__executors
+            self.__executors = {}
+        for executor in executors.values():
+            executor.shutdown(wait=True)
+
+    def __reset_after_fork(self) -> None:
+        self.__lock = threading.Lock()
+        self.__executors = {}
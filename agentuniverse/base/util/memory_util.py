@@ -5,7 +5,10 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: memory_util.py
-from typing import List
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional
 
 from langchain_core.chat_history import BaseChatMessageHistory
 
@@ -15,6 +18,13 @@ from agentuniverse.base.context.framework_context_manager import FrameworkContex
 from agentuniverse.llm.llm import LLM
 from agentuniverse.llm.llm_manager import LLMManager
 
+# The separator of the messages in the memory string
+MESSAGE_SEPARATOR = "\n\n"
+# Max number of message token counts cached, keyed by the llm name and the message string digest
+TOKEN_CACHE_SIZE = 10000
+_TOKEN_CACHE: OrderedDict = OrderedDict()
+_TOKEN_CACHE_LOCK = threading.Lock()
+
 
 def generate_messages(memories: list) -> List[Message]:
     """ Generate a list of messages from the given memories
@@ -57,34 +67,48 @@ def get_memory_string(messages: List[Message], agent_id=None) -> str:
     current_trace_id = FrameworkContextManager().get_context("trace_id")
     string_messages = []
     for m in messages:
-        if m.type == ChatMessageEnum.SYSTEM.value:
-            role = 'System'
-        elif m.type == ChatMessageEnum.HUMAN.value:
-            role = 'Human'
-        elif m.type == ChatMessageEnum.AI.value:
-            role = "AI"
-        elif m.type == ChatMessageEnum.INPUT.value or m.type == ChatMessageEnum.OUTPUT.value:
-            if current_trace_id == m.trace_id:
-                continue
-            role: str = m.metadata.get('prefix', "")
-            if agent_id:
-                role = role.replace(f"智能体 {agent_id}", " 你")
-                role = role.replace(f"Agent {agent_id}", " You")
-            m_str = f"{m.metadata.get('timestamp')} {role}:{m.content}"
+        m_str = get_message_string(m, agent_id, current_trace_id)
+        if m_str is not None:
             string_messages.append(m_str)
-            continue
-        else:
-            role = ""
-        m_str = ""
-        if m.metadata and m.metadata.get('gmt_created'):
-            m_str += f"{m.metadata.get('gmt_created')} "
-        if m.source:
-            m_str += f" Message source: {m.source} "
-        if role:
-            m_str += f"Message role: {role} "
-        m_str += f" :{m.content} "
-        string_messages.append(m_str)
-    return "\n\n".join(string_messages)
+    return MESSAGE_SEPARATOR.join(string_messages)
+
+
+def get_message_string(m: Message, agent_id=None, current_trace_id=None) -> Optional[str]:
+    """Convert a message to its string in the memory string, None for a skipped message.
+
+    Args:
+        m(Message): The message.
+        agent_id: The id of the agent reading the memory.
+        current_trace_id: The trace id of the current request, whose input and output messages are skipped.
+
+    Returns:
+        Optional[str]: The string representation of the message.
+    """
+    if m.type == ChatMessageEnum.SYSTEM.value:
+        role = 'System'
+    elif m.type == ChatMessageEnum.HUMAN.value:
+        role = 'Human'
+    elif m.type == ChatMessageEnum.AI.value:
+        role = "AI"
+    elif m.type == ChatMessageEnum.INPUT.value or m.type == ChatMessageEnum.OUTPUT.value:
+        if current_trace_id == m.trace_id:
+            return None
+        role: str = m.metadata.get('prefix', "")
+        if agent_id:
+            role = role.replace(f"智能体 {agent_id}", " 你")
+            role = role.replace(f"Agent {agent_id}", " You")
+        return f"{m.metadata.get('timestamp')} {role}:{m.content}"
+    else:
+        role = ""
+    m_str = ""
+    if m.metadata and m.metadata.get('gmt_created'):
+        m_str += f"{m.metadata.get('gmt_created')} "
+    if m.source:
+        m_str += f" Message source: {m.source} "
+    if role:
+        m_str += f"Message role: {role} "
+    m_str += f" :{m.content} "
+    return m_str
 
 
 def get_memory_tokens(memories: List[Message], llm_name: str = None) -> int:
@@ -100,3 +124,45 @@ def get_memory_tokens(memories: List[Message], llm_name: str = None) -> int:
     memory_str = get_memory_string(memories)
     llm_instance: LLM = LLMManager().get_instance_obj(llm_name)
     return llm_instance.get_num_tokens(memory_str) if llm_instance else len(memory_str)
+
+
+def get_message_tokens(memories: List[Message], llm_name: str = None) -> List[int]:
+    """Get the number of tokens of each message in the memory string.
+
+    Each message is counted along with its separator, so the sum is the token count of the memory
+    string plus one separator. Counts are cached per llm and message string, so a message is
+    tokenized once however many times the memory is pruned.
+
+    Args:
+        memories(List[Message]): The list of messages.
+        llm_name(str): The name of the LLM to use for token counting.
+
+    Returns:
+        List[int]: The number of tokens of each message, 0 for a skipped message.
+    """
+    current_trace_id = FrameworkContextManager().get_context("trace_id")
+    llm_instance: Optional[LLM] = None
+    llm_resolved = False
+    token_counts = []
+    for m in memories:
+        m_str = get_message_string(m, current_trace_id=current_trace_id)
+        if m_str is None:
+            token_counts.append(0)
+            continue
+        m_str += MESSAGE_SEPARATOR
+        key = (llm_name, hashlib.blake2b(m_str.encode('utf-8'), digest_size=16).digest())
+        with _TOKEN_CACHE_LOCK:
+            count = _TOKEN_CACHE.get(key)
+            if count is not None:
+                _TOKEN_CACHE.move_to_end(key)
+        if count is None:
+            if not llm_resolved:
+                llm_instance = LLMManager().get_instance_obj(llm_name)
+                llm_resolved = True
+            count = llm_instance.get_num_tokens(m_str) if llm_instance else len(m_str)
+            with _TOKEN_CACHE_LOCK:
+                _TOKEN_CACHE[key] = count
+                while len(_TOKEN_CACHE) > TOKEN_CACHE_SIZE:
+                    _TOKEN_CACHE.popitem(last=False)
+        token_counts.append(count)
+    return token_counts
@@ -6,7 +6,6 @@
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: llm.py
 from abc import abstractmethod
-from copy import deepcopy
 from typing import Optional, Any, AsyncIterator, Iterator, Union
 
 import tiktoken
@@ -18,6 +17,7 @@ from agentuniverse.base.component.component_base import ComponentBase
 from agentuniverse.base.component.component_enum import ComponentEnum
 from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
 from agentuniverse.base.config.component_configer.configers.llm_configer import LLMConfiger
+from agentuniverse.base.util.copy_util import CopyOnWriteDict, freeze_snapshot
 from agentuniverse.base.util.logging.logging_util import LOGGER
 from agentuniverse.llm.llm_channel.llm_channel import LLMChannel
 from agentuniverse.llm.llm_channel.llm_channel_manager import LLMChannelManager
@@ -55,6 +55,8 @@ class LLM(ComponentBase):
     max_retries: Optional[int] = 2
     streaming: Optional[bool] = False
     ext_info: Optional[dict] = None
+    # the frozen snapshot of ext_info, shared by the copies
+    _frozen_ext_info: Optional[dict] = None
     tracing: Optional[bool] = None
     _max_context_length: Optional[int] = None
     langchain_instance: Optional[BaseLanguageModel] = None
@@ -224,7 +226,9 @@ class LLM(ComponentBase):
     def create_copy(self):
         copied = self.model_copy()
         if self.ext_info is not None:
-            copied.ext_info = deepcopy(self.ext_info)
+            # the copies share a read-only snapshot of ext_info, frozen again once ext_info changed
+            self._frozen_ext_info = freeze_snapshot(self.ext_info, self._frozen_ext_info)
+            copied.ext_info = CopyOnWriteDict(self._frozen_ext_info)
         # Shared reference
         copied.client = self.client
         copied.async_client = self.async_client
@@ -6,8 +6,9 @@
 # @Email   : xmhu2001@qq.com
 # @FileName: test_jina_reranker.py
 
+import asyncio
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 from agentuniverse.agent.action.knowledge.doc_processor.jina_reranker import JinaReranker
 from agentuniverse.agent.action.knowledge.store.document import Document
@@ -120,6 +121,25 @@ class TestJinaReranker(unittest.TestCase):
 
         self.assertEqual(len(result_docs), 2)
 
+    def test_async_process_docs_reuses_client(self):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {'results': [{'index': 1, 'relevance_score': 0.9}]}
+        self.reranker.api_key = 'test_api_key'
+
+        async def rerank_twice():
+            first = await self.reranker._async_process_docs(self.test_docs, self.test_query)
+            client = self.reranker._get_async_client()
+            await self.reranker._async_process_docs(self.test_docs, self.test_query)
+            return first, client, self.reranker._get_async_client()
+
+        with patch('httpx.AsyncClient.post', new_callable=AsyncMock) as mock_post:
+            mock_post.return_value = mock_response
+            result_docs, first_client, second_client = asyncio.run(rerank_twice())
+
+        self.assertEqual(mock_post.await_count, 2)
+        self.assertIs(first_client, second_client)
+        self.assertEqual(result_docs[0].metadata['id'], 2)
+
     def test_process_docs_no_api_key(self):
         with self.assertRaises(Exception) as context:
             self.reranker._process_docs(self.test_docs, self.test_query)
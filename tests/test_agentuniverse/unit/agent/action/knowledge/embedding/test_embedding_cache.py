@@ -0,0 +1,114 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# @Time    : 2026/10/18 22:30
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_embedding_cache.py
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from typing import List
+
+from agentuniverse.agent.action.knowledge.embedding import embedding as embedding_module
+from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
+from agentuniverse.agent.action.knowledge.embedding.embedding_manager import EmbeddingManager
+from agentuniverse.base.config.application_configer.app_configer import AppConfiger
+from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
+
+
+class CountingEmbedding(Embedding):
+    """Embeds a text by its length and records the texts sent to the model."""
+    calls: list = []
+
+    def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+    async def async_get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+
+class EmbeddingCacheTest(unittest.TestCase):
+    """
+    Test cases for the embedding cache
+    """
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.disk_path = os.path.join(self.temp_dir, 'embedding_cache.db')
+        embedding_module._SHARED_CACHES.clear()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_memory_tier(self) -> None:
+        embedding = CountingEmbedding(embedding_model_name='m', cache_max_size=10, calls=[])
+        self.assertEqual(embedding.get_embeddings(['a', 'bb', 'a']), [[1.0, 0.5], [2.0, 0.5], [1.0, 0.5]])
+        self.assertEqual(embedding.get_embeddings(['bb', 'ccc']), [[2.0, 0.5], [3.0, 0.5]])
+        self.assertEqual(asyncio.run(embedding.async_get_embeddings(['ccc'])), [[3.0, 0.5]])
+        # Only the texts missing in the cache are embedded, once each
+        self.assertEqual(embedding.calls, [['a', 'bb'], ['ccc']])
+        # The text type is a part of the key
+        embedding.get_embeddings(['a'], text_type='query')
+        self.assertEqual(embedding.calls[-1], ['a'])
+        stats = embedding.get_cache_stats()
+        self.assertEqual(stats['memory_hits'], 2)
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 7)
+
+    def test_disk_tier_shared(self) -> None:
+        writer = CountingEmbedding(embedding_model_name='m', cache_disk_path=self.disk_path, calls=[])
+        writer.get_embeddings(['hello', 'world'])
+        reader = CountingEmbedding(embedding_model_name='m', cache_max_size=1, cache_disk_path=self.disk_path,
+                                   calls=[])
+        self.assertEqual(reader.get_embeddings(['world', 'hello']), [[5.0, 0.5], [5.0, 0.5]])
+        self.assertEqual(reader.calls, [])
+        self.assertEqual(reader.get_cache_stats()['disk_hits'], 2)
+        # Another model never reads the vectors of the first one
+        other = CountingEmbedding(embedding_model_name='other', cache_disk_path=self.disk_path, calls=[])
+        other.get_embeddings(['hello'])
+        self.assertEqual(other.calls, [['hello']])
+
+    def test_cached_vectors_are_copied(self) -> None:
+        embedding = CountingEmbedding(embedding_model_name='m', cache_max_size=10, cache_disk_path=self.disk_path,
+                                      calls=[])
+        embedding.get_embeddings(['a'])[0].append(9.0)
+        hit = embedding.get_embeddings(['a'])[0]
+        hit[0] = 9.0
+        self.assertEqual(embedding.get_embeddings(['a']), [[1.0, 0.5]])
+        # The vectors read back from the disk tier are copied as well
+        embedding.get_cache().clear()
+        embedding.get_embeddings(['a'])[0][0] = 9.0
+        self.assertEqual(embedding.get_embeddings(['a']), [[1.0, 0.5]])
+        self.assertEqual(embedding.calls, [['a']])
+
+    def test_cache_shared_by_manager_copies(self) -> None:
+        app_configer = AppConfiger()
+        app_configer._AppConfiger__base_info_appname = 'test_app'
+        ApplicationConfigManager().app_configer = app_configer
+        EmbeddingManager().register('test_app.embedding.counting_embedding',
+                                    CountingEmbedding(name='counting_embedding', embedding_model_name='m',
+                                                      cache_max_size=10, calls=[]))
+        self.addCleanup(EmbeddingManager().unregister, 'test_app.embedding.counting_embedding')
+        first = EmbeddingManager().get_instance_obj('counting_embedding')
+        first.get_embeddings(['a', 'bb'])
+        second = EmbeddingManager().get_instance_obj('counting_embedding')
+        self.assertIsNot(second, first)
+        self.assertEqual(second.get_embeddings(['bb', 'a']), [[2.0, 0.5], [1.0, 0.5]])
+        # The copies share the cache, the second copy never calls the model
+        self.assertEqual(first.calls, [['a', 'bb']])
+        self.assertEqual(second.calls, [])
+        self.assertEqual(EmbeddingManager().get_instance_obj('counting_embedding').get_cache_stats()['memory_hits'], 2)
+
+    def test_cache_disabled(self) -> None:
+        embedding = CountingEmbedding(embedding_model_name='m', calls=[])
+        embedding.get_embeddings(['a'])
+        embedding.get_embeddings(['a'])
+        self.assertEqual(embedding.calls, [['a'], ['a']])
+        self.assertEqual(embedding.get_cache_stats(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
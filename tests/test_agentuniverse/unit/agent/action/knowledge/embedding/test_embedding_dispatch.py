@@ -0,0 +1,131 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# @Time    : 2026/10/18 23:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_embedding_dispatch.py
+import asyncio
+import json
+import threading
+import time
+import unittest
+from typing import List
+from unittest.mock import Mock, patch
+
+from agentuniverse.agent.action.knowledge.embedding.dashscope_embedding import DashscopeEmbedding
+from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding, RetryableEmbeddingError
+from agentuniverse.agent.action.knowledge.embedding.openai_embedding import OpenAIEmbedding
+
+
+class BatchEmbedding(Embedding):
+    """Embeds a text by its length in batches of 3, throttling the first request of each batch."""
+    throttle_first: bool = False
+
+    def model_post_init(self, __context) -> None:
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak = 0
+        self._attempts = {}
+
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        with self._lock:
+            self._in_flight += 1
+            self._peak = max(self._peak, self._in_flight)
+            attempt = self._attempts[batch[0]] = self._attempts.get(batch[0], 0) + 1
+        try:
+            time.sleep(0.02)
+            if self.throttle_first and attempt == 1:
+                raise RetryableEmbeddingError('throttled', retry_after=0)
+            return [[float(len(text))] for text in batch]
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    async def _async_embed_batch(self, batch: List[str]) -> List[List[float]]:
+        return await asyncio.to_thread(self._embed_batch, batch)
+
+    def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        return self._dispatch_batches(texts, self._embed_batch, batch_size=3)
+
+    async def async_get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        return await self._async_dispatch_batches(texts, self._async_embed_batch, batch_size=3)
+
+
+class EmbeddingDispatchTest(unittest.TestCase):
+    """
+    Test cases for the concurrent batch dispatch of the embeddings
+    """
+
+    texts = ['x' * i for i in range(1, 21)]
+
+    def test_order_and_concurrency(self) -> None:
+        embedding = BatchEmbedding(max_concurrency=2)
+        self.assertEqual(embedding.get_embeddings(self.texts), [[float(i)] for i in range(1, 21)])
+        self.assertEqual(embedding._peak, 2)
+        embedding = BatchEmbedding(max_concurrency=3, max_batch_size=2)
+        self.assertEqual(asyncio.run(embedding.async_get_embeddings(self.texts)),
+                         [[float(i)] for i in range(1, 21)])
+        self.assertEqual(len(embedding._attempts), 10)
+        self.assertLessEqual(embedding._peak, 3)
+
+    def test_retry_throttled_batches(self) -> None:
+        embedding = BatchEmbedding(throttle_first=True, max_retries=1)
+        self.assertEqual(embedding.get_embeddings(self.texts), [[float(i)] for i in range(1, 21)])
+        self.assertEqual(set(embedding._attempts.values()), {2})
+        embedding = BatchEmbedding(throttle_first=True, max_retries=0)
+        with self.assertRaises(RetryableEmbeddingError):
+            asyncio.run(embedding.async_get_embeddings(self.texts))
+
+    def test_dashscope_pooled_session(self) -> None:
+        def post(url, headers, data, timeout):
+            response = Mock(status_code=200, headers={})
+            texts = json.loads(data)['input']['texts']
+            response.json.return_value = {'output': {'embeddings': [{'embedding': [1.0]}] * len(texts)}}
+            return response
+
+        session = Mock()
+        session.post.side_effect = post
+        with patch.object(DashscopeEmbedding, '_get_session', return_value=session):
+            embedding = DashscopeEmbedding(dashscope_api_key='key', embedding_model_name='text-embedding-v2')
+            self.assertEqual(len(embedding.get_embeddings(['t'] * 60)), 60)
+            self.assertEqual(session.post.call_count, 3)
+        # The copies of the embedding share one pooled session
+        first = DashscopeEmbedding(dashscope_api_key='key')
+        self.assertIs(first._get_session(), first.model_copy()._get_session())
+
+    def test_openai_langchain_shares_async_client(self) -> None:
+        first = OpenAIEmbedding(openai_api_key='key', embedding_model_name='text-embedding-3-small')
+        second = first.model_copy()
+        self.assertIs(first.as_langchain().async_client, second.as_langchain().async_client)
+
+    def test_dashscope_html_error_pages(self) -> None:
+        responses = []
+
+        def post(url, headers, data, timeout):
+            status_code = 503 if not responses else 200
+            response = Mock(status_code=status_code, headers={'Retry-After': '0'})
+            if status_code == 503:
+                response.json.side_effect = ValueError('<html>Service Unavailable</html>')
+            else:
+                response.json.return_value = {'output': {'embeddings': [{'embedding': [1.0]}]}}
+            responses.append(response)
+            return response
+
+        session = Mock()
+        session.post.side_effect = post
+        with patch.object(DashscopeEmbedding, '_get_session', return_value=session):
+            embedding = DashscopeEmbedding(dashscope_api_key='key', embedding_model_name='text-embedding-v2')
+            # The html page of an overloaded gateway is retried by its status, without parsing it
+            self.assertEqual(embedding.get_embeddings(['t']), [[1.0]])
+            self.assertEqual(session.post.call_count, 2)
+            responses[0].json.assert_not_called()
+
+            session.post.side_effect = None
+            session.post.return_value = Mock(status_code=403, headers={})
+            session.post.return_value.json.side_effect = ValueError('<html>Forbidden</html>')
+            with self.assertRaisesRegex(Exception, 'http status:403'):
+                embedding.get_embeddings(['t'])
+
+
+if __name__ == '__main__':
+    unittest.main()
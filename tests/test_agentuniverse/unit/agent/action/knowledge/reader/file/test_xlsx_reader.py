@@ -36,17 +36,8 @@ class TestXlsxReader:
         mock_worksheet.max_row = 3
         mock_worksheet.max_column = 2
         
-        # Mock cell values
-        mock_cells = [
-            [MagicMock(value='Name'), MagicMock(value='Age')],
-            [MagicMock(value='Alice'), MagicMock(value=25)],
-            [MagicMock(value='Bob'), MagicMock(value=30)]
-        ]
-        
-        def mock_cell(row, column):
-            return mock_cells[row-1][column-1]
-        
-        mock_worksheet.cell = mock_cell
+        # Mock row values
+        mock_worksheet.iter_rows.return_value = [('Name', 'Age'), ('Alice', 25), ('Bob', 30)]
         mock_workbook.__getitem__.return_value = mock_worksheet
         mock_workbook.sheetnames = ['Sheet1']
         mock_load_workbook.return_value = mock_workbook
@@ -61,6 +52,10 @@ class TestXlsxReader:
         assert 'Bob | 30' in result[0].text
         assert result[0].metadata['sheet_name'] == 'Sheet1'
         assert result[0].metadata['file_name'] == 'test.xlsx'
+        # The workbook is streamed in read-only mode and closed once read
+        assert mock_load_workbook.call_args.kwargs['read_only'] is True
+        mock_worksheet.iter_rows.assert_called_once_with(values_only=True)
+        mock_workbook.close.assert_called_once()
 
     @patch('openpyxl.load_workbook')
     def test_load_data_with_multiple_sheets(self, mock_load_workbook):
@@ -73,15 +68,15 @@ class TestXlsxReader:
         mock_sheet1 = MagicMock()
         mock_sheet1.max_row = 2
         mock_sheet1.max_column = 2
-        mock_sheet1.cell.return_value = MagicMock(value='Data1')
+        mock_sheet1.iter_rows.return_value = [('Data1', 'Data1'), ('Data1', 'Data1')]
         
         # Mock second sheet
         mock_sheet2 = MagicMock()
         mock_sheet2.max_row = 2
         mock_sheet2.max_column = 2
-        mock_sheet2.cell.return_value = MagicMock(value='Data2')
+        mock_sheet2.iter_rows.return_value = [('Data2', 'Data2'), ('Data2', 'Data2')]
         
-        def mock_getitem(sheet_name):
+        def mock_getitem(workbook, sheet_name):
             if sheet_name == 'Sheet1':
                 return mock_sheet1
             elif sheet_name == 'Sheet2':
@@ -113,7 +108,7 @@ class TestXlsxReader:
         mock_worksheet.sheetnames = ['Sheet1']
         mock_worksheet.max_row = 1
         mock_worksheet.max_column = 1
-        mock_worksheet.cell.return_value = MagicMock(value='Test')
+        mock_worksheet.iter_rows.return_value = [('Test',)]
         
         mock_workbook.__getitem__.return_value = mock_worksheet
         mock_workbook.sheetnames = ['Sheet1']
@@ -135,7 +130,7 @@ class TestXlsxReader:
         mock_worksheet.sheetnames = ['Sheet1']
         mock_worksheet.max_row = 0
         mock_worksheet.max_column = 0
-        mock_worksheet.cell.return_value = MagicMock(value=None)
+        mock_worksheet.iter_rows.return_value = []
         
         mock_workbook.__getitem__.return_value = mock_worksheet
         mock_workbook.sheetnames = ['Sheet1']
@@ -155,7 +150,7 @@ class TestXlsxReader:
             mock_worksheet.sheetnames = ['Sheet1']
             mock_worksheet.max_row = 1
             mock_worksheet.max_column = 1
-            mock_worksheet.cell.return_value = MagicMock(value='Test')
+            mock_worksheet.iter_rows.return_value = [('Test',)]
             
             mock_workbook.__getitem__.return_value = mock_worksheet
             mock_workbook.sheetnames = ['Sheet1']
@@ -166,3 +161,47 @@ class TestXlsxReader:
             
             assert len(result) == 1
             assert result[0].metadata['file_name'] == 'test.xlsx'
+
+    def test_load_real_workbook(self):
+        """Test loading a workbook written by openpyxl."""
+        openpyxl = pytest.importorskip('openpyxl')
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.title = 'People'
+        worksheet.append(['Name', 'Age'])
+        worksheet.append(['Alice', 25])
+        worksheet.append([None, None])
+        worksheet.append(['Bob'])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'people.xlsx')
+            workbook.save(file_path)
+            result = self.reader._load_data(file_path)
+
+        assert len(result) == 1
+        assert result[0].text == 'Name | Age\nAlice | 25\nBob | '
+        assert result[0].metadata['max_row'] == 4
+        assert result[0].metadata['max_col'] == 2
+
+    def test_iter_data_bounds_rows_per_document(self):
+        """Test streaming a large sheet in documents of a bounded number of rows."""
+        openpyxl = pytest.importorskip('openpyxl')
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.title = 'Rows'
+        for i in range(1, 26):
+            worksheet.append([f'row {i}'] if i != 10 else [None])
+        summary = workbook.create_sheet('Summary')
+        summary.append(['total', 24])
+        reader = XlsxReader(max_rows_per_document=10)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'rows.xlsx')
+            workbook.save(file_path)
+            documents = list(reader.iter_data(file_path))
+            whole_sheets = reader.load_data(file_path)
+
+        assert [(doc.metadata['sheet_name'], doc.metadata['start_row'], doc.metadata['end_row'])
+                for doc in documents] == [('Rows', 1, 11), ('Rows', 12, 21), ('Rows', 22, 25), ('Summary', 1, 1)]
+        assert documents[0].text.split('\n') == [f'row {i}' for i in range(1, 12) if i != 10]
+        assert documents[2].text == 'row 22\nrow 23\nrow 24\nrow 25'
+        # load_data keeps one document per sheet
+        assert [doc.text.count('\n') + 1 for doc in whole_sheets] == [24, 1]
@@ -0,0 +1,58 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 22:10
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_chroma_store.py
+import unittest
+import uuid
+from unittest.mock import Mock, patch
+
+import chromadb
+
+from agentuniverse.agent.action.knowledge.store.chroma_store import ChromaStore
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.query import Query
+
+
+class ChromaStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.embedding_instance = Mock()
+        self.embedding_instance.get_embeddings.side_effect = lambda texts, **kwargs: [
+            [float(len(text)), 1.0, 0.0] for text in texts
+        ]
+        patcher = patch("agentuniverse.agent.action.knowledge.store.store.EmbeddingManager")
+        patcher.start().return_value.get_instance_obj.return_value = self.embedding_instance
+        self.addCleanup(patcher.stop)
+        self.documents = [Document(id=f"doc_{i}", text="x" * (i + 1), metadata={"i": i}) for i in range(25)]
+
+    def test_bulk_insert_batches(self):
+        store = ChromaStore(embedding_model="mock_embedding", embedding_batch_size=4,
+                            write_batch_size=10, write_concurrency=3)
+        store.collection = Mock()
+        store.insert_document(self.documents)
+
+        self.assertEqual(store.collection.add.call_count, 3)
+        written_ids = [doc_id for call in store.collection.add.call_args_list for doc_id in call.kwargs["ids"]]
+        self.assertEqual(sorted(written_ids), sorted(document.id for document in self.documents))
+        # Every write batch is embedded in calls of at most embedding_batch_size texts
+        batch_sizes = [len(call.args[0]) for call in self.embedding_instance.get_embeddings.call_args_list]
+        self.assertEqual(sorted(batch_sizes), sorted([4, 4, 2] * 2 + [4, 1]))
+
+    def test_bulk_upsert_into_collection(self):
+        store = ChromaStore(embedding_model="mock_embedding", write_batch_size=7)
+        store.collection = chromadb.EphemeralClient().get_or_create_collection(f"test_{uuid.uuid4().hex}")
+        store.insert_document(self.documents)
+        store.upsert_document([Document(id="doc_3", text="y" * 30, metadata={"i": 30}),
+                               Document(id="doc_99", text="z", embedding=[9.0, 9.0, 9.0])])
+
+        self.assertEqual(store.collection.count(), 26)
+        self.assertEqual(store.collection.get(ids=["doc_3"])["metadatas"], [{"i": 30}])
+        results = store.query(Query(embeddings=[[30.0, 1.0, 0.0]], similarity_top_k=1))
+        self.assertEqual(results[0].id, "doc_3")
+
+
+if __name__ == '__main__':
+    unittest.main()
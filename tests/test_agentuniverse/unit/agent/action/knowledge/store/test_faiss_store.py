@@ -5,12 +5,13 @@
 # @Email   : saswatsusmoy9@gmail.com
 # @FileName: test_faiss_store.py
 
+import asyncio
 import logging
 import os
 import shutil
 import tempfile
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 try:
     import faiss  # noqa: F401
@@ -558,6 +559,278 @@ class TestFAISSStore(unittest.TestCase):
                 results = store.query(query)
                 self.assertGreater(len(results), 0, f"Document {doc_id} should be queryable")
 
+    def test_tombstone_delete_and_compaction(self):
+        """Test deletes keep tombstones in the index until compaction."""
+        store = self.create_store()
+        store._new_client()
+        store.insert_document(self.large_dataset[:10])
+
+        store.delete_document("large_doc_0")
+        self.assertEqual(store.get_tombstone_count(), 1)
+        self.assertEqual(store.faiss_index.ntotal, 10)
+
+        # Tombstones never shrink the query result
+        query = Query(embeddings=[[0.0, 0.01, 0.02, 0.03]], similarity_top_k=3)
+        results = store.query(query)
+        self.assertEqual(len(results), 3)
+        self.assertNotIn("large_doc_0", [doc.id for doc in results])
+
+        # Passing the compaction ratio rebuilds the index from the stored embeddings
+        for i in range(1, 4):
+            store.delete_document(f"large_doc_{i}")
+        self.assertEqual(store.get_tombstone_count(), 0)
+        self.assertEqual(store.faiss_index.ntotal, 6)
+        self.assertEqual(store.query(query)[0].id, "large_doc_4")
+
+    def test_upsert_batch_without_rebuild(self):
+        """Test upserting many existing documents only tombstones them once."""
+        store = self.create_store()
+        store.compaction_ratio = 1.0
+        store._new_client()
+        store.insert_document(self.large_dataset[:20])
+
+        updated_docs = [doc.model_copy(update={"text": f"updated {doc.id}"}) for doc in self.large_dataset[:10]]
+        store.upsert_document(updated_docs)
+        self.assertEqual(store.get_document_count(), 20)
+        self.assertEqual(store.get_tombstone_count(), 10)
+        self.assertEqual(store.get_document_by_id("large_doc_3").text, "updated large_doc_3")
+
+    def test_metadata_log_replay(self):
+        """Test writes are appended to the metadata log and replayed on load."""
+        store1 = self.create_store()
+        store1._new_client()
+        store1.insert_document(self.test_documents[:2])
+        store1.insert_document(self.test_documents[2:])
+        store1.delete_document("doc2")
+        self.assertTrue(os.path.exists(store1.metadata_log_path))
+
+        store2 = self.create_store()
+        store2._new_client()
+        self.assertEqual(set(store2.list_document_ids()), {"doc1", "doc3", "doc4", "doc5"})
+        results = store2.query(Query(embeddings=[[0.5, 0.6, 0.7, 0.8]], similarity_top_k=1))
+        self.assertNotEqual(results[0].id, "doc2")
+
+        store2.checkpoint()
+        self.assertFalse(os.path.exists(store2.metadata_log_path))
+        store3 = self.create_store()
+        store3._new_client()
+        self.assertEqual(set(store3.list_document_ids()), {"doc1", "doc3", "doc4", "doc5"})
+
+    def test_explicit_flush(self):
+        """Test nothing is written before flush when auto flush is disabled."""
+        store = self.create_store()
+        store.auto_flush = False
+        store._new_client()
+        store.insert_document(self.test_documents)
+        self.assertFalse(os.path.exists(self.index_path))
+
+        store.flush()
+        reloaded = self.create_store()
+        reloaded._new_client()
+        self.assertEqual(reloaded.get_document_count(), 5)
+
+    def test_batched_embedding(self):
+        """Test documents lacking embeddings are embedded in batches."""
+        embedding_instance = Mock()
+        embedding_instance.get_embeddings.side_effect = lambda texts, **kwargs: [
+            [float(len(text)), 0.1, 0.2, 0.3] for text in texts
+        ]
+        store = self.create_store()
+        store.embedding_model = "mock_embedding"
+        store.embedding_batch_size = 4
+        store._new_client()
+
+        documents = [Document(id=f"doc_{i}", text="x" * (i + 1)) for i in range(10)]
+        with patch("agentuniverse.agent.action.knowledge.store.faiss_store.EmbeddingManager") as manager:
+            manager.return_value.get_instance_obj.return_value = embedding_instance
+            store.insert_document(documents)
+            self.assertEqual(store.get_document_count(), 10)
+            self.assertEqual([len(call.args[0]) for call in embedding_instance.get_embeddings.call_args_list],
+                             [4, 4, 2])
+            self.assertEqual(store.get_document_by_id("doc_3").embedding, [4.0, 0.1, 0.2, 0.3])
+
+            embedding_instance.get_embeddings.reset_mock()
+            results = store.query_batch([Query(query_str="xx"), Query(query_str="xxxxxxx", similarity_top_k=2),
+                                         Query(embeddings=[[10.0, 0.1, 0.2, 0.3]], similarity_top_k=1)])
+            self.assertEqual(embedding_instance.get_embeddings.call_count, 1)
+            self.assertEqual(results[0][0].id, "doc_1")
+            self.assertEqual([doc.id for doc in results[1]][0], "doc_6")
+            self.assertEqual(len(results[1]), 2)
+            self.assertEqual([doc.id for doc in results[2]], ["doc_9"])
+
+    def test_async_insert_and_query(self):
+        """Test the async path embeds by the async embedding client and matches the sync query."""
+        embedding_instance = Mock()
+
+        async def async_get_embeddings(texts, **kwargs):
+            return [[float(len(text)), 0.1, 0.2, 0.3] for text in texts]
+
+        embedding_instance.async_get_embeddings.side_effect = async_get_embeddings
+        store = self.create_store()
+        store.embedding_model = "mock_embedding"
+        store.embedding_batch_size = 4
+        store._new_client()
+
+        documents = [Document(id=f"doc_{i}", text="x" * (i + 1)) for i in range(10)]
+        with patch("agentuniverse.agent.action.knowledge.store.faiss_store.EmbeddingManager") as manager:
+            manager.return_value.get_instance_obj.return_value = embedding_instance
+            asyncio.run(store.async_insert_document(documents))
+            self.assertEqual(store.get_document_count(), 10)
+            self.assertEqual(embedding_instance.async_get_embeddings.call_count, 3)
+            embedding_instance.get_embeddings.assert_not_called()
+
+            results = asyncio.run(store.async_query(Query(query_str="xxx", similarity_top_k=2)))
+            self.assertEqual([doc.id for doc in results][0], "doc_2")
+            query = Query(embeddings=[[3.0, 0.1, 0.2, 0.3]], similarity_top_k=2)
+            self.assertEqual([doc.id for doc in asyncio.run(store.async_query(query))],
+                             [doc.id for doc in store.query(query)])
+
+    def test_query_batch_matches_query(self):
+        """Test a batch query returns the same documents as single queries."""
+        store = self.create_store()
+        store._new_client()
+        store.insert_document(self.large_dataset[:30])
+        store.delete_document("large_doc_5")
+
+        queries = [Query(embeddings=[[i * 0.01, (i + 1) * 0.01, (i + 2) * 0.01, (i + 3) * 0.01]], similarity_top_k=3)
+                   for i in range(0, 30, 5)]
+        batch_results = store.query_batch(queries + [Query()])
+        for query, documents in zip(queries, batch_results):
+            self.assertEqual([doc.id for doc in store.query(query)], [doc.id for doc in documents])
+        self.assertEqual(batch_results[-1], [])
+
+    def test_columnar_snapshot(self):
+        """Test checkpoints write a memory-mapped columnar snapshot loaded lazily."""
+        from agentuniverse.agent.action.knowledge.store.mmap_document_store import MmapDocumentStore
+
+        store1 = self.create_store()
+        store1._new_client()
+        store1.insert_document(self.test_documents)
+        store1.checkpoint()
+        self.assertIsInstance(store1.document_store, MmapDocumentStore)
+        generation = MmapDocumentStore._read_generation(self.metadata_path)
+        self.assertTrue(os.path.exists(f"{self.metadata_path}.{generation}.blob"))
+        self.assertTrue(os.path.exists(f"{self.metadata_path}.{generation}.embeddings.npy"))
+
+        store2 = self.create_store()
+        store2._new_client()
+        self.assertIsInstance(store2.document_store, MmapDocumentStore)
+        self.assertEqual(store2.get_document_count(), 5)
+        doc = store2.get_document_by_id("doc3")
+        self.assertEqual(doc.text, self.test_documents[2].text)
+        self.assertEqual(doc.metadata, self.test_documents[2].metadata)
+        self.assertEqual(doc.embedding, self.test_documents[2].embedding)
+
+        # Writes on top of the snapshot are kept in memory until the next checkpoint
+        store2.delete_document("doc1")
+        store2.upsert_document([Document(id="doc2", text="updated", embedding=[0.5, 0.6, 0.7, 0.8])])
+        self.assertNotIn("doc1", store2.list_document_ids())
+        self.assertEqual(store2.get_document_count(), 4)
+        store2.checkpoint()
+        store3 = self.create_store()
+        store3._new_client()
+        self.assertEqual(set(store3.list_document_ids()), {"doc2", "doc3", "doc4", "doc5"})
+        self.assertEqual(store3.get_document_by_id("doc2").text, "updated")
+        self.assertEqual(store3.query(Query(embeddings=[[0.5, 0.6, 0.7, 0.8]], similarity_top_k=1))[0].id, "doc2")
+
+    def test_snapshot_generations(self):
+        """Test a snapshot is swapped in by its manifest, keeping the previous generation only."""
+        from agentuniverse.agent.action.knowledge.store.mmap_document_store import MmapDocumentStore
+
+        store1 = self.create_store()
+        store1._new_client()
+        store1.insert_document(self.test_documents)
+        store1.checkpoint()
+        first_generation = MmapDocumentStore._read_generation(self.metadata_path)
+        reader = MmapDocumentStore(self.metadata_path)
+
+        store1.upsert_document([Document(id="doc2", text="updated", embedding=[0.5, 0.6, 0.7, 0.8])])
+        store1.checkpoint()
+        second_generation = MmapDocumentStore._read_generation(self.metadata_path)
+        self.assertNotEqual(first_generation, second_generation)
+        # A reader of the previous manifest keeps reading its own generation
+        self.assertEqual(reader["doc2"].text, self.test_documents[1].text)
+        self.assertEqual(MmapDocumentStore(self.metadata_path)["doc2"].text, "updated")
+
+        store1.checkpoint()
+        self.assertFalse(os.path.exists(f"{self.metadata_path}.{first_generation}.blob"))
+        self.assertTrue(os.path.exists(f"{self.metadata_path}.{second_generation}.blob"))
+
+    def test_legacy_metadata_snapshot(self):
+        """Test metadata snapshots pickled by older versions are still loaded."""
+        import pickle
+
+        store1 = self.create_store()
+        store1._new_client()
+        store1.insert_document(self.test_documents)
+        with open(self.metadata_path, "wb") as f:
+            pickle.dump({
+                "document_store": {doc.id: doc for doc in self.test_documents},
+                "id_to_index": dict(store1.id_to_index),
+                "index_to_id": dict(store1.index_to_id),
+                "next_index": 5,
+            }, f)
+
+        store2 = self.create_store()
+        store2._new_client()
+        self.assertIsInstance(store2.document_store, dict)
+        self.assertEqual(store2.get_document_count(), 5)
+        self.assertEqual(store2.query(Query(embeddings=[[0.9, 1.0, 1.1, 1.2]], similarity_top_k=1))[0].id, "doc3")
+
+    def test_read_only_mmap_index(self):
+        """Test a read-only store maps the index and rejects writes."""
+        store1 = self.create_store()
+        store1._new_client()
+        store1.insert_document(self.test_documents)
+        store1.checkpoint()
+
+        reader = self.create_store()
+        reader.read_only = True
+        reader._new_client()
+        self.assertEqual(reader.faiss_index.ntotal, 5)
+        results = reader.query(Query(embeddings=[[0.2, 0.4, 0.6, 0.8]], similarity_top_k=2))
+        self.assertEqual(results[0].id, "doc4")
+        with self.assertRaises(ValueError):
+            reader.insert_document([Document(id="doc6", text="new", embedding=[0.1, 0.1, 0.1, 0.1])])
+        with self.assertRaises(ValueError):
+            reader.delete_document("doc1")
+
+        # The writer replaces the files, the reader keeps serving its mapped snapshot
+        store1.insert_document([Document(id="doc6", text="new", embedding=[0.1, 0.1, 0.1, 0.1])])
+        store1.checkpoint()
+        self.assertEqual(reader.get_document_count(), 5)
+        self.assertEqual(reader.get_document_by_id("doc4").text, self.test_documents[3].text)
+
+    def test_compact_embedding(self):
+        """Test the compact mode keeps the embeddings as numpy arrays through writes, queries and reloads."""
+        store1 = self.create_store()
+        store1.compact_embedding = True
+        store1._new_client()
+        store1.insert_document(self.test_documents)
+        stored = store1.get_document_by_id("doc3")
+        self.assertIsInstance(stored.embedding, np.ndarray)
+        self.assertEqual(stored.embedding.dtype, np.float32)
+        np.testing.assert_allclose(stored.embedding, self.test_documents[2].embedding, rtol=1e-6)
+
+        results = store1.query(Query(embeddings=[[0.9, 1.0, 1.1, 1.2]], similarity_top_k=2))
+        self.assertEqual(results[0].id, "doc3")
+        self.assertTrue(np.shares_memory(results[0].embedding, stored.embedding))
+        self.assertIn("score", results[0].metadata)
+        self.assertNotIn("score", stored.metadata)
+        self.assertEqual(results[0].model_dump(mode="json")["embedding"], stored.embedding.tolist())
+
+        # Records replayed from the metadata log and rows of the snapshot stay compact
+        store2 = self.create_store()
+        store2.compact_embedding = True
+        store2._new_client()
+        self.assertIsInstance(store2.get_document_by_id("doc1").embedding, np.ndarray)
+        store2.checkpoint()
+        store3 = self.create_store()
+        store3.compact_embedding = True
+        store3._new_client()
+        self.assertIsInstance(store3.get_document_by_id("doc1").embedding, np.ndarray)
+        self.assertEqual(store3.query(Query(embeddings=[[0.2, 0.4, 0.6, 0.8]], similarity_top_k=1))[0].id, "doc4")
+
 
 if __name__ == "__main__":
     # Configure test logging
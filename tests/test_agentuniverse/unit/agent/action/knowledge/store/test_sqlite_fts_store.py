@@ -0,0 +1,72 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 21:40
+# @Author  : fanen.lhy
+# @Email   : fanen.lhy@antgroup.com
+# @FileName: test_sqlite_fts_store.py
+import os
+import shutil
+import tempfile
+import unittest
+
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.query import Query
+from agentuniverse.agent.action.knowledge.store.sqlite_fts_store import SQLiteFTSStore
+
+
+class SQLiteFTSStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = SQLiteFTSStore(db_path=os.path.join(self.temp_dir, "sqlite_fts_store.db"))
+        self.store._new_client()
+        self.documents = [
+            Document(id="doc1", text="Python is a programming language for data science",
+                     metadata={"source": "a"}),
+            Document(id="doc2", text="FAISS is a library for similarity search"),
+            Document(id="doc3", text="Python library for machine learning and data analysis"),
+            Document(id="doc4", text="自然语言处理是人工智能的一个分支"),
+        ]
+        self.store.insert_document(self.documents)
+
+    def tearDown(self):
+        self.store.conn.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_query_ranks_by_bm25(self):
+        results = self.store.query(Query(query_str="Python data library"))
+        self.assertEqual(results[0].id, "doc3")
+        self.assertEqual({doc.id for doc in results}, {"doc1", "doc2", "doc3"})
+        scores = [doc.metadata["score"] for doc in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(self.store.query(Query(query_str="人工智能"))[0].id, "doc4")
+        self.assertEqual(self.store.query(Query(query_str="the of", similarity_top_k=1)), [])
+
+    def test_upsert_and_delete(self):
+        self.store.upsert_document([Document(id="doc2", text="similarity search with Python")])
+        self.store.delete_document("doc1")
+        results = self.store.query(Query(query_str="Python", similarity_top_k=5))
+        self.assertEqual({doc.id for doc in results}, {"doc2", "doc3"})
+        self.assertEqual(self.store.query(Query(query_str="FAISS")), [])
+        self.store.optimize()
+        self.assertEqual(self.store.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0], 3)
+
+    def test_query_after_vacuum(self):
+        columns = {row[1]: row for row in self.store.conn.execute("PRAGMA table_info(documents)")}
+        # the index is keyed on the explicit primary key, which a VACUUM never renumbers
+        self.assertEqual((columns["rowid_pk"][2], columns["rowid_pk"][5]), ("INTEGER", 1))
+        self.store.delete_document("doc1")
+        self.store.delete_document("doc2")
+        self.store.conn.execute("VACUUM")
+        results = self.store.query(Query(query_str="machine learning"))
+        self.assertEqual([doc.id for doc in results], ["doc3"])
+        self.assertEqual(self.store.query(Query(query_str="人工智能"))[0].id, "doc4")
+
+    def test_query_keywords(self):
+        results = self.store.query(Query(query_str="ignored", keywords={"similarity"}))
+        self.assertEqual([doc.id for doc in results], ["doc2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
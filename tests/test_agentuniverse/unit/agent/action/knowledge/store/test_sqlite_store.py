@@ -0,0 +1,147 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 21:00
+# @Author  : fanen.lhy
+# @Email   : fanen.lhy@antgroup.com
+# @FileName: test_sqlite_store.py
+import math
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+import jieba
+
+from agentuniverse.agent.action.knowledge.doc_processor.jieba_keyword_extractor import JiebaKeywordExtractor
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.query import Query
+from agentuniverse.agent.action.knowledge.store.sqlite_store import SQLiteStore
+
+TEXTS = [
+    "Python is a programming language for data science",
+    "FAISS is a library for similarity search",
+    "Python library for machine learning and data analysis",
+    "自然语言处理是人工智能的一个分支",
+    "机器学习 Python 数据 Python",
+]
+
+
+class SQLiteStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "sqlite_store.db")
+        patcher = patch("agentuniverse.agent.action.knowledge.store.sqlite_store.DocProcessorManager")
+        patcher.start().return_value.get_instance_obj.return_value = JiebaKeywordExtractor(top_k=3)
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_store(self) -> SQLiteStore:
+        store = SQLiteStore(db_path=self.db_path, keyword_extractor="jieba_keyword_extractor")
+        store._new_client()
+        self.addCleanup(store.conn.close)
+        return store
+
+    def reference_scores(self, store: SQLiteStore, query: Query):
+        """Score the candidates with the per-document BM25 of the text."""
+        inverted_index = {term: [row[0] for row in store.conn.execute(
+            "SELECT doc_id FROM inverted_index WHERE term = ?", (term,))] for term in query.keywords}
+        total_doc_count = store._get_all_docs_count()
+        avg_doc_length = store._get_all_docs_words_count() / total_doc_count
+        scores = {}
+        for doc_id in set(sum(inverted_index.values(), [])):
+            text = store.conn.execute("SELECT text FROM documents WHERE id = ?", (doc_id,)).fetchone()[0]
+            doc_words = jieba.lcut(text)
+            doc_counter = Counter(doc_words)
+            score = 0
+            for term in jieba.lcut(query.query_str):
+                if term not in inverted_index:
+                    continue
+                num_docs_with_term = len(inverted_index[term])
+                idf = math.log((total_doc_count - num_docs_with_term + 0.5) / (num_docs_with_term + 0.5) + 1)
+                score += idf * (doc_counter[term] * (store.k1 + 1)) / (
+                        doc_counter[term] + store.k1 * (1 - store.b + store.b * len(doc_words) / avg_doc_length))
+            scores[text] = score
+        return scores
+
+    def test_query_matches_reference_bm25(self):
+        store = self.create_store()
+        store.insert_document([Document(text=text) for text in TEXTS])
+        for query_str in ["Python data library", "similarity search library", "人工智能 Python"]:
+            query = Query(query_str=query_str)
+            results = store.query(query)
+            scores = self.reference_scores(store, query)
+            self.assertEqual({doc.text for doc in results}, set(scores))
+            result_scores = [scores[doc.text] for doc in results]
+            self.assertEqual(result_scores, sorted(result_scores, reverse=True))
+
+    def test_corpus_stats_incremental(self):
+        store = self.create_store()
+        documents = [Document(text=text) for text in TEXTS]
+        store.insert_document(documents)
+        store.upsert_document([Document(id=documents[0].id, text="Python data")])
+        store.delete_document(documents[1].id)
+        doc_count, word_count = store.conn.execute(
+            "SELECT COUNT(*), SUM(word_count) FROM documents").fetchone()
+        self.assertEqual(store._get_all_docs_count(), doc_count)
+        self.assertEqual(store._get_all_docs_words_count(), word_count)
+        self.assertEqual(store.conn.execute(
+            "SELECT COUNT(*) FROM term_frequency WHERE doc_id = ?", (documents[1].id,)).fetchone()[0], 0)
+
+    def test_lookups_use_indexes(self):
+        store = self.create_store()
+        self.assertEqual(store.conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        for statement in ["SELECT doc_id FROM inverted_index WHERE term = 'Python'",
+                          "DELETE FROM inverted_index WHERE doc_id = 'doc1'",
+                          "DELETE FROM term_frequency WHERE doc_id = 'doc1'"]:
+            plan = " ".join(row[-1] for row in store.conn.execute(f"EXPLAIN QUERY PLAN {statement}"))
+            self.assertIn("USING", plan)
+            self.assertNotIn("SCAN", plan)
+
+    def test_bulk_load(self):
+        store = self.create_store()
+        with store.bulk_load():
+            self.assertEqual(store.conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'").fetchone()[0], 0)
+            store.insert_document([Document(text=text) for text in TEXTS])
+            # Replaced documents are removed by one statement per table, not one scan per id
+            documents = [Document(text=text) for text in TEXTS]
+            store.upsert_document(documents)
+            statements = []
+            store.conn.set_trace_callback(statements.append)
+            store.delete_document(documents[0].id)
+            store.conn.set_trace_callback(None)
+            self.assertEqual(len([statement for statement in statements if statement.startswith("DELETE FROM")]), 4)
+            self.assertEqual(len([statement for statement in statements if "IN (SELECT id FROM removed_ids)"
+                                  in statement]), 3)
+        self.assertEqual(store.conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'").fetchone()[0], 4)
+        self.assertEqual(store._get_all_docs_count(), len(TEXTS) - 1)
+        self.assertEqual(store.conn.execute(
+            "SELECT COUNT(DISTINCT doc_id) FROM term_frequency").fetchone()[0], len(TEXTS) - 1)
+        self.assertEqual(store.query(Query(query_str="similarity search"))[0].text, TEXTS[1])
+
+    def test_statistics_rebuilt_for_legacy_db(self):
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.execute("CREATE TABLE documents (id TEXT PRIMARY KEY, text TEXT, word_count INT, metadata TEXT)")
+            conn.execute("CREATE TABLE inverted_index (term TEXT, doc_id TEXT)")
+            conn.execute("INSERT INTO documents VALUES ('doc1', 'Python data', 3, NULL)")
+            conn.execute("INSERT INTO inverted_index VALUES ('Python', 'doc1')")
+        conn.close()
+
+        store = self.create_store()
+        self.assertEqual(store._get_all_docs_count(), 1)
+        self.assertEqual(store._get_all_docs_words_count(), 3)
+        results = store.query(Query(query_str="Python", keywords={"Python"}))
+        self.assertEqual([doc.id for doc in results], ["doc1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
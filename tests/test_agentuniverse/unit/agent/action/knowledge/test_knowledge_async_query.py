@@ -0,0 +1,94 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 02:00
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_knowledge_async_query.py
+import asyncio
+import threading
+import time
+import unittest
+from typing import Any, List
+from unittest.mock import patch
+
+from agentuniverse.agent.action.knowledge.doc_processor.doc_processor import DocProcessor
+from agentuniverse.agent.action.knowledge.knowledge import Knowledge
+from agentuniverse.agent.action.knowledge.rag_router.base_router import BaseRouter
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.query import Query
+from agentuniverse.agent.action.knowledge.store.store import Store
+
+# The names of the threads which ran the store queries
+QUERY_THREADS: List[str] = []
+
+
+class AsyncStore(Store):
+    """Answers a query after a delay on the event loop, recording the threads used."""
+    delay: float = 0.1
+    fail: bool = False
+
+    async def async_query(self, query: Query, **kwargs: Any) -> List[Document]:
+        QUERY_THREADS.append(threading.current_thread().name)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise Exception('store unavailable')
+        return [Document(text=f'{self.name} {query.query_str}'), Document(text='shared')]
+
+
+class ReverseProcessor(DocProcessor):
+    """Reverses the documents in its async path only."""
+
+    def _process_docs(self, origin_docs: List[Document], query: Query = None) -> List[Document]:
+        raise Exception('the sync path is not expected')
+
+    async def _async_process_docs(self, origin_docs: List[Document], query: Query = None) -> List[Document]:
+        return list(reversed(origin_docs))
+
+
+class KnowledgeAsyncQueryTest(unittest.TestCase):
+    """
+    Test cases for the async query path of Knowledge
+    """
+
+    def setUp(self) -> None:
+        QUERY_THREADS.clear()
+        self.stores = {'first': AsyncStore(name='first'), 'second': AsyncStore(name='second'),
+                       'broken': AsyncStore(name='broken', fail=True)}
+        store_patcher = patch('agentuniverse.agent.action.knowledge.knowledge.StoreManager')
+        store_patcher.start().return_value.get_instance_obj.side_effect = self.stores.get
+        self.addCleanup(store_patcher.stop)
+        router_patcher = patch('agentuniverse.agent.action.knowledge.knowledge.RagRouterManager')
+        router_patcher.start().return_value.get_instance_obj.return_value = BaseRouter()
+        self.addCleanup(router_patcher.stop)
+        processor_patcher = patch('agentuniverse.agent.action.knowledge.knowledge.DocProcessorManager')
+        processor_patcher.start().return_value.get_instance_obj.return_value = ReverseProcessor()
+        self.addCleanup(processor_patcher.stop)
+        trace_patcher = patch('agentuniverse.base.annotation.trace.ConversationMemoryModule')
+        trace_patcher.start()
+        self.addCleanup(trace_patcher.stop)
+
+    def test_async_query_fans_out(self) -> None:
+        knowledge = Knowledge(name=self.id(), stores=['first', 'second', 'broken'], post_processors=['reverse'])
+        start = time.monotonic()
+        documents = asyncio.run(knowledge.async_query_knowledge(query_str='faq'))
+        # The stores are queried at once on the event loop, the broken one is skipped
+        self.assertLess(time.monotonic() - start, 0.25)
+        self.assertEqual(set(QUERY_THREADS), {threading.current_thread().name})
+        self.assertEqual([document.text for document in documents], ['second faq', 'shared', 'first faq'])
+
+    def test_async_query_coalesced(self) -> None:
+        knowledge = Knowledge(name=self.id(), stores=['first'], query_cache_size=10)
+
+        async def query_many():
+            return await asyncio.gather(*[knowledge.async_query_knowledge(query_str='faq') for _ in range(5)])
+
+        results = asyncio.run(query_many())
+        self.assertEqual(len(QUERY_THREADS), 1)
+        self.assertEqual({len(result) for result in results}, {2})
+        self.assertIn('first faq', asyncio.run(knowledge.async_langchain_query('{"query_str": "faq"}')))
+        self.assertEqual(len(QUERY_THREADS), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 23:50
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_knowledge_batch_insert.py
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from typing import Any, ClassVar, List
+from unittest.mock import patch
+
+from agentuniverse.agent.action.knowledge.knowledge import Knowledge
+from agentuniverse.agent.action.knowledge.reader.reader import Reader
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.base.util.executor_registry import ExecutorRegistry
+
+
+class LineReader(Reader):
+    """Reads one document per line, failing on an empty file."""
+
+    def _load_data(self, file: str) -> List[Document]:
+        with open(file) as f:
+            lines = [line.strip() for line in f if line.strip()]
+        if not lines:
+            raise ValueError(f"empty file {os.path.basename(file)}")
+        return [Document(text=line, metadata={"pid": os.getpid()}) for line in lines]
+
+
+class CpuLineReader(LineReader):
+    """A CPU bound flavour of the line reader, run in worker processes."""
+    cpu_bound: ClassVar[bool] = True
+
+
+class RecordingStore(object):
+
+    def __init__(self):
+        self.documents = []
+        self.lock = threading.Lock()
+
+    def insert_document(self, documents: List[Document], **kwargs: Any):
+        with self.lock:
+            self.documents.extend(documents)
+
+
+class KnowledgeBatchInsertTest(unittest.TestCase):
+    """
+    Test cases for the bulk ingestion of Knowledge
+    """
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.temp_dir, 'sub'))
+        for i in range(6):
+            self._write(f'sub/doc_{i}.txt' if i % 2 else f'doc_{i}.txt', f'text {i}\nmore {i}')
+        self._write('doc_6.cpu', 'cpu 6')
+        self._write('empty.txt', '')
+        self._write('unknown.bin', 'bin')
+        readers = {'txt': LineReader(), 'cpu': CpuLineReader()}
+        reader_patcher = patch('agentuniverse.agent.action.knowledge.knowledge.ReaderManager')
+        reader_patcher.start().return_value.get_file_default_reader.side_effect = readers.get
+        self.addCleanup(reader_patcher.stop)
+        self.store = RecordingStore()
+        store_patcher = patch('agentuniverse.agent.action.knowledge.knowledge.StoreManager')
+        store_patcher.start().return_value.get_instance_obj.return_value = self.store
+        self.addCleanup(store_patcher.stop)
+        self.knowledge = Knowledge(name='test_knowledge', stores=['test_store'])
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, name: str, content: str) -> None:
+        with open(os.path.join(self.temp_dir, name), 'w') as f:
+            f.write(content)
+
+    def test_directory_ingestion(self) -> None:
+        progress = []
+        report = self.knowledge.batch_insert_knowledge(
+            source_dir=self.temp_dir, max_workers=3,
+            progress_callback=lambda done, total, path, error: progress.append((done, total, error is None)))
+        self.assertEqual(report['total'], 9)
+        self.assertEqual(len(report['succeeded']), 7)
+        # Failing files are isolated and reported
+        self.assertEqual({os.path.basename(path) for path in report['failed']}, {'empty.txt', 'unknown.bin'})
+        self.assertIn('empty file', next(error for path, error in report['failed'].items()
+                                         if path.endswith('empty.txt')))
+        self.assertEqual(len(self.store.documents), 13)
+        self.assertEqual(sorted(done for done, _, _ in progress), list(range(1, 10)))
+        # The CPU bound reader runs in a worker process
+        cpu_document = next(document for document in self.store.documents if document.text == 'cpu 6')
+        self.assertNotEqual(cpu_document.metadata['pid'], os.getpid())
+
+    def test_glob_and_manifest(self) -> None:
+        report = self.knowledge.batch_insert_knowledge(source_dir=self.temp_dir, glob_pattern='sub/*.txt')
+        self.assertEqual(len(report['succeeded']), 3)
+        manifest_path = os.path.join(self.temp_dir, 'manifest.json')
+        with open(manifest_path, 'w') as f:
+            json.dump(['doc_0.txt', os.path.join(self.temp_dir, 'sub', 'doc_1.txt')], f)
+        report = self.knowledge.batch_insert_knowledge(source_manifest=manifest_path)
+        self.assertEqual(report['failed'], {})
+        self.assertEqual(len(report['succeeded']), 2)
+        self.assertEqual(len(self.store.documents), 10)
+
+    def test_shared_ingest_pool(self) -> None:
+        executor = ExecutorRegistry().get_executor('knowledge_ingest')
+        submitted = executor.get_stats()['submitted']
+        running, max_running = [0], [0]
+        lock = threading.Lock()
+        load_data = LineReader._load_data
+
+        def tracked_load_data(reader, file):
+            with lock:
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+            try:
+                return load_data(reader, file)
+            finally:
+                with lock:
+                    running[0] -= 1
+
+        with patch.object(LineReader, '_load_data', tracked_load_data):
+            report = self.knowledge.batch_insert_knowledge(source_dir=self.temp_dir, glob_pattern='**/*.txt',
+                                                           max_workers=1)
+        self.assertEqual(len(report['succeeded']), 6)
+        # The files are read on the shared pool, no more at once than the max workers of the call
+        self.assertEqual(executor.get_stats()['submitted'] - submitted, 7)
+        self.assertEqual(max_running[0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
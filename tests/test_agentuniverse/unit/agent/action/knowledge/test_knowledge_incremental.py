@@ -0,0 +1,114 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 00:30
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_knowledge_incremental.py
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from typing import Any, List
+from unittest.mock import patch
+
+from agentuniverse.agent.action.knowledge.knowledge import Knowledge
+from agentuniverse.agent.action.knowledge.reader.reader import Reader
+from agentuniverse.agent.action.knowledge.store.document import Document
+
+
+class LineReader(Reader):
+    """Yields one document per line, counting the files read."""
+    read_count: int = 0
+
+    def _load_data(self, file: str) -> List[Document]:
+        self.read_count += 1
+        with open(file) as f:
+            return [Document(text=line.strip()) for line in f if line.strip()]
+
+
+class RecordingStore(object):
+    """Keeps the documents by id and records the upserted and deleted ids."""
+
+    def __init__(self):
+        self.documents = {}
+        self.upserted = []
+        self.deleted = []
+        self.lock = threading.Lock()
+
+    def upsert_document(self, documents: List[Document], **kwargs: Any):
+        with self.lock:
+            for document in documents:
+                self.documents[document.id] = document.text
+                self.upserted.append(document.text)
+
+    def delete_document(self, document_id: str, **kwargs: Any):
+        with self.lock:
+            self.documents.pop(document_id, None)
+            self.deleted.append(document_id)
+
+
+class KnowledgeIncrementalTest(unittest.TestCase):
+    """
+    Test cases for the incremental re-ingestion of Knowledge
+    """
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.manifest_path = os.path.join(self.temp_dir, 'manifest.json')
+        self.reader = LineReader()
+        self.store = RecordingStore()
+        reader_patcher = patch('agentuniverse.agent.action.knowledge.knowledge.ReaderManager')
+        reader_patcher.start().return_value.get_file_default_reader.return_value = self.reader
+        self.addCleanup(reader_patcher.stop)
+        store_patcher = patch('agentuniverse.agent.action.knowledge.knowledge.StoreManager')
+        store_patcher.start().return_value.get_instance_obj.return_value = self.store
+        self.addCleanup(store_patcher.stop)
+        self.knowledge = Knowledge(name='test_knowledge', stores=['test_store'], manifest_path=self.manifest_path)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_source(self, name: str, lines: List[str]) -> str:
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines))
+        return path
+
+    def test_update_changed_chunks_only(self) -> None:
+        source = self.write_source('a.txt', ['alpha', 'beta', 'gamma'])
+        self.knowledge.update_knowledge(source_path=source)
+        self.assertEqual(sorted(self.store.upserted), ['alpha', 'beta', 'gamma'])
+
+        # An unchanged file is not even read
+        self.knowledge.update_knowledge(source_path=source)
+        self.assertEqual(self.reader.read_count, 1)
+
+        self.store.upserted.clear()
+        self.write_source('a.txt', ['alpha', 'delta', 'gamma'])
+        self.knowledge.update_knowledge(source_path=source)
+        self.assertEqual(self.store.upserted, ['delta'])
+        self.assertEqual(len(self.store.deleted), 1)
+        self.assertEqual(sorted(self.store.documents.values()), ['alpha', 'delta', 'gamma'])
+
+    def test_sync_knowledge(self) -> None:
+        first = self.write_source('a.txt', ['alpha', 'shared'])
+        second = self.write_source('b.txt', ['beta', 'shared'])
+        report = self.knowledge.sync_knowledge(source_paths=[first, second])
+        self.assertEqual(sorted(report['updated']), [first, second])
+
+        self.write_source('b.txt', ['beta', 'epsilon', 'shared'])
+        report = self.knowledge.sync_knowledge(source_paths=[first, second])
+        self.assertEqual(report['unchanged'], [first])
+        self.assertEqual(report['updated'], [second])
+
+        # Removing a source deletes its chunks, except those another source still holds
+        report = self.knowledge.sync_knowledge(source_paths=[second])
+        self.assertEqual(report['removed'], [first])
+        self.assertEqual(sorted(self.store.documents.values()), ['beta', 'epsilon', 'shared'])
+        self.assertEqual(report['failed'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 01:20
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_knowledge_query_cache.py
+import threading
+import time
+import unittest
+from typing import Any, List
+from unittest.mock import patch
+
+from agentuniverse.agent.action.knowledge.knowledge import Knowledge
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.query import Query
+
+
+class CountingStore(object):
+    """Answers every query slowly with the query string, counting the queries."""
+
+    def __init__(self):
+        self.query_count = 0
+        self.lock = threading.Lock()
+
+    def query(self, query: Query, **kwargs: Any) -> List[Document]:
+        with self.lock:
+            self.query_count += 1
+        time.sleep(0.05)
+        return [Document(text=f'{query.query_str} {self.query_count}')]
+
+    def insert_document(self, documents: List[Document], **kwargs: Any):
+        pass
+
+
+class KnowledgeQueryCacheTest(unittest.TestCase):
+    """
+    Test cases for the query cache of Knowledge
+    """
+
+    def setUp(self) -> None:
+        self.store = CountingStore()
+        store_patcher = patch('agentuniverse.agent.action.knowledge.knowledge.StoreManager')
+        store_patcher.start().return_value.get_instance_obj.return_value = self.store
+        self.addCleanup(store_patcher.stop)
+        router_patcher = patch('agentuniverse.agent.action.knowledge.knowledge.RagRouterManager')
+        router_patcher.start().return_value.get_instance_obj.return_value.rag_route.side_effect = \
+            lambda query, stores: [(query, store) for store in stores]
+        self.addCleanup(router_patcher.stop)
+        reader_patcher = patch('agentuniverse.agent.action.knowledge.knowledge.ReaderManager')
+        reader_patcher.start().return_value.get_file_default_reader.return_value.load_data.return_value = \
+            [Document(text='new')]
+        self.addCleanup(reader_patcher.stop)
+        trace_patcher = patch('agentuniverse.base.annotation.trace.ConversationMemoryModule')
+        trace_patcher.start()
+        self.addCleanup(trace_patcher.stop)
+
+    def test_cache_and_invalidate(self) -> None:
+        knowledge = Knowledge(name=self.id(), stores=['test_store'], query_cache_size=10)
+        first = knowledge.query_knowledge(query_str='what is   agentUniverse', similarity_top_k=2)
+        second = knowledge.create_copy().query_knowledge(query_str=' what is agentUniverse ', similarity_top_k=2)
+        self.assertEqual(self.store.query_count, 1)
+        self.assertEqual([doc.text for doc in first], [doc.text for doc in second])
+        knowledge.query_knowledge(query_str='what is agentUniverse', similarity_top_k=3)
+        self.assertEqual(self.store.query_count, 2)
+
+        # A write through any copy of the knowledge drops the cached results
+        knowledge.create_copy().insert_knowledge(source_path='new.txt')
+        knowledge.query_knowledge(query_str='what is agentUniverse', similarity_top_k=2)
+        self.assertEqual(self.store.query_count, 3)
+        self.assertEqual(knowledge.get_query_cache().get_stats()['hits'], 1)
+
+    def test_coalesce_concurrent_queries(self) -> None:
+        knowledge = Knowledge(name=self.id(), stores=['test_store'], query_cache_size=10, query_cache_ttl=60)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(knowledge.query_knowledge(query_str='faq')))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.store.query_count, 1)
+        self.assertEqual({result[0].text for result in results}, {'faq 1'})
+        self.assertEqual(knowledge.get_query_cache().get_stats()['coalesced'] +
+                         knowledge.get_query_cache().get_stats()['hits'], 7)
+
+    def test_ttl_and_disabled_cache(self) -> None:
+        knowledge = Knowledge(name=self.id(), stores=['test_store'], query_cache_size=10, query_cache_ttl=0.01)
+        knowledge.query_knowledge(query_str='faq')
+        time.sleep(0.02)
+        knowledge.query_knowledge(query_str='faq')
+        self.assertEqual(self.store.query_count, 2)
+        knowledge = Knowledge(name=f'{self.id()}.disabled', stores=['test_store'])
+        knowledge.query_knowledge(query_str='faq')
+        knowledge.query_knowledge(query_str='faq')
+        self.assertEqual(self.store.query_count, 4)
+        self.assertIsNone(knowledge.get_query_cache())
+        knowledge = Knowledge(name=f'{self.id()}.no_ttl', stores=['test_store'], query_cache_size=10,
+                              query_cache_ttl=None)
+        with self.assertRaises(ValueError):
+            knowledge.query_knowledge(query_str='faq')
+
+    def test_cached_documents_are_copied(self) -> None:
+        knowledge = Knowledge(name=self.id(), stores=['test_store'], query_cache_size=10)
+        first = knowledge.query_knowledge(query_str='faq')
+        first[0].text = 'changed by the caller'
+        first[0].metadata = {'score': 1}
+        second = knowledge.query_knowledge(query_str='faq')
+        second[0].keywords.add('changed')
+        third = knowledge.query_knowledge(query_str='faq')
+        self.assertEqual(self.store.query_count, 1)
+        self.assertEqual(third[0].text, 'faq 1')
+        self.assertIsNone(third[0].metadata)
+        self.assertEqual(third[0].keywords, set())
+        self.assertIsNot(second[0], third[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 23:30
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_knowledge_stream.py
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from typing import Any, Iterator, List
+from unittest.mock import patch
+
+from agentuniverse.agent.action.knowledge.knowledge import Knowledge
+from agentuniverse.agent.action.knowledge.reader.reader import Reader
+from agentuniverse.agent.action.knowledge.store.document import Document
+
+
+class PageReader(Reader):
+    """Yields one document per line, recording how many were read."""
+    read_count: int = 0
+
+    def _load_data(self, file: str) -> List[Document]:
+        return list(self._iter_data(file))
+
+    def _iter_data(self, file: str) -> Iterator[Document]:
+        with open(file) as f:
+            for line in f:
+                self.read_count += 1
+                yield Document(text=line.strip())
+
+
+class RecordingStore(object):
+    """Records the written batches and how many documents were read when each was written."""
+
+    def __init__(self, reader: PageReader):
+        self.reader = reader
+        self.batches = []
+        self.read_counts = []
+        self.lock = threading.Lock()
+
+    def insert_document(self, documents: List[Document], **kwargs: Any):
+        with self.lock:
+            self.batches.append([document.text for document in documents])
+            self.read_counts.append(self.reader.read_count)
+
+    update_document = insert_document
+
+
+class KnowledgeStreamTest(unittest.TestCase):
+    """
+    Test cases for the streaming ingestion of Knowledge
+    """
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.temp_dir, 'pages.txt')
+        with open(self.source_path, 'w') as f:
+            f.write('\n'.join(f'page {i}' for i in range(25)))
+        self.reader = PageReader()
+        self.store = RecordingStore(self.reader)
+        reader_patcher = patch('agentuniverse.agent.action.knowledge.knowledge.ReaderManager')
+        reader_patcher.start().return_value.get_file_default_reader.return_value = self.reader
+        self.addCleanup(reader_patcher.stop)
+        store_patcher = patch('agentuniverse.agent.action.knowledge.knowledge.StoreManager')
+        store_patcher.start().return_value.get_instance_obj.return_value = self.store
+        self.addCleanup(store_patcher.stop)
+        self.knowledge = Knowledge(name='test_knowledge', stores=['test_store'], insert_batch_size=10)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_stream_insert(self) -> None:
+        self.knowledge.insert_knowledge(source_path=self.source_path, stream=True)
+        self.assertEqual([len(batch) for batch in self.store.batches], [10, 10, 5])
+        self.assertEqual(self.store.batches[0][0], 'page 0')
+        self.assertEqual(self.store.batches[-1][-1], 'page 24')
+        # The source is read lazily, at most one batch ahead of the stores
+        for batch_number, read_count in enumerate(self.store.read_counts):
+            self.assertLessEqual(read_count, (batch_number + 2) * 10)
+
+    def test_stream_processors_on_batches(self) -> None:
+        processed = []
+
+        def process(documents: List[Document]) -> List[Document]:
+            processed.append(len(documents))
+            return [document for document in documents if not document.text.endswith('3')]
+
+        with patch.object(Knowledge, '_update_process', side_effect=process):
+            self.knowledge.update_knowledge(source_path=self.source_path, stream=True)
+        self.assertEqual(processed, [10, 10, 5])
+        self.assertEqual(sum(len(batch) for batch in self.store.batches), 22)
+
+    def test_insert_without_stream(self) -> None:
+        self.knowledge.insert_knowledge(source_path=self.source_path)
+        self.assertEqual([len(batch) for batch in self.store.batches], [25])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 04:40
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_conversation_memory_writer.py
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from agentuniverse.agent.memory.conversation_memory.conversation_memory_writer import ConversationMemoryWriter
+from agentuniverse.agent.memory.conversation_memory.conversation_message import ConversationMessage
+from agentuniverse.agent.memory.conversation_memory.memory_storage.sqlite_conversation_memory_storage import \
+    SqliteMemoryStorage
+from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
+
+
+class ConversationMemoryWriterTest(unittest.TestCase):
+    """
+    Test cases for the write-behind batching of the conversation memory
+    """
+
+    def setUp(self) -> None:
+        self.memories = {'memory_a': Mock(), 'memory_b': Mock()}
+        manager_patcher = patch('agentuniverse.agent.memory.conversation_memory.conversation_memory_writer'
+                                '.MemoryManager')
+        manager_patcher.start().return_value.get_instance_obj.side_effect = self.memories.get
+        self.addCleanup(manager_patcher.stop)
+
+    @staticmethod
+    def message(i: int) -> ConversationMessage:
+        return ConversationMessage(id=f'message_{i}', content=f'content {i}', source='user', source_type='user',
+                                   target='agent', target_type='agent', type='input', metadata={'prefix': 'prefix'})
+
+    def test_flush_groups_by_memory_and_session(self) -> None:
+        writer = ConversationMemoryWriter(flush_interval=60)
+        messages = [self.message(i) for i in range(6)]
+        for i, message in enumerate(messages):
+            writer.append('memory_a', f'session_{i % 2}', message)
+        writer.append('memory_b', 'session_0', messages[0])
+        writer.flush()
+        memory_a = self.memories['memory_a']
+        self.assertEqual(memory_a.add.call_count, 2)
+        memory_a.add.assert_any_call(messages[0::2], session_id='session_0')
+        memory_a.add.assert_any_call(messages[1::2], session_id='session_1')
+        self.memories['memory_b'].add.assert_called_once_with([messages[0]], session_id='session_0')
+        stats = writer.get_stats()
+        self.assertEqual(stats['written'], 7)
+        self.assertEqual(stats['batches'], 3)
+        self.assertEqual(stats['pending'], 0)
+        writer.close()
+
+    def test_batch_size_triggers_flush(self) -> None:
+        writer = ConversationMemoryWriter(flush_interval=60, batch_size=5)
+        for i in range(5):
+            writer.append('memory_a', 'session', self.message(i))
+        deadline = time.monotonic() + 5
+        while writer.get_stats()['written'] < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.memories['memory_a'].add.assert_called_once()
+        self.assertEqual(len(self.memories['memory_a'].add.call_args.args[0]), 5)
+        writer.close()
+
+    def test_flush_interval(self) -> None:
+        writer = ConversationMemoryWriter(flush_interval=0.05)
+        writer.append('memory_a', 'session', self.message(0))
+        deadline = time.monotonic() + 5
+        while writer.get_stats()['written'] < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(writer.get_stats()['written'], 1)
+        writer.close()
+
+    def test_max_pending_blocks_append(self) -> None:
+        release = threading.Event()
+        self.memories['memory_a'].add.side_effect = lambda *args, **kwargs: release.wait(5)
+        writer = ConversationMemoryWriter(flush_interval=60, batch_size=2, max_pending=2)
+        writer.append('memory_a', 'session', self.message(0))
+        writer.append('memory_a', 'session', self.message(1))
+        # the flush thread is now blocked writing the first batch
+        writer.append('memory_a', 'session', self.message(2))
+        writer.append('memory_a', 'session', self.message(3))
+        appended = threading.Event()
+        thread = threading.Thread(target=lambda: (writer.append('memory_a', 'session', self.message(4)),
+                                                  appended.set()))
+        thread.start()
+        self.assertFalse(appended.wait(0.2))
+        release.set()
+        self.assertTrue(appended.wait(5))
+        thread.join()
+        writer.close()
+        self.assertEqual(writer.get_stats()['written'], 5)
+
+    def test_flush_races_background_flush(self) -> None:
+        written = []
+        self.memories['memory_a'].add.side_effect = lambda messages, session_id=None: written.extend(
+            message.id for message in messages)
+        taken = threading.Event()
+        write = ConversationMemoryWriter._ConversationMemoryWriter__write
+
+        def slow_write(writer, batch):
+            if batch and threading.current_thread().name == 'conversation_memory_writer' and not taken.is_set():
+                # the flush thread has taken the first batch and is held up before writing it
+                taken.set()
+                time.sleep(0.2)
+            write(writer, batch)
+
+        with patch.object(ConversationMemoryWriter, '_ConversationMemoryWriter__write', slow_write):
+            writer = ConversationMemoryWriter(flush_interval=0.05)
+            writer.append('memory_a', 'session', self.message(0))
+            self.assertTrue(taken.wait(5))
+            writer.append('memory_a', 'session', self.message(1))
+            writer.flush()
+            writer.close()
+        self.assertEqual(written, ['message_0', 'message_1'])
+
+    def test_failed_write_and_close(self) -> None:
+        writer = ConversationMemoryWriter(flush_interval=60)
+        writer.append('memory_missing', 'session', self.message(0))
+        writer.append('memory_a', 'session', self.message(1))
+        writer.close()
+        self.assertFalse(writer.append('memory_a', 'session', self.message(2)))
+        stats = writer.get_stats()
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(stats['written'], 1)
+        self.assertEqual(stats['dropped'], 1)
+
+    def test_sqlite_batch_add(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            configer = ComponentConfiger()
+            configer.name = 'test_sqlite_memory_storage'
+            configer.sqldb_path = f"sqlite:///{os.path.join(temp_dir, 'memory.db')}"
+            storage = SqliteMemoryStorage()._initialize_by_component_configer(configer)
+            messages = [self.message(i) for i in range(5)]
+            storage.add(messages[:3], session_id='session')
+            storage.add(messages + [messages[4]], session_id='session')
+            stored = storage.get(session_id='session', top_k=20)
+            self.assertEqual(sorted(message.id for message in stored), [message.id for message in messages])
+            storage.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 05:20
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_memory_fan_out.py
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from agentuniverse.agent.memory.memory import Memory
+from agentuniverse.agent.memory.message import Message
+
+
+class MemoryFanOutTest(unittest.TestCase):
+    """
+    Test cases for the concurrent writes of Memory to its storages
+    """
+
+    def setUp(self) -> None:
+        self.storages = {name: Mock() for name in ('ram_storage', 'sql_storage', 'chroma_storage')}
+        manager_patcher = patch('agentuniverse.agent.memory.memory.MemoryStorageManager')
+        manager_patcher.start().return_value.get_instance_obj.side_effect = self.storages.get
+        self.addCleanup(manager_patcher.stop)
+        self.messages = [Message(type='human', content='hello')]
+
+    def memory(self, **kwargs) -> Memory:
+        return Memory(name='test_memory', memory_storages=list(self.storages),
+                      memory_retrieval_storage='ram_storage', **kwargs)
+
+    def test_add_runs_storages_concurrently(self) -> None:
+        barrier = threading.Barrier(3, timeout=5)
+        for storage in self.storages.values():
+            storage.add.side_effect = lambda *args, **kwargs: barrier.wait()
+        self.memory().add(self.messages, session_id='session', agent_id='agent')
+        for storage in self.storages.values():
+            storage.add.assert_called_once_with(self.messages, 'session', 'agent')
+
+    def test_delete(self) -> None:
+        self.memory().delete(session_id='session', agent_id='agent')
+        for storage in self.storages.values():
+            storage.delete.assert_called_once_with('session', agent_id='agent')
+
+    def test_error_of_waited_storage_is_raised(self) -> None:
+        self.storages['sql_storage'].add.side_effect = RuntimeError('sql storage down')
+        with self.assertRaises(RuntimeError):
+            self.memory().add(self.messages, session_id='session')
+        self.storages['ram_storage'].add.assert_called_once()
+
+    def test_every_waited_error_is_logged(self) -> None:
+        self.storages['sql_storage'].add.side_effect = RuntimeError('sql storage down')
+        self.storages['chroma_storage'].add.side_effect = RuntimeError('chroma storage down')
+        with patch('agentuniverse.agent.memory.memory.LOGGER') as logger:
+            with self.assertRaises(RuntimeError):
+                self.memory().add(self.messages, session_id='session')
+        logged = ' '.join(call.args[0] for call in logger.error.call_args_list)
+        self.assertIn('sql storage down', logged)
+        self.assertIn('chroma storage down', logged)
+
+    def test_storage_timeout(self) -> None:
+        release = threading.Event()
+        self.storages['chroma_storage'].add.side_effect = lambda *args, **kwargs: release.wait(5)
+        start = time.monotonic()
+        self.memory(storage_timeout=0.1).add(self.messages, session_id='session')
+        self.assertLess(time.monotonic() - start, 2)
+        release.set()
+        self.storages['ram_storage'].add.assert_called_once()
+
+    def test_async_storages_are_not_waited(self) -> None:
+        release = threading.Event()
+        done = threading.Event()
+
+        def slow_add(*args, **kwargs):
+            release.wait(5)
+            done.set()
+            raise RuntimeError('chroma storage down')
+
+        self.storages['chroma_storage'].add.side_effect = slow_add
+        self.storages['ram_storage'].add.side_effect = lambda *args, **kwargs: time.sleep(0.05)
+        self.memory(async_storages=['chroma_storage', 'ram_storage']).add(self.messages, session_id='session')
+        # the retrieval storage is waited for even if listed as async
+        self.storages['ram_storage'].add.assert_called_once()
+        self.assertFalse(done.is_set())
+        release.set()
+        self.assertTrue(done.wait(5))
+
+    def test_single_storage_runs_inline(self) -> None:
+        threads = []
+        self.storages['ram_storage'].add.side_effect = lambda *args, **kwargs: threads.append(
+            threading.current_thread())
+        memory = Memory(name='test_memory', memory_storages=['ram_storage'], memory_retrieval_storage='ram_storage')
+        memory.add(self.messages, session_id='session')
+        self.assertEqual(threads, [threading.current_thread()])
+
+
+if __name__ == '__main__':
+    unittest.main()
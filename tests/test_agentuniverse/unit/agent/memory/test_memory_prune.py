@@ -0,0 +1,52 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 03:10
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_memory_prune.py
+import unittest
+from unittest.mock import Mock, patch
+
+from agentuniverse.agent.memory.memory import Memory
+from agentuniverse.agent.memory.message import Message
+from agentuniverse.base.util.memory_util import get_memory_string
+
+
+class MemoryPruneTest(unittest.TestCase):
+    """
+    Test cases for the incremental token accounting of Memory.prune
+    """
+
+    def setUp(self) -> None:
+        self.llm = Mock()
+        self.llm.get_num_tokens.side_effect = lambda text: len(text.split())
+        llm_patcher = patch('agentuniverse.base.util.memory_util.LLMManager')
+        llm_patcher.start().return_value.get_instance_obj.return_value = self.llm
+        self.addCleanup(llm_patcher.stop)
+        compressor_patcher = patch('agentuniverse.agent.memory.memory.MemoryCompressorManager')
+        compressor_patcher.start().return_value.get_instance_obj.return_value = None
+        self.addCleanup(compressor_patcher.stop)
+        self.messages = [Message(type='human', content=f'{self.id()} message {i} ' + 'word ' * 5)
+                         for i in range(200)]
+
+    def test_prune_keeps_latest_messages(self) -> None:
+        memory = Memory(name='test_memory', max_tokens=100)
+        memory.agent_llm_name = 'test_llm'
+        pruned = memory.prune(self.messages)
+        self.assertEqual(pruned, self.messages[-len(pruned):])
+        self.assertLessEqual(len(get_memory_string(pruned).split()), 100)
+        self.assertGreater(len(get_memory_string(self.messages[-len(pruned) - 1:]).split()), 100)
+
+    def test_prune_tokenizes_each_message_once(self) -> None:
+        memory = Memory(name='test_memory', max_tokens=100)
+        memory.agent_llm_name = 'test_llm'
+        memory.prune(self.messages)
+        self.assertEqual(self.llm.get_num_tokens.call_count, len(self.messages))
+        # The next turn only tokenizes the new message
+        memory.prune(self.messages + [Message(type='ai', content=f'{self.id()} reply')])
+        self.assertEqual(self.llm.get_num_tokens.call_count, len(self.messages) + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
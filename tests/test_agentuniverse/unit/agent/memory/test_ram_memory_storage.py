@@ -0,0 +1,101 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 03:40
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_ram_memory_storage.py
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from agentuniverse.agent.memory.memory_storage.ram_memory_storage import RamMemoryStorage
+from agentuniverse.agent.memory.message import Message
+
+
+class RamMemoryStorageTest(unittest.TestCase):
+    """
+    Test cases for the bounds and the thread safety of RamMemoryStorage
+    """
+
+    @staticmethod
+    def messages(count: int, prefix: str = 'message'):
+        return [Message(type='human', content=f'{prefix} {i}') for i in range(count)]
+
+    def test_unbounded_by_default(self) -> None:
+        storage = RamMemoryStorage(name='test_ram')
+        storage.add(self.messages(30), session_id='s1', agent_id='a1')
+        self.assertEqual(len(storage.get(session_id='s1', agent_id='a1', top_k=100)), 30)
+        self.assertEqual(storage.get(session_id='s1', agent_id='a1')[-1].content, 'message 29')
+        self.assertEqual(storage.get(session_id='missing', agent_id='a1'), [])
+
+    def test_max_session_messages(self) -> None:
+        storage = RamMemoryStorage(name='test_ram', max_session_messages=5)
+        messages = self.messages(12)
+        storage.add(messages[:7], session_id='s1', agent_id='a1')
+        storage.add(messages[7:], session_id='s1', agent_id='a1')
+        self.assertEqual(storage.get(session_id='s1', agent_id='a1', top_k=100), messages[-5:])
+        stats = storage.get_stats()
+        self.assertEqual(stats['messages'], 5)
+        self.assertEqual(stats['dropped_messages'], 7)
+        self.assertEqual(stats['content_size'], sum(len(m.content) for m in messages[-5:]))
+
+    def test_max_sessions_evicts_least_recently_used(self) -> None:
+        storage = RamMemoryStorage(name='test_ram', max_sessions=2)
+        storage.add(self.messages(1), session_id='s1', agent_id='a1')
+        storage.add(self.messages(1), session_id='s2', agent_id='a1')
+        storage.get(session_id='s1', agent_id='a1')
+        storage.add(self.messages(1), session_id='s3', agent_id='a1')
+        self.assertEqual(len(storage.get(session_id='s1', agent_id='a1')), 1)
+        self.assertEqual(storage.get(session_id='s2', agent_id='a1'), [])
+        self.assertEqual(len(storage.get(session_id='s3', agent_id='a1')), 1)
+        stats = storage.get_stats()
+        self.assertEqual(stats['sessions'], 2)
+        self.assertEqual(stats['evicted_sessions'], 1)
+
+    def test_session_ttl(self) -> None:
+        storage = RamMemoryStorage(name='test_ram', session_ttl=10)
+        with patch('agentuniverse.agent.memory.memory_storage.ram_memory_storage.time.monotonic') as monotonic:
+            monotonic.return_value = 100
+            storage.add(self.messages(2), session_id='s1', agent_id='a1')
+            storage.add(self.messages(2), session_id='s2', agent_id='a1')
+            monotonic.return_value = 105
+            storage.get(session_id='s2', agent_id='a1')
+            monotonic.return_value = 112
+            self.assertEqual(storage.get(session_id='s1', agent_id='a1'), [])
+            self.assertEqual(len(storage.get(session_id='s2', agent_id='a1')), 2)
+        stats = storage.get_stats()
+        self.assertEqual(stats['sessions'], 1)
+        self.assertEqual(stats['expired_sessions'], 1)
+
+    def test_delete(self) -> None:
+        storage = RamMemoryStorage(name='test_ram')
+        storage.add(self.messages(3), session_id='s1', agent_id='a1')
+        storage.add(self.messages(3), session_id='s1', agent_id='a2')
+        storage.delete(session_id='s1', agent_id='a1')
+        self.assertEqual(storage.get(session_id='s1', agent_id='a1'), [])
+        self.assertEqual(len(storage.get(session_id='s1', agent_id='a2')), 3)
+        self.assertEqual(storage.get_stats()['content_size'], sum(len(m.content) for m in self.messages(3)))
+        storage.delete(session_id='s1')
+        self.assertEqual(storage.get_stats()['sessions'], 0)
+        self.assertEqual(storage.get_stats()['content_size'], 0)
+
+    def test_concurrent_add(self) -> None:
+        storage = RamMemoryStorage(name='test_ram', max_sessions=4, max_session_messages=50)
+
+        def add(i: int) -> None:
+            for j in range(20):
+                storage.add(self.messages(5, f'{i}-{j}'), session_id=f's{i % 8}', agent_id='a1')
+                storage.get(session_id=f's{(i + 1) % 8}', agent_id='a1')
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(add, range(16)))
+        stats = storage.get_stats()
+        self.assertLessEqual(stats['sessions'], 4)
+        self.assertLessEqual(stats['messages'], 4 * 50)
+        for session_id in list(storage.messages):
+            self.assertLessEqual(len(storage.get(session_id=session_id, agent_id='a1', top_k=100)), 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
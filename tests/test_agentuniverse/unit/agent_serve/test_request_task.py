@@ -0,0 +1,114 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 06:30
+# @Author  : fanen.lhy
+# @Email   : fanen.lhy@antgroup.com
+# @FileName: test_request_task.py
+import asyncio
+import json
+import os
+import threading
+import time
+import unittest
+
+from agentuniverse.agent_serve.web.async_stream_queue import AsyncStreamQueue
+from agentuniverse.agent_serve.web.request_task import EOF_SIGNAL, RequestTask, TaskStateEnum
+
+
+def produce(stream, outputs, delay: float = 0.0, eof: bool = True):
+    """Put the outputs into the stream from a worker thread, like an agent does."""
+    for output in outputs:
+        time.sleep(delay)
+        stream.put_nowait(output)
+    if eof:
+        stream.put_nowait(EOF_SIGNAL)
+
+
+async def run_service(output_stream, outputs, delay: float = 0.0, eof: bool = True, **kwargs):
+    await asyncio.to_thread(produce, output_stream, outputs, delay, eof)
+    return {'output': 'done'}
+
+
+async def collect(task: RequestTask):
+    chunks = []
+    async for chunk in task.async_stream_run():
+        chunks.append(json.loads(chunk.replace('data:', '', 1)))
+    return chunks
+
+
+class RequestTaskTest(unittest.TestCase):
+    """
+    Test cases for the async stream of RequestTask
+    """
+
+    def test_async_stream(self) -> None:
+        outputs = [f'token {i}' for i in range(20)]
+        task = RequestTask(run_service, False, outputs=outputs)
+        chunks = asyncio.run(collect(task))
+        self.assertEqual([chunk['process'] for chunk in chunks[:-1]], outputs)
+        self.assertEqual(chunks[-1], {'result': {'output': 'done'}})
+
+    def test_async_stream_ends_without_eof(self) -> None:
+        task = RequestTask(run_service, False, outputs=['token'], eof=False)
+        chunks = asyncio.run(asyncio.wait_for(collect(task), timeout=5))
+        self.assertEqual(chunks, [{'process': 'token'}, {'result': {'output': 'done'}}])
+
+    def test_async_stream_backpressure(self) -> None:
+        outputs = [f'token {i}' for i in range(100)]
+        task = RequestTask(run_service, False, outputs=outputs)
+        task.async_queue = AsyncStreamQueue(maxsize=2)
+        chunks = asyncio.run(collect(task))
+        self.assertEqual([chunk['process'] for chunk in chunks[:-1]], outputs)
+        self.assertEqual(task.async_queue.dropped_count, 0)
+
+    def test_async_stream_disconnect(self) -> None:
+        producer_done = threading.Event()
+
+        async def endless_service(output_stream, **kwargs):
+            def endless_produce():
+                for i in range(10000):
+                    output_stream.put_nowait(f'token {i}')
+                producer_done.set()
+
+            await asyncio.to_thread(endless_produce)
+
+        async def disconnect():
+            task.async_queue = AsyncStreamQueue(maxsize=2)
+            stream = task.async_stream_run()
+            await stream.__anext__()
+            # the client goes away after the first chunk
+            await stream.aclose()
+            await asyncio.wait([task.async_task], timeout=5)
+            return task.async_task.cancelled()
+
+        task = RequestTask(endless_service, False)
+        self.assertTrue(asyncio.run(disconnect()))
+        self.assertEqual(task.request_state(), TaskStateEnum.CANCELED.value)
+        # the producer blocked on the full queue is released once the stream is closed
+        self.assertTrue(producer_done.wait(5))
+        self.assertGreater(task.async_queue.dropped_count, 0)
+
+    @unittest.skipUnless(os.environ.get('AU_RUN_BENCHMARKS'), "set AU_RUN_BENCHMARKS=1 to run the benchmark")
+    def test_time_to_first_byte_benchmark(self) -> None:
+        first_token_delay = 0.05
+
+        async def measure() -> float:
+            task = RequestTask(run_service, False, outputs=[f'token {i}' for i in range(5)],
+                               delay=first_token_delay)
+            start = time.perf_counter()
+            first_byte = None
+            async for _ in task.async_stream_run():
+                if first_byte is None:
+                    first_byte = time.perf_counter() - start
+            return first_byte
+
+        ttfbs = [asyncio.run(measure()) for _ in range(5)]
+        print(f'\nasync stream time to first byte: best {min(ttfbs) * 1000:.1f} ms, '
+              f'worst {max(ttfbs) * 1000:.1f} ms with a token produced every '
+              f'{first_token_delay * 1000:.0f} ms')
+        self.assertLess(max(ttfbs), first_token_delay + 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 16:20
+# @Author  : jerry.zzw
+# @Email   : jerry.zzw@antgroup.com
+# @FileName: test_component_manager_base.py
+import unittest
+from typing import Optional
+
+from agentuniverse.agent.action.toolkit.toolkit_manager import ToolkitManager
+from agentuniverse.base.component.component_base import ComponentBase
+from agentuniverse.base.component.component_enum import ComponentEnum
+from agentuniverse.base.component.component_manager_base import ComponentManagerBase
+from agentuniverse.base.config.application_configer.app_configer import AppConfiger
+from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
+from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
+from agentuniverse.base.config.configer import Configer
+from agentuniverse.llm.llm_manager import LLMManager
+
+BUILD_COUNT = {}
+
+
+class DemoComponent(ComponentBase):
+    component_type: ComponentEnum = ComponentEnum.TOOL
+    name: Optional[str] = None
+
+    def _initialize_by_component_configer(self, component_configer: ComponentConfiger) -> 'DemoComponent':
+        self.name = component_configer.name
+        BUILD_COUNT[self.name] = BUILD_COUNT.get(self.name, 0) + 1
+        return self
+
+
+def build_configer(name: str, default_symbol: bool = False) -> ComponentConfiger:
+    configer = Configer(path=f'/tmp/{name}.yaml')
+    configer.value = {'name': name, 'default_symbol': default_symbol,
+                      'metadata': {'type': 'TOOL', 'module': __name__, 'class': 'DemoComponent'}}
+    return ComponentConfiger().load_by_configer(configer)
+
+
+class ComponentManagerBaseTest(unittest.TestCase):
+    """Test cases for the lazy registration of ComponentManagerBase."""
+
+    def setUp(self):
+        app_configer = AppConfiger()
+        app_configer._AppConfiger__base_info_appname = 'test_app'
+        ApplicationConfigManager().app_configer = app_configer
+        BUILD_COUNT.clear()
+        self.manager = ComponentManagerBase(ComponentEnum.TOOL)
+
+    def test_build_on_first_lookup(self):
+        self.manager.register_configer('test_app.tool.lazy_tool', build_configer('lazy_tool'))
+        self.assertEqual(BUILD_COUNT, {})
+        self.assertIn('test_app.tool.lazy_tool', self.manager.get_instance_name_list())
+
+        instance = self.manager.get_instance_obj('lazy_tool', new_instance=False)
+        self.assertEqual(instance.name, 'lazy_tool')
+        self.assertEqual(instance.component_config_path, '/tmp/lazy_tool.yaml')
+        self.assertIs(self.manager.get_instance_obj('lazy_tool', new_instance=False), instance)
+        self.assertEqual(BUILD_COUNT, {'lazy_tool': 1})
+
+    def test_lazy_default_instance(self):
+        self.manager.register_configer('test_app.tool.default_tool', build_configer('default_tool', True))
+        self.assertEqual(self.manager.get_default_instance().name, 'default_tool')
+        self.assertEqual(self.manager.get_instance_obj('default_tool', new_instance=False).name, 'default_tool')
+        self.assertEqual(BUILD_COUNT, {'default_tool': 1})
+
+    def test_instance_obj_list_builds_all(self):
+        self.manager.register_configer('test_app.tool.tool_a', build_configer('tool_a'))
+        self.manager.register_configer('test_app.tool.tool_b', build_configer('tool_b'))
+        self.assertEqual(sorted(instance.name for instance in self.manager.get_instance_obj_list()),
+                         ['tool_a', 'tool_b'])
+
+    def test_unregister_lazy_component(self):
+        self.manager.register_configer('test_app.tool.lazy_tool', build_configer('lazy_tool'))
+        self.manager.unregister('test_app.tool.lazy_tool')
+        self.assertIsNone(self.manager.get_instance_obj('lazy_tool'))
+        self.assertEqual(BUILD_COUNT, {})
+
+    def test_managers_with_own_lookup_build_lazily(self):
+        for manager, component_type in ((LLMManager(), 'llm'), (ToolkitManager(), 'toolkit')):
+            instance_code = f'test_app.{component_type}.lazy_{component_type}'
+            manager.register_configer(instance_code, build_configer(f'lazy_{component_type}'))
+            self.addCleanup(manager._instance_obj_map.pop, instance_code, None)
+            self.addCleanup(manager._configer_map.pop, instance_code, None)
+            self.assertEqual(manager.get_instance_obj(f'lazy_{component_type}').name, f'lazy_{component_type}')
+        self.assertEqual(BUILD_COUNT, {'lazy_llm': 1, 'lazy_toolkit': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
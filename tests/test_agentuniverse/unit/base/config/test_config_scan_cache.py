@@ -0,0 +1,80 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 14:40
+# @Author  : jerry.zzw
+# @Email   : jerry.zzw@antgroup.com
+# @FileName: test_config_scan_cache.py
+import os
+import shutil
+import tempfile
+import unittest
+
+from agentuniverse.base.config.config_scan_cache import ConfigScanCache
+
+
+class ConfigScanCacheTest(unittest.TestCase):
+    """Test cases for the persistent config scan cache."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.temp_dir, 'scan_cache')
+        self.yaml_path = os.path.join(self.temp_dir, 'demo_tool.yaml')
+        self._write_yaml('name: demo_tool\napi_key: ${AU_SCAN_CACHE_TEST_KEY}\nmetadata:\n  type: TOOL\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        os.environ.pop('AU_SCAN_CACHE_TEST_KEY', None)
+
+    def _write_yaml(self, content: str):
+        with open(self.yaml_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_hit_after_restart(self):
+        cache = ConfigScanCache(self.cache_path).load()
+        configer, component_type = cache.load_configer(self.yaml_path)
+        self.assertIsNone(component_type)
+        cache.set_component_type(self.yaml_path, 'TOOL')
+        cache.save()
+        self.assertEqual(cache.misses, 1)
+
+        restarted_cache = ConfigScanCache(self.cache_path).load()
+        cached_configer, component_type = restarted_cache.load_configer(self.yaml_path)
+        self.assertEqual(component_type, 'TOOL')
+        self.assertEqual(restarted_cache.hits, 1)
+        self.assertEqual(cached_configer.value, configer.value)
+
+    def test_placeholder_resolved_on_load(self):
+        cache = ConfigScanCache(self.cache_path).load()
+        cache.load_configer(self.yaml_path)
+        cache.save()
+
+        os.environ['AU_SCAN_CACHE_TEST_KEY'] = 'secret'
+        configer, _ = ConfigScanCache(self.cache_path).load().load_configer(self.yaml_path)
+        self.assertEqual(configer.value.get('api_key'), 'secret')
+        with open(self.cache_path, 'rb') as f:
+            self.assertNotIn(b'secret', f.read())
+
+    def test_changed_file_reparsed(self):
+        cache = ConfigScanCache(self.cache_path).load()
+        cache.load_configer(self.yaml_path)
+        cache.set_component_type(self.yaml_path, 'TOOL')
+        cache.save()
+
+        self._write_yaml('name: demo_tool_changed\nmetadata:\n  type: TOOL\n')
+        restarted_cache = ConfigScanCache(self.cache_path).load()
+        configer, component_type = restarted_cache.load_configer(self.yaml_path)
+        self.assertIsNone(component_type)
+        self.assertEqual(restarted_cache.misses, 1)
+        self.assertEqual(configer.value.get('name'), 'demo_tool_changed')
+
+    def test_corrupted_cache_ignored(self):
+        with open(self.cache_path, 'wb') as f:
+            f.write(b'not a cache')
+        cache = ConfigScanCache(self.cache_path).load()
+        configer, _ = cache.load_configer(self.yaml_path)
+        self.assertEqual(configer.value.get('name'), 'demo_tool')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 10:12
+# @Author  : jerry.zzw
+# @Email   : jerry.zzw@antgroup.com
+# @FileName: test_agentuniverse.py
+import unittest
+from unittest.mock import patch
+
+from agentuniverse.base.agentuniverse import AgentUniverse
+from agentuniverse.base.component.component_enum import ComponentEnum
+from agentuniverse.base.config.config_type_enum import ConfigTypeEnum
+from agentuniverse.base.config.configer import Configer
+
+
+class AgentUniverseScanTest(unittest.TestCase):
+    """Test cases for the component scan of AgentUniverse."""
+
+    package_list = ['agentuniverse.agent.action.knowledge',
+                    'agentuniverse.agent.action.knowledge.embedding']
+
+    def test_scan_parses_each_file_once(self):
+        agent_universe = AgentUniverse()
+        with patch.object(Configer, 'load', autospec=True, side_effect=Configer.load) as mock_load:
+            package_configer_map = agent_universe._AgentUniverse__load_package_configers(
+                self.package_list, ConfigTypeEnum.YAML)
+        loaded_paths = [call.args[0].path for call in mock_load.call_args_list]
+        self.assertTrue(loaded_paths)
+        self.assertEqual(len(loaded_paths), len(set(loaded_paths)))
+
+        # the nested embedding package is covered by both packages
+        embedding_paths = {configer.configer.path for configer, _ in package_configer_map[self.package_list[1]]}
+        knowledge_paths = {configer.configer.path for configer, _ in package_configer_map[self.package_list[0]]}
+        self.assertTrue(embedding_paths)
+        self.assertTrue(embedding_paths.issubset(knowledge_paths))
+
+    def test_scan_with_parsed_configers(self):
+        agent_universe = AgentUniverse()
+        package_configer_map = agent_universe._AgentUniverse__load_package_configers(
+            self.package_list, ConfigTypeEnum.YAML)
+        for component_enum in [ComponentEnum.EMBEDDING, ComponentEnum.READER, ComponentEnum.DOC_PROCESSOR]:
+            expected = agent_universe.scan(self.package_list, ConfigTypeEnum.YAML, component_enum)
+            actual = agent_universe.scan(self.package_list, ConfigTypeEnum.YAML, component_enum,
+                                         package_configer_map)
+            self.assertEqual([configer.configer.path for configer in expected],
+                             [configer.configer.path for configer in actual])
+            for configer in actual:
+                self.assertEqual(configer.get_component_config_type(), component_enum.value)
+
+
+if __name__ == '__main__':
+    unittest.main()
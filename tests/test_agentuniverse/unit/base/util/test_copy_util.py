@@ -0,0 +1,170 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 17:40
+# @Author  : jerry.zzw
+# @Email   : jerry.zzw@antgroup.com
+# @FileName: test_copy_util.py
+import copy
+import json
+import tracemalloc
+import unittest
+
+from agentuniverse.agent.action.knowledge.knowledge import Knowledge
+from agentuniverse.agent.agent import Agent
+from agentuniverse.agent.agent_manager import AgentManager
+from agentuniverse.agent.agent_model import AgentModel
+from agentuniverse.base.config.application_configer.app_configer import AppConfiger
+from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
+from agentuniverse.base.util.copy_util import CopyOnWriteDict, freeze
+
+
+def build_agent_model() -> AgentModel:
+    return AgentModel(
+        info={'name': 'demo_agent', 'description': 'demo agent'},
+        profile={'llm_model': {'name': 'demo_llm', 'temperature': 0.1},
+                 'instruction': 'instruction ' * 200,
+                 'examples': [{'input': f'question {i}', 'output': f'answer {i}'} for i in range(200)]},
+        action={'tool': [f'tool_{i}' for i in range(50)], 'knowledge': ['demo_knowledge']},
+        memory={'name': 'demo_memory'})
+
+
+class DemoAgent(Agent):
+
+    def input_keys(self) -> list[str]:
+        return ['input']
+
+    def output_keys(self) -> list[str]:
+        return ['output']
+
+    def parse_input(self, input_object, agent_input: dict) -> dict:
+        return agent_input
+
+    def parse_result(self, agent_result: dict) -> dict:
+        return agent_result
+
+
+def measure_allocation(func, rounds: int = 100) -> float:
+    """Return the average bytes allocated by the func per call, the results are kept alive like
+    the per-request copies."""
+    results = []
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(rounds):
+            results.append(func())
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (after - before) / rounds
+
+
+class CopyOnWriteDictTest(unittest.TestCase):
+    """Test cases for the copy on write dict."""
+
+    def test_mutation_not_leak_into_template(self):
+        template = {'llm_model': {'name': 'demo_llm'}, 'tool': ['a'], 'name': 'demo'}
+        copied = CopyOnWriteDict(template)
+        copied['llm_model']['temperature'] = 0.5
+        copied.get('tool').append('b')
+        copied.setdefault('prompt_version', 'v1')
+        copied.update(name='changed')
+        self.assertEqual(template, {'llm_model': {'name': 'demo_llm'}, 'tool': ['a'], 'name': 'demo'})
+        self.assertEqual(copied, {'llm_model': {'name': 'demo_llm', 'temperature': 0.5}, 'tool': ['a', 'b'],
+                                  'name': 'changed', 'prompt_version': 'v1'})
+
+    def test_values_copied_on_iteration(self):
+        template = {'a': {'x': 1}, 'b': [1]}
+        copied = CopyOnWriteDict(template)
+        for value in copied.values():
+            value.clear()
+        for _, value in copied.items():
+            self.assertFalse(value)
+        self.assertEqual(template, {'a': {'x': 1}, 'b': [1]})
+        self.assertEqual(copy.deepcopy(copied), {'a': {}, 'b': []})
+
+    def test_untouched_value_shared(self):
+        template = freeze({'a': {'x': 1}})
+        copied = CopyOnWriteDict(template)
+        other = CopyOnWriteDict(template)
+        self.assertIs(dict.__getitem__(copied, 'a'), dict.__getitem__(other, 'a'))
+        self.assertIsNot(copied['a'], template['a'])
+        self.assertIs(copied['a'], copied['a'])
+        with self.assertRaises(TypeError):
+            dict.__getitem__(other, 'a')['x'] = 2
+
+    def test_builtin_reads_not_leak_into_template(self):
+        template = freeze({'a': {'x': 1}, 'b': [1]})
+        copied = CopyOnWriteDict(template)
+        dict(copied)['a']['x'] = 99
+        {**copied}['b'].append(2)
+        (lambda **kwargs: kwargs)(**copied)['a']['y'] = 0
+        self.assertEqual(json.loads(json.dumps(copied)), {'a': {'x': 99, 'y': 0}, 'b': [1, 2]})
+        self.assertEqual(template, {'a': {'x': 1}, 'b': [1]})
+        self.assertEqual(CopyOnWriteDict(template), {'a': {'x': 1}, 'b': [1]})
+
+    def test_template_stays_mutable(self):
+        knowledge = Knowledge(name='test_knowledge', ext_info={'a': {'x': 1}})
+        copied = knowledge.create_copy()
+        dict(copied.ext_info)['a']['x'] = 99
+        copied.ext_info['a']['y'] = 0
+        self.assertEqual(knowledge.ext_info, {'a': {'x': 1}})
+        with self.assertRaises(TypeError):
+            dict.__getitem__(knowledge.create_copy().ext_info, 'a')['x'] = 2
+        # the template is edited in place, only the copies created after the edit see it
+        knowledge.ext_info['a']['x'] = 2
+        self.assertEqual(copied.ext_info, {'a': {'x': 99, 'y': 0}})
+        self.assertEqual(knowledge.create_copy().ext_info, {'a': {'x': 2}})
+        self.assertEqual(copy.deepcopy(knowledge.ext_info), {'a': {'x': 2}})
+
+    def test_registered_agent_edited_after_lookup(self):
+        app_configer = AppConfiger()
+        app_configer._AppConfiger__base_info_appname = 'test_app'
+        ApplicationConfigManager().app_configer = app_configer
+        demo_agent = DemoAgent()
+        demo_agent.agent_model = build_agent_model()
+        AgentManager().register('test_app.agent.demo_agent', demo_agent)
+        self.addCleanup(AgentManager().unregister, 'test_app.agent.demo_agent')
+        request_copy = AgentManager().get_instance_obj('demo_agent')
+        # like update_agent_config of the product service, which edits the registered agent
+        agent = AgentManager().get_instance_obj('demo_agent', new_instance=False)
+        agent.agent_model.info['description'] = 'updated agent'
+        agent.agent_model.profile.get('llm_model')['name'] = 'other_llm'
+        agent.agent_model.profile.get('llm_model').pop('temperature', None)
+        agent.agent_model.action['tool'] = ['tool_a']
+        copied = AgentManager().get_instance_obj('demo_agent')
+        self.assertEqual(copied.agent_model.info['description'], 'updated agent')
+        self.assertEqual(copied.agent_model.profile['llm_model'], {'name': 'other_llm'})
+        self.assertEqual(copied.agent_model.action['tool'], ['tool_a'])
+        self.assertEqual(request_copy.agent_model.info['description'], 'demo agent')
+        self.assertEqual(request_copy.agent_model.profile['llm_model']['name'], 'demo_llm')
+
+    def test_agent_model_copy(self):
+        agent_model = build_agent_model()
+        copied = agent_model.create_copy()
+        copied.profile['llm_model']['temperature'] = 0.9
+        copied.action['tool'].append('new_tool')
+        self.assertEqual(agent_model.profile['llm_model']['temperature'], 0.1)
+        self.assertEqual(len(agent_model.action['tool']), 50)
+        self.assertEqual(copied.model_dump()['profile']['llm_model']['temperature'], 0.9)
+        self.assertEqual(agent_model.model_dump()['profile']['llm_model']['temperature'], 0.1)
+        self.assertEqual(json.loads(agent_model.model_dump_json())['action']['tool'][0], 'tool_0')
+        self.assertEqual(agent_model.create_copy().action['tool'][-1], 'tool_49')
+
+    def test_copy_allocation_benchmark(self):
+        agent_model = build_agent_model()
+
+        def handle_request(model: AgentModel) -> AgentModel:
+            # a typical request reads the llm config of its agent copy
+            model.profile.get('llm_model')
+            return model
+
+        deep_copy_bytes = measure_allocation(lambda: handle_request(agent_model.model_copy(deep=True)))
+        cow_copy_bytes = measure_allocation(lambda: handle_request(agent_model.create_copy()))
+        print(f'\nallocation per request: deep copy {deep_copy_bytes:.0f} bytes, '
+              f'copy on write {cow_copy_bytes:.0f} bytes')
+        self.assertLess(cow_copy_bytes, deep_copy_bytes / 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 02:50
+# @Author  : wangchongshi
+# @Email   : wangchongshi.wcs@antgroup.com
+# @FileName: test_executor_registry.py
+import threading
+import unittest
+
+from agentuniverse.agent.action.knowledge.knowledge import Knowledge
+from agentuniverse.base.util.executor_registry import ExecutorRegistry
+
+
+class ExecutorRegistryTest(unittest.TestCase):
+    """
+    Test cases for the shared executor registry
+    """
+
+    def test_shared_executors(self) -> None:
+        registry = ExecutorRegistry()
+        self.assertIs(registry, ExecutorRegistry())
+        executor = registry.get_executor('test_shared', max_workers=2)
+        self.assertIs(executor, registry.get_executor('test_shared', max_workers=10))
+        self.assertEqual(executor.get_stats()['max_workers'], 2)
+
+        # Every knowledge shares the same pools instead of building its own
+        first, second = Knowledge(name='first'), Knowledge(name='second')
+        self.assertIs(first._get_query_executor(), second._get_query_executor())
+        self.assertIs(first._get_insert_executor(), registry.get_executor('knowledge_insert'))
+        self.assertIsNone(first.create_copy().query_executor)
+
+    def test_knowledge_follows_registry_shutdown(self) -> None:
+        registry = ExecutorRegistry()
+        knowledge = Knowledge(name='test_knowledge')
+        executor = knowledge._get_query_executor()
+        registry.shutdown(wait=True)
+        # the knowledge looks the shared pool up again instead of keeping the shut down one
+        self.assertIsNot(knowledge._get_query_executor(), executor)
+        self.assertEqual(knowledge._get_query_executor().submit(lambda: 1).result(5), 1)
+        self.assertEqual(knowledge._get_insert_executor().submit(lambda: 2).result(5), 2)
+
+    def test_stats_and_shutdown(self) -> None:
+        registry = ExecutorRegistry()
+        executor = registry.get_executor('test_stats', max_workers=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        futures = [executor.submit(block)] + [executor.submit(lambda: 1) for _ in range(3)]
+        futures.append(executor.submit(lambda: 1 / 0))
+        started.wait(5)
+        stats = registry.get_stats()['test_stats']
+        self.assertEqual(stats['active'], 1)
+        self.assertEqual(stats['queue_depth'], 4)
+        release.set()
+        for future in futures[:-1]:
+            future.result(5)
+        with self.assertRaises(ZeroDivisionError):
+            futures[-1].result(5)
+        stats = executor.get_stats()
+        self.assertEqual((stats['submitted'], stats['completed'], stats['failed']), (5, 5, 1))
+
+        registry.shutdown(wait=True)
+        self.assertNotIn('test_stats', registry.get_stats())
+        with self.assertRaises(RuntimeError):
+            executor.submit(lambda: 1)
+        self.assertIsNot(registry.get_executor('test_stats'), executor)
+
+
+if __name__ == '__main__':
+    unittest.main()